@@ -0,0 +1,348 @@
+"""Find the largest simulation timestep that is still accurate and stable.
+
+Every setting of timestep and integrator simulates the same robots as a
+fine-timestep reference. A setting is accepted if settled robots without
+control do not gain energy, walking robots do not sink into the ground
+much deeper than in the reference, and the mean distance walked by robots
+with random brains, the usual fitness, stays close to the reference.
+
+Individual robots can walk quite differently than in the reference even
+at small timesteps, as walking is chaotic. What matters for evolution is
+that fitness is not biased, so only the mean distance is checked.
+"""
+
+import dataclasses
+import logging
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.body.base import Body
+from revolve2.modular_robot.brain import Brain
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.modular_robot.brain.dummy import BrainDummy
+from revolve2.modular_robot_simulation import (
+    ModularRobotScene,
+    SceneSimulationState,
+    to_batch,
+)
+from revolve2.simulation.simulator import SceneReport
+from revolve2.simulators.mujoco_simulator import LocalSimulator
+
+from . import terrains
+from .simulation_parameters import make_standard_batch_parameters
+
+STANDARD_TIMESTEPS = (0.001, 0.002, 0.004, 0.006, 0.008, 0.012, 0.016)
+STANDARD_INTEGRATORS = ("Euler", "implicitfast", "RK4")
+REFERENCE_TIMESTEP = 0.0005
+REFERENCE_INTEGRATOR = "RK4"
+
+MAX_ENERGY_GAIN = 0.01  # joules
+MAX_EXTRA_PENETRATION = 0.005  # meters
+MAX_DISPLACEMENT_BIAS = 0.1  # relative to the reference
+
+# How long robots without control settle before their energy is observed.
+_PASSIVE_WARM_UP_TIME = 1.0
+
+
+@dataclass(kw_only=True)
+class SettingEvaluation:
+    """How well a timestep and integrator simulate the benchmark robots."""
+
+    simulation_timestep: float
+    """Seconds."""
+
+    integrator: str
+
+    steps_per_second: float
+    """Physics steps per second of wall-clock time, over all scenes."""
+
+    energy_gain: float
+    """The largest energy gained by a settled robot without control. In
+    joules."""
+
+    extra_penetration: float
+    """How much deeper the deepest penetration of a walking robot is than
+    in the reference. In meters."""
+
+    displacement_bias: float
+    """Difference between the mean distance walked and that of the
+    reference, relative to the reference."""
+
+    displacement_deviation: float
+    """Mean difference between the distance walked by each robot and that
+    of the reference, relative to the mean of the reference."""
+
+    stable: bool
+    """Whether the setting stays within all limits."""
+
+    @property
+    def realtime_cost(self) -> float:
+        """Get the wall-clock time needed per second of simulated time.
+
+        :returns: The cost in seconds.
+        :rtype: float
+        """
+        if self.steps_per_second <= 0.0:
+            return math.inf
+        return 1.0 / (self.steps_per_second * self.simulation_timestep)
+
+
+def evaluate_simulation_settings(
+    bodies: Sequence[Body],
+    timesteps: Sequence[float] = STANDARD_TIMESTEPS,
+    integrators: Sequence[str] = STANDARD_INTEGRATORS,
+    *,
+    simulation_time: int = 10,
+    brains_per_body: int = 3,
+    num_simulators: int = 1,
+    seed: int = 0,
+    reference_timestep: float = REFERENCE_TIMESTEP,
+    reference_integrator: str = REFERENCE_INTEGRATOR,
+    max_energy_gain: float = MAX_ENERGY_GAIN,
+    max_extra_penetration: float = MAX_EXTRA_PENETRATION,
+    max_displacement_bias: float = MAX_DISPLACEMENT_BIAS,
+) -> list[SettingEvaluation]:
+    """Evaluate each combination of timestep and integrator.
+
+    :param bodies: The bodies to simulate, for example
+        `modular_robots_v2.all()`.
+    :type bodies: Sequence[Body]
+    :param timesteps: The timesteps to try. In seconds.
+    :type timesteps: Sequence[float]
+    :param integrators: The integrators to try.
+    :type integrators: Sequence[str]
+    :param simulation_time: How long to simulate each robot. In seconds.
+    :type simulation_time: int
+    :param brains_per_body: How many random brains to try on each body.
+    :type brains_per_body: int
+    :param num_simulators: The number of scenes simulated in parallel.
+    :type num_simulators: int
+    :param seed: Seed for the random brains.
+    :type seed: int
+    :param reference_timestep: The timestep of the reference. In
+        seconds.
+    :type reference_timestep: float
+    :param reference_integrator: The integrator of the reference.
+    :type reference_integrator: str
+    :param max_energy_gain: The most energy a settled robot may gain for
+        a setting to be stable. In joules.
+    :type max_energy_gain: float
+    :param max_extra_penetration: How much deeper than in the reference
+        robots may penetrate the ground for a setting to be stable. In
+        meters.
+    :type max_extra_penetration: float
+    :param max_displacement_bias: The largest bias in distance walked
+        for a setting to be stable. Relative to the reference.
+    :type max_displacement_bias: float
+    :returns: The evaluation of each setting, in order of timestep and
+        then integrator.
+    :rtype: list[SettingEvaluation]
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    walking: list[tuple[Body, Brain]] = [
+        (body, BrainCpgNetworkNeighborRandom(body=body, rng=rng))
+        for body in bodies
+        for _ in range(brains_per_body)
+    ]
+    passive: list[tuple[Body, Brain]] = [
+        (body, BrainDummy()) for body in bodies
+    ]
+
+    with LocalSimulator(headless=True, num_simulators=num_simulators) as sim:
+        reference, reference_reports = _simulate(
+            sim,
+            walking,
+            simulation_time,
+            reference_timestep,
+            reference_integrator,
+        )
+        reference_penetration = _max_penetration(reference_reports)
+        reference_mean = max(float(np.mean(reference)), 1e-9)
+
+        evaluations = []
+        for timestep in sorted(timesteps):
+            for integrator in integrators:
+                displacements, walking_reports = _simulate(
+                    sim, walking, simulation_time, timestep, integrator
+                )
+                _, passive_reports = _simulate(
+                    sim,
+                    passive,
+                    simulation_time,
+                    timestep,
+                    integrator,
+                    warm_up_time=_PASSIVE_WARM_UP_TIME,
+                )
+                evaluation = SettingEvaluation(
+                    simulation_timestep=timestep,
+                    integrator=integrator,
+                    steps_per_second=_steps_per_second(
+                        walking_reports + passive_reports
+                    ),
+                    energy_gain=_finite_or_inf(
+                        max(
+                            (
+                                report.physics.energy_gain
+                                for report in passive_reports
+                                if report.physics is not None
+                            ),
+                            default=0.0,
+                        )
+                    ),
+                    extra_penetration=_finite_or_inf(
+                        _max_penetration(walking_reports)
+                        - reference_penetration
+                    ),
+                    displacement_bias=_finite_or_inf(
+                        abs(float(np.mean(displacements)) - reference_mean)
+                        / reference_mean
+                    ),
+                    displacement_deviation=_finite_or_inf(
+                        float(
+                            np.mean(
+                                np.abs(
+                                    np.array(displacements)
+                                    - np.array(reference)
+                                )
+                            )
+                        )
+                        / reference_mean
+                    ),
+                    stable=False,
+                )
+                evaluation.stable = (
+                    evaluation.energy_gain <= max_energy_gain
+                    and evaluation.extra_penetration <= max_extra_penetration
+                    and evaluation.displacement_bias <= max_displacement_bias
+                )
+                logging.info(
+                    f"dt={timestep} {integrator}:"
+                    f" {evaluation.steps_per_second:.0f} steps/s,"
+                    f" energy gain {evaluation.energy_gain:.4f},"
+                    f" extra penetration {evaluation.extra_penetration:.4f},"
+                    f" bias {evaluation.displacement_bias:.3f},"
+                    f" deviation {evaluation.displacement_deviation:.3f},"
+                    f" {'stable' if evaluation.stable else 'unstable'}."
+                )
+                evaluations.append(evaluation)
+    return evaluations
+
+
+def recommend_simulation_settings(
+    evaluations: list[SettingEvaluation],
+) -> SettingEvaluation | None:
+    """Pick the largest stable timestep, with its fastest integrator.
+
+    :param evaluations: The evaluated settings.
+    :type evaluations: list[SettingEvaluation]
+    :returns: The recommended setting, or None if no setting is stable.
+    :rtype: SettingEvaluation | None
+    """
+    stable = [evaluation for evaluation in evaluations if evaluation.stable]
+    if len(stable) == 0:
+        return None
+    return min(
+        stable,
+        key=lambda evaluation: (
+            -evaluation.simulation_timestep,
+            evaluation.realtime_cost,
+        ),
+    )
+
+
+def _simulate(
+    simulator: LocalSimulator,
+    robots: list[tuple[Body, Brain]],
+    simulation_time: int,
+    simulation_timestep: float,
+    integrator: str,
+    warm_up_time: float | None = None,
+) -> tuple[list[float], list[SceneReport]]:
+    """Simulate each robot alone on flat terrain with a single setting.
+
+    :param simulator: The simulator to use.
+    :param robots: The bodies with their brains.
+    :param simulation_time: How long to simulate. In seconds.
+    :param simulation_timestep: The timestep. In seconds.
+    :param integrator: The integrator.
+    :param warm_up_time: How long the robots settle first, if at all. In
+        seconds.
+    :returns: The distance walked by each robot, and the reports of the
+        scenes.
+    """
+    modular_robots = [ModularRobot(body, brain) for body, brain in robots]
+    scenes = []
+    for robot in modular_robots:
+        scene = ModularRobotScene(terrain=terrains.flat())
+        scene.add_robot(robot)
+        scenes.append(scene)
+
+    batch_parameters = dataclasses.replace(
+        make_standard_batch_parameters(
+            simulation_time=simulation_time,
+            simulation_timestep=simulation_timestep,
+            integrator=integrator,
+        ),
+        collect_timings=True,
+        collect_physics_diagnostics=True,
+        warm_up_time=warm_up_time,
+    )
+    batch, mappings = to_batch(scenes, batch_parameters)
+    results = simulator.simulate_batch_with_reports(batch)
+
+    displacements = []
+    for robot, result, mapping in zip(
+        modular_robots, results, mappings, strict=True
+    ):
+        begin = SceneSimulationState(
+            result.states[0], mapping
+        ).get_modular_robot_simulation_state(robot)
+        end = SceneSimulationState(
+            result.states[-1], mapping
+        ).get_modular_robot_simulation_state(robot)
+        offset = end.get_pose().position - begin.get_pose().position
+        displacements.append(math.hypot(offset.x, offset.y))
+    return displacements, [result.report for result in results]
+
+
+def _steps_per_second(reports: list[SceneReport]) -> float:
+    """Get the physics steps per second over a number of scenes.
+
+    :param reports: The reports of the scenes.
+    :returns: The steps per second.
+    """
+    timings = [report.timings for report in reports if report.timings]
+    total = sum(timing.total for timing in timings)
+    if total <= 0.0:
+        return 0.0
+    return sum(timing.num_steps for timing in timings) / total
+
+
+def _max_penetration(reports: list[SceneReport]) -> float:
+    """Get the deepest penetration over a number of scenes.
+
+    :param reports: The reports of the scenes.
+    :returns: The penetration. In meters.
+    """
+    return max(
+        (
+            report.physics.max_penetration
+            for report in reports
+            if report.physics is not None
+        ),
+        default=0.0,
+    )
+
+
+def _finite_or_inf(value: float) -> float:
+    """Replace a NaN by infinity, so it compares as too large.
+
+    A simulation that blew up produces NaN, which then fails every check.
+
+    :param value: The value.
+    :returns: The value, or infinity if it is NaN.
+    """
+    return math.inf if math.isnan(value) else value
@@ -4,7 +4,8 @@ import logging
 
 from revolve2.simulation.simulator import BatchParameters
 
-# TODO(jmdm): do different integrators make a difference?
+# Check whether the timestep and integrator suit your robots with
+# `simulation_parameter_tuning`.
 STANDARD_SIMULATION_TIME = 30
 STANDARD_SAMPLING_FREQUENCY = 5
 STANDARD_SIMULATION_TIMESTEP = 0.004
@@ -2,6 +2,7 @@
 
 import logging
 
+import numpy as np
 from pyrr import Vector3
 from revolve2.ci_group import modular_robots_v2, terrains
 from revolve2.ci_group.simulation_parameters import (
@@ -66,26 +67,27 @@ class ANNBrainInstance(BrainInstance):
             self.active_hinges
         ), "One of the active hinges does not have a sensor set."
 
-        # Get the current angular positions of the active hinges
-        current_positions = [
-            sensor_state.get_active_hinge_sensor_state(sensor).position
-            for sensor in sensors
-        ]
+        # Get the current angular positions of the active hinges.
+        # Reading all of them at once returns a NumPy array in the order of the sensors.
+        current_positions = sensor_state.get_active_hinge_positions(sensors)
         logging.info(f"current positions: {current_positions}")
 
-        # Get the imu sensor state
-        imu_state = sensor_state.get_imu_sensor_state(self.imu_sensor)
-        logging.info(f"orientation: {imu_state.orientation}")
-        logging.info(f"angular rate: {imu_state.angular_rate}")
-        logging.info(f"specific force: {imu_state.specific_force}")
+        # Get the imu sensor readings as NumPy arrays.
+        logging.info(
+            f"orientation: {sensor_state.get_imu_orientation(self.imu_sensor)}"
+        )
+        logging.info(
+            f"angular rate: {sensor_state.get_imu_angular_rate(self.imu_sensor)}"
+        )
+        logging.info(
+            f"specific force: {sensor_state.get_imu_specific_force(self.imu_sensor)}"
+        )
 
         # Here you can implement your controller.
         # The current controller does nothing except for always settings the joint positions to 0.5.
-        for active_hinge, _sensor in zip(
-            self.active_hinges, sensors, strict=False
-        ):
-            target = 0.5
-            control_interface.set_active_hinge_target(active_hinge, target)
+        # Setting all targets at once is faster than setting them one by one.
+        targets = np.full(len(self.active_hinges), 0.5)
+        control_interface.set_active_hinge_targets(self.active_hinges, targets)
 
 
 class ANNBrain(Brain):
@@ -0,0 +1,83 @@
+"""Main script for the example."""
+
+import logging
+import tempfile
+import time
+
+from revolve2.ci_group import modular_robots_v2, terrains
+from revolve2.ci_group.simulation_parameters import (
+    make_standard_batch_parameters,
+)
+from revolve2.experimentation.logging import setup_logging
+from revolve2.experimentation.rng import make_rng
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.modular_robot_simulation import (
+    ModularRobotScene,
+    simulate_scenes,
+)
+from revolve2.simulation.simulator import RecordSettings
+from revolve2.simulators.mujoco_simulator import LocalSimulator
+
+NUM_SCENES = 8
+SEED = 1234
+
+
+def make_scenes() -> list[ModularRobotScene]:
+    """Create the scenes to benchmark with.
+
+    :returns: The scenes.
+    :rtype: list[ModularRobotScene]
+    """
+    rng = make_rng(SEED)
+    bodies = modular_robots_v2.all()
+    scenes = []
+    for index in range(NUM_SCENES):
+        body = bodies[index % len(bodies)]
+        robot = ModularRobot(body, BrainCpgNetworkNeighborRandom(body, rng))
+        scene = ModularRobotScene(terrain=terrains.flat())
+        scene.add_robot(robot)
+        scenes.append(scene)
+    return scenes
+
+
+def benchmark(record_settings: RecordSettings | None) -> float:
+    """Simulate the scenes once and measure how long it took.
+
+    :param record_settings: The record settings to simulate with. If None,
+        the headless engine is used.
+    :type record_settings: RecordSettings | None
+    :returns: The wall clock time in seconds.
+    :rtype: float
+    """
+    scenes = make_scenes()
+    simulator = LocalSimulator(headless=True, num_simulators=1)
+    start = time.perf_counter()
+    simulate_scenes(
+        simulator=simulator,
+        batch_parameters=make_standard_batch_parameters(),
+        scenes=scenes,
+        record_settings=record_settings,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setup_logging()
+
+    headless_time = benchmark(record_settings=None)
+    logging.info(f"Headless engine:  {headless_time:.2f}s")
+
+    with tempfile.TemporaryDirectory() as video_directory:
+        rendering_time = benchmark(
+            record_settings=RecordSettings(
+                video_directory=video_directory, overwrite=True
+            )
+        )
+    logging.info(f"Rendering path:   {rendering_time:.2f}s")
+    logging.info(f"Speedup:          {rendering_time / headless_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Main script for the example."""
+
+import logging
+import os
+import time
+
+from revolve2.ci_group import modular_robots_v2, terrains
+from revolve2.ci_group.simulation_parameters import (
+    make_standard_batch_parameters,
+)
+from revolve2.experimentation.logging import setup_logging
+from revolve2.experimentation.rng import make_rng
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.modular_robot_simulation import (
+    ModularRobotScene,
+    simulate_scenes,
+)
+from revolve2.simulators.mujoco_simulator import CpuAffinity, LocalSimulator
+
+SCENES_PER_WORKER = 4
+SIMULATION_TIME = 10
+SEED = 1234
+
+
+def worker_counts() -> list[int]:
+    """Get the numbers of workers to measure: powers of two up to all CPUs.
+
+    :returns: The worker counts.
+    :rtype: list[int]
+    """
+    num_cpus = len(os.sched_getaffinity(0))
+    counts = [1]
+    while counts[-1] * 2 < num_cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != num_cpus:
+        counts.append(num_cpus)
+    return counts
+
+
+def make_scenes(num_scenes: int) -> list[ModularRobotScene]:
+    """Create the scenes to benchmark with.
+
+    :param num_scenes: The number of scenes.
+    :type num_scenes: int
+    :returns: The scenes.
+    :rtype: list[ModularRobotScene]
+    """
+    rng = make_rng(SEED)
+    bodies = modular_robots_v2.all()
+    scenes = []
+    for index in range(num_scenes):
+        body = bodies[index % len(bodies)]
+        robot = ModularRobot(body, BrainCpgNetworkNeighborRandom(body, rng))
+        scene = ModularRobotScene(terrain=terrains.flat())
+        scene.add_robot(robot)
+        scenes.append(scene)
+    return scenes
+
+
+def benchmark(
+    num_workers: int, cpu_affinity: CpuAffinity, single_threaded: bool
+) -> float:
+    """Simulate a batch with a number of workers and measure throughput.
+
+    The batch grows with the number of workers, so each worker always
+    has the same amount of work.
+
+    :param num_workers: The number of worker processes.
+    :type num_workers: int
+    :param cpu_affinity: How to pin the workers to CPUs.
+    :type cpu_affinity: CpuAffinity
+    :param single_threaded: Whether to limit numerical libraries in the
+        workers to one thread.
+    :type single_threaded: bool
+    :returns: The number of scenes simulated per second.
+    :rtype: float
+    """
+    scenes = make_scenes(SCENES_PER_WORKER * num_workers)
+    batch_parameters = make_standard_batch_parameters(
+        simulation_time=SIMULATION_TIME
+    )
+    with LocalSimulator(
+        headless=True,
+        num_simulators=num_workers,
+        cpu_affinity=cpu_affinity,
+        single_threaded_workers=single_threaded,
+    ) as simulator:
+        # Start the workers outside of the measurement.
+        simulate_scenes(simulator, batch_parameters, scenes[:num_workers])
+
+        start = time.perf_counter()
+        simulate_scenes(simulator, batch_parameters, scenes)
+        return len(scenes) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setup_logging()
+
+    configurations = [
+        ("default", CpuAffinity.NONE, False),
+        ("single-threaded", CpuAffinity.NONE, True),
+        ("pinned to cores", CpuAffinity.CORE, True),
+        ("pinned to NUMA nodes", CpuAffinity.NUMA_NODE, True),
+    ]
+    for name, cpu_affinity, single_threaded in configurations:
+        logging.info(f"Configuration: {name}")
+        baseline = None
+        for num_workers in worker_counts():
+            throughput = benchmark(num_workers, cpu_affinity, single_threaded)
+            baseline = baseline or throughput
+            speedup = throughput / baseline
+            logging.info(
+                f"  {num_workers:3d} workers: {throughput:6.2f} scenes/s, "
+                f"speedup {speedup:5.2f}x, "
+                f"efficiency {speedup / num_workers:4.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
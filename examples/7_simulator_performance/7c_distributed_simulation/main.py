@@ -0,0 +1,93 @@
+"""Main script for the example."""
+
+import logging
+import threading
+import time
+
+from revolve2.ci_group import modular_robots_v2, terrains
+from revolve2.ci_group.simulation_parameters import (
+    make_standard_batch_parameters,
+)
+from revolve2.experimentation.logging import setup_logging
+from revolve2.experimentation.rng import make_rng
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.modular_robot_simulation import ModularRobotScene, to_batch
+from revolve2.simulators.mujoco_simulator import (
+    DistributedSimulator,
+    WorkerDaemon,
+)
+
+NUM_WORKERS = 2
+SIMULATORS_PER_WORKER = 1
+NUM_SCENES = 8
+SIMULATION_TIME = 10
+SEED = 1234
+
+
+def make_scenes(num_scenes: int) -> list[ModularRobotScene]:
+    """Create the scenes to simulate.
+
+    :param num_scenes: The number of scenes.
+    :type num_scenes: int
+    :returns: The scenes.
+    :rtype: list[ModularRobotScene]
+    """
+    rng = make_rng(SEED)
+    bodies = modular_robots_v2.all()
+    scenes = []
+    for index in range(num_scenes):
+        body = bodies[index % len(bodies)]
+        robot = ModularRobot(body, BrainCpgNetworkNeighborRandom(body, rng))
+        scene = ModularRobotScene(terrain=terrains.flat())
+        scene.add_robot(robot)
+        scenes.append(scene)
+    return scenes
+
+
+def main() -> None:
+    """Run the simulation."""
+    setup_logging()
+
+    # Normally each worker runs on its own machine, started with the
+    # `revolve2-simulation-worker` script. Here they run on this machine,
+    # listening on a free port on localhost.
+    workers = [
+        WorkerDaemon("127.0.0.1", 0, num_simulators=SIMULATORS_PER_WORKER)
+        for _ in range(NUM_WORKERS)
+    ]
+    for worker in workers:
+        threading.Thread(target=worker.serve_forever, daemon=True).start()
+
+    batch, _ = to_batch(
+        make_scenes(NUM_SCENES),
+        make_standard_batch_parameters(simulation_time=SIMULATION_TIME),
+    )
+    with DistributedSimulator([
+        worker.address for worker in workers
+    ]) as simulator:
+        logging.info("Simulating with all workers.")
+        start = time.perf_counter()
+        for index, _ in simulator.simulate_batch_streaming(batch):
+            logging.info(
+                f"Scene {index} done after {time.perf_counter() - start:.2f}s."
+            )
+
+        logging.info("Simulating again, stopping a worker halfway.")
+        start = time.perf_counter()
+        for count, (index, _) in enumerate(
+            simulator.simulate_batch_streaming(batch)
+        ):
+            logging.info(
+                f"Scene {index} done after {time.perf_counter() - start:.2f}s."
+            )
+            if count == 0:
+                # Its unfinished scenes are moved to the other worker.
+                workers[0].close()
+
+    for worker in workers:
+        worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Main script for the example."""
+
+import logging
+import os
+
+from revolve2.ci_group import modular_robots_v2
+from revolve2.ci_group.simulation_parameter_tuning import (
+    evaluate_simulation_settings,
+    recommend_simulation_settings,
+)
+from revolve2.ci_group.simulation_parameters import (
+    STANDARD_INTEGRATOR,
+    STANDARD_SIMULATION_TIMESTEP,
+)
+from revolve2.experimentation.logging import setup_logging
+
+SIMULATION_TIME = 10
+BRAINS_PER_BODY = 3
+SEED = 1234
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setup_logging()
+
+    evaluations = evaluate_simulation_settings(
+        modular_robots_v2.all(),
+        simulation_time=SIMULATION_TIME,
+        brains_per_body=BRAINS_PER_BODY,
+        num_simulators=len(os.sched_getaffinity(0)),
+        seed=SEED,
+    )
+
+    logging.info("timestep integrator  cost/s  gain    depth   bias")
+    for evaluation in evaluations:
+        logging.info(
+            f"{evaluation.simulation_timestep:<8} {evaluation.integrator:<12}"
+            f" {evaluation.realtime_cost:.4f}"
+            f" {evaluation.energy_gain:.4f}"
+            f" {evaluation.extra_penetration:+.4f}"
+            f" {evaluation.displacement_bias:.3f}"
+            f"{'' if evaluation.stable else '  unstable'}"
+        )
+
+    standard = next(
+        evaluation
+        for evaluation in evaluations
+        if evaluation.simulation_timestep == STANDARD_SIMULATION_TIMESTEP
+        and evaluation.integrator == STANDARD_INTEGRATOR
+    )
+    recommended = recommend_simulation_settings(evaluations)
+    if recommended is None:
+        logging.warning("None of the settings is stable for these robots.")
+        return
+    logging.info(
+        f"Recommended: timestep {recommended.simulation_timestep} with"
+        f" {recommended.integrator}, {recommended.realtime_cost:.4f}s of"
+        " compute per simulated second."
+    )
+    logging.info(
+        f"Standard: timestep {standard.simulation_timestep} with"
+        f" {standard.integrator}, {standard.realtime_cost:.4f}s of compute"
+        " per simulated second"
+        f" ({'stable' if standard.stable else 'unstable'})."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 from .body.base import ActiveHinge
 
@@ -21,3 +25,28 @@ class ModularRobotControlInterface(ABC):
         :rtype: None
 
         """
+
+    def set_active_hinge_targets(
+        self,
+        active_hinges: Sequence[ActiveHinge],
+        targets: npt.NDArray[np.float64],
+    ) -> None:
+        """Set the position targets for a number of active hinges at once.
+
+        Implementations can override this to set all targets in a single
+        operation. By default, the targets are set one by one. Passing the
+        same sequence of hinges every control step, such as all hinges of
+        the robot, lets implementations reuse what they looked up before.
+
+        :param active_hinges: The active hinges to set the targets for,
+            without duplicates.
+        :type active_hinges: Sequence[ActiveHinge]
+        :param targets: The target of each active hinge, in the same
+            order.
+        :type targets: npt.NDArray[np.float64]
+        :rtype: None
+        """
+        for active_hinge, target in zip(
+            active_hinges, targets.tolist(), strict=True
+        ):
+            self.set_active_hinge_target(active_hinge, target)
@@ -29,6 +29,10 @@ class BrainCpgInstance(BrainInstance):
     _weight_matrix: npt.NDArray[np.float64]
     # nxn matrix matching number of neurons
     _output_mapping: list[tuple[int, ActiveHinge]]
+    # The outputs, split into arrays for setting all targets at once.
+    _output_indices: npt.NDArray[np.intp]
+    _output_hinges: list[ActiveHinge]
+    _output_ranges: npt.NDArray[np.float64]
 
     def __init__(
         self,
@@ -52,6 +56,21 @@ class BrainCpgInstance(BrainInstance):
         self._weight_matrix = weight_matrix
         self._output_mapping = output_mapping
 
+        # Outputs that are not actual hinges cannot be controlled.
+        outputs = [
+            (state_index, active_hinge)
+            for state_index, active_hinge in output_mapping
+            if hasattr(active_hinge, "range")
+        ]
+        self._output_indices = np.array(
+            [state_index for state_index, _ in outputs], dtype=np.intp
+        )
+        self._output_hinges = [active_hinge for _, active_hinge in outputs]
+        self._output_ranges = np.array(
+            [active_hinge.range for active_hinge in self._output_hinges],
+            dtype=np.float64,
+        )
+
     @staticmethod
     def _rk45(
         state: npt.NDArray[np.float64],
@@ -137,16 +156,9 @@ class BrainCpgInstance(BrainInstance):
         # Delta scaling for stability
         delta *= 0.99
 
-        # Set active hinge targets to match newly calculated state.
-        for state_index, active_hinge in self._output_mapping:
-            # TODO(jmdm): delta or absolute state?
-            # see ../../mujoco_simulator/_control_interface_impl.py
-            try:
-                _ = active_hinge.range
-            except AttributeError:
-                continue
-            control_interface.set_active_hinge_target(
-                active_hinge,
-                float(delta[state_index]) * active_hinge.range,
-                # self._state[state_index] delta[state_index]
-            )
+        # Set the targets of all output hinges at once, to the change of
+        # their output neurons scaled by the range of each hinge.
+        control_interface.set_active_hinge_targets(
+            self._output_hinges,
+            delta[self._output_indices] * self._output_ranges,
+        )
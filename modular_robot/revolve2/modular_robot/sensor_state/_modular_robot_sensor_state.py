@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 from ..body.sensors import (
     ActiveHingeSensor,
@@ -51,3 +55,69 @@ class ModularRobotSensorState(ABC):
         :rtype: CameraSensorState
 
         """
+
+    def get_active_hinge_positions(
+        self, sensors: Sequence[ActiveHingeSensor]
+    ) -> npt.NDArray[np.float64]:
+        """Get the positions measured by a number of active hinge sensors.
+
+        Implementations can override this to read all positions in a
+        single operation. By default, the sensor states are read one by
+        one. Passing the same sequence of sensors every control step lets
+        implementations reuse what they looked up before.
+
+        :param sensors: The sensors.
+        :type sensors: Sequence[ActiveHingeSensor]
+        :returns: The position measured by each sensor, in the same order.
+        :rtype: npt.NDArray[np.float64]
+        """
+        return np.array(
+            [
+                self.get_active_hinge_sensor_state(sensor).position
+                for sensor in sensors
+            ],
+            dtype=np.float64,
+        )
+
+    def get_imu_specific_force(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the specific force measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The specific force, with shape (3,).
+        :rtype: npt.NDArray[np.float64]
+        """
+        return np.array(
+            self.get_imu_sensor_state(sensor).specific_force, dtype=np.float64
+        )
+
+    def get_imu_angular_rate(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the angular rate measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The angular rate, with shape (3,).
+        :rtype: npt.NDArray[np.float64]
+        """
+        return np.array(
+            self.get_imu_sensor_state(sensor).angular_rate, dtype=np.float64
+        )
+
+    def get_imu_orientation(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the orientation measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The orientation, with shape (4,), with the components
+            in the same order as `IMUSensorState.orientation`.
+        :rtype: npt.NDArray[np.float64]
+        """
+        return np.array(
+            self.get_imu_sensor_state(sensor).orientation, dtype=np.float64
+        )
@@ -1,3 +1,7 @@
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
 from revolve2.modular_robot import ModularRobotControlInterface
 from revolve2.modular_robot.body.base import ActiveHinge
 
@@ -29,3 +33,27 @@ class ModularRobotControlInterfaceImpl(ModularRobotControlInterface):
 
         """
         self._set_active_hinges.append((UUIDKey(active_hinge), target))
+
+    def set_active_hinge_targets(
+        self,
+        active_hinges: Sequence[ActiveHinge],
+        targets: npt.NDArray[np.float64],
+    ) -> None:
+        """Set the position targets for a number of active hinges at once.
+
+        Targets are clamped within the active hinges range.
+
+        :param active_hinges: The active hinges to set the targets for.
+        :type active_hinges: Sequence[ActiveHinge]
+        :param targets: The target of each active hinge, in the same
+            order.
+        :type targets: npt.NDArray[np.float64]
+        :rtype: None
+        """
+        self._set_active_hinges.extend(
+            zip(
+                (UUIDKey(active_hinge) for active_hinge in active_hinges),
+                targets.tolist(),
+                strict=True,
+            )
+        )
@@ -10,6 +10,7 @@ from ._scene_simulation_state import (
 from ._simulate_scenes import simulate_scenes
 from ._terrain import Terrain
 from ._test_robot import test_robot
+from ._to_batch import to_batch
 
 __all__ = [
     "ModularRobotScene",
@@ -18,4 +19,5 @@ __all__ = [
     "Terrain",
     "simulate_scenes",
     "test_robot",
+    "to_batch",
 ]
@@ -1,23 +1,34 @@
+from collections.abc import Sequence
+from uuid import UUID
+
 import numpy as np
+import numpy.typing as npt
 from revolve2.modular_robot import ModularRobotControlInterface
 from revolve2.modular_robot.body.base import ActiveHinge
-from revolve2.simulation.scene import ControlInterface, UUIDKey
+from revolve2.simulation.scene import ControlInterface, JointHinge, UUIDKey
 
 from ._build_multi_body_systems import (
     BodyToMultiBodySystemMapping,
 )
 
+ResolvedHinges = dict[
+    tuple[UUID, ...], tuple[list[JointHinge], npt.NDArray[np.float64]]
+]
+"""Sequences of active hinges resolved to their joint hinges and ranges."""
+
 
 class ModularRobotControlInterfaceImpl(ModularRobotControlInterface):
     """Implementation for ModularRobotControlInterface."""
 
     _simulation_control: ControlInterface
     _body_to_multi_body_system_mapping: BodyToMultiBodySystemMapping
+    _resolved_hinges: ResolvedHinges
 
     def __init__(
         self,
         simulation_control: ControlInterface,
         body_to_multi_body_system_mapping: BodyToMultiBodySystemMapping,
+        resolved_hinges: ResolvedHinges | None = None,
     ) -> None:
         """Initialize this object.
 
@@ -25,11 +36,17 @@ class ModularRobotControlInterfaceImpl(ModularRobotControlInterface):
             simulation.
         :param body_to_multi_body_system_mapping: A mapping from body to
             multi-body system
+        :param resolved_hinges: Sequences of active hinges resolved
+            earlier for the same mapping. Sequences resolved by this
+            object are added to it.
         """
         self._simulation_control = simulation_control
         self._body_to_multi_body_system_mapping = (
             body_to_multi_body_system_mapping
         )
+        self._resolved_hinges = (
+            {} if resolved_hinges is None else resolved_hinges
+        )
 
     def set_active_hinge_target(
         self, active_hinge: ActiveHinge, target: float
@@ -48,7 +65,44 @@ class ModularRobotControlInterfaceImpl(ModularRobotControlInterface):
             self._body_to_multi_body_system_mapping.active_hinge_to_joint_hinge[
                 UUIDKey(active_hinge)
             ],
-            np.clip(
-                target, a_min=-active_hinge.range, a_max=active_hinge.range
-            ),
+            min(max(target, -active_hinge.range), active_hinge.range),
+        )
+
+    def set_active_hinge_targets(
+        self,
+        active_hinges: Sequence[ActiveHinge],
+        targets: npt.NDArray[np.float64],
+    ) -> None:
+        """Set the position targets for a number of active hinges at once.
+
+        Targets are clamped within the ranges of the active hinges.
+
+        :param active_hinges: The active hinges to set the targets for,
+            without duplicates.
+        :type active_hinges: Sequence[ActiveHinge]
+        :param targets: The target of each active hinge, in the same
+            order.
+        :type targets: npt.NDArray[np.float64]
+        :rtype: None
+        """
+        key = tuple(active_hinge.uuid for active_hinge in active_hinges)
+        resolved = self._resolved_hinges.get(key)
+        if resolved is None:
+            mapping = (
+                self._body_to_multi_body_system_mapping.active_hinge_to_joint_hinge
+            )
+            resolved = (
+                [
+                    mapping[UUIDKey(active_hinge)]
+                    for active_hinge in active_hinges
+                ],
+                np.array(
+                    [active_hinge.range for active_hinge in active_hinges],
+                    dtype=np.float64,
+                ),
+            )
+            self._resolved_hinges[key] = resolved
+        joint_hinges, ranges = resolved
+        self._simulation_control.set_joint_hinge_position_targets(
+            joint_hinges, np.clip(targets, -ranges, ranges)
         )
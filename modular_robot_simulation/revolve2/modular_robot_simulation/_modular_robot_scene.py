@@ -1,7 +1,9 @@
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
 from revolve2.modular_robot import ModularRobot
 from revolve2.simulation.scene import MultiBodySystem, Pose, Scene, UUIDKey
+from revolve2.simulation.scene.termination import TerminationCondition
 
 from ._build_multi_body_systems import (
     BodyToMultiBodySystemConverter,
@@ -28,6 +30,14 @@ class ModularRobotScene:
     """
     _interactive_objects: list[MultiBodySystem] = field(default_factory=list)
     """Interactive objects in the scene, that are not robots themselves."""
+    _termination_conditions: list[TerminationCondition] = field(
+        default_factory=list
+    )
+    """Conditions under which the simulation of the scene stops early."""
+    _robot_termination_conditions: list[
+        tuple[ModularRobot, Callable[[MultiBodySystem], TerminationCondition]]
+    ] = field(default_factory=list)
+    """Conditions on single robots, created once the robots are converted."""
 
     def add_robot(
         self,
@@ -69,6 +79,39 @@ class ModularRobotScene:
         """
         self._interactive_objects.append(objt)
 
+    def add_termination_condition(
+        self, condition: TerminationCondition
+    ) -> None:
+        """Stop the simulation of the scene early when a condition is met.
+
+        :param condition: The condition.
+        :type condition: TerminationCondition
+        """
+        self._termination_conditions.append(condition)
+
+    def add_robot_termination_condition(
+        self,
+        robot: ModularRobot,
+        make_condition: Callable[[MultiBodySystem], TerminationCondition],
+    ) -> None:
+        """Stop the simulation early when a robot meets a condition.
+
+        For example `Flipped` or `Stuck`, which need the multi-body system
+        the robot is simulated as.
+
+        :param robot: The robot. It must have been added to this scene.
+        :type robot: ModularRobot
+        :param make_condition: Creates the condition from the multi-body
+            system of the robot.
+        :type make_condition: Callable[[MultiBodySystem],
+            TerminationCondition]
+        :raises ValueError: If the robot is not in this scene.
+        """
+        if not any(added is robot for added, _, _ in self._robots):
+            msg = "The robot must be added to the scene first."
+            raise ValueError(msg)
+        self._robot_termination_conditions.append((robot, make_condition))
+
     def to_simulation_scene(
         self,
     ) -> tuple[Scene, dict[UUIDKey[ModularRobot], MultiBodySystem]]:
@@ -81,7 +124,10 @@ class ModularRobotScene:
 
         """
         handler = ModularRobotSimulationHandler()
-        scene = Scene(handler=handler)
+        scene = Scene(
+            handler=handler,
+            termination_conditions=list(self._termination_conditions),
+        )
         modular_robot_to_multi_body_system_mapping: dict[
             UUIDKey[ModularRobot], MultiBodySystem
         ] = {}
@@ -110,4 +156,11 @@ class ModularRobotScene:
         for interactive_object in self._interactive_objects:
             scene.add_multi_body_system(interactive_object)
 
+        for robot, make_condition in self._robot_termination_conditions:
+            scene.termination_conditions.append(
+                make_condition(
+                    modular_robot_to_multi_body_system_mapping[UUIDKey(robot)]
+                )
+            )
+
         return scene, modular_robot_to_multi_body_system_mapping
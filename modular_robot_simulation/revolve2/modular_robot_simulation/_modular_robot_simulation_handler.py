@@ -10,16 +10,25 @@ from ._build_multi_body_systems import (
 )
 from ._modular_robot_control_interface_impl import (
     ModularRobotControlInterfaceImpl,
+    ResolvedHinges,
 )
 from ._sensor_state_impl import (
     ModularRobotSensorStateImpl,
+    ResolvedSensors,
 )
 
 
 class ModularRobotSimulationHandler(SimulationHandler):
     """Implements the simulation handler for a modular robot scene."""
 
-    _brains: list[tuple[BrainInstance, BodyToMultiBodySystemMapping]]
+    _brains: list[
+        tuple[
+            BrainInstance,
+            BodyToMultiBodySystemMapping,
+            ResolvedSensors,
+            ResolvedHinges,
+        ]
+    ]
 
     def __init__(self) -> None:
         """Initialize this object."""
@@ -42,7 +51,9 @@ class ModularRobotSimulationHandler(SimulationHandler):
         :rtype: None
 
         """
-        self._brains.append((brain_instance, body_to_multi_body_system_mapping))
+        self._brains.append(
+            (brain_instance, body_to_multi_body_system_mapping, {}, {})
+        )
 
     def handle(
         self,
@@ -63,14 +74,21 @@ class ModularRobotSimulationHandler(SimulationHandler):
         :rtype: None
 
         """
-        for brain_instance, body_to_multi_body_system_mapping in self._brains:
+        for (
+            brain_instance,
+            body_to_multi_body_system_mapping,
+            resolved_sensors,
+            resolved_hinges,
+        ) in self._brains:
             sensor_state = ModularRobotSensorStateImpl(
                 simulation_state=simulation_state,
                 body_to_multi_body_system_mapping=body_to_multi_body_system_mapping,
+                resolved_sensors=resolved_sensors,
             )
             control = ModularRobotControlInterfaceImpl(
                 simulation_control=simulation_control,
                 body_to_multi_body_system_mapping=body_to_multi_body_system_mapping,
+                resolved_hinges=resolved_hinges,
             )
             brain_instance.control(
                 dt=dt, sensor_state=sensor_state, control_interface=control
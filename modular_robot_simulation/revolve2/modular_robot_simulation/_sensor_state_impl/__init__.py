@@ -11,6 +11,7 @@ from ._imu_sensor_state_impl import (
 )
 from ._modular_robot_sensor_state_impl import (
     ModularRobotSensorStateImpl,
+    ResolvedSensors,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "CameraSensorStateImpl",
     "IMUSensorStateImpl",
     "ModularRobotSensorStateImpl",
+    "ResolvedSensors",
 ]
@@ -1,3 +1,8 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
 from revolve2.modular_robot.body.sensors import (
     ActiveHingeSensor,
     CameraSensor,
@@ -9,7 +14,8 @@ from revolve2.modular_robot.sensor_state import (
     IMUSensorState,
     ModularRobotSensorState,
 )
-from revolve2.simulation.scene import SimulationState, UUIDKey
+from revolve2.simulation.scene import JointHinge, SimulationState, UUIDKey
+from revolve2.simulation.scene.sensors import IMUSensor as IMUSim
 
 from .._build_multi_body_systems import (
     BodyToMultiBodySystemMapping,
@@ -24,28 +30,39 @@ from ._imu_sensor_state_impl import (
     IMUSensorStateImpl,
 )
 
+ResolvedSensors = dict[tuple[UUID, ...], list[JointHinge]]
+"""Sequences of active hinge sensors resolved to their joint hinges."""
+
 
 class ModularRobotSensorStateImpl(ModularRobotSensorState):
     """Implementation for ModularRobotSensorState."""
 
     _simulation_state: SimulationState
     _body_to_multi_body_system_mapping: BodyToMultiBodySystemMapping
+    _resolved_sensors: ResolvedSensors
 
     def __init__(
         self,
         simulation_state: SimulationState,
         body_to_multi_body_system_mapping: BodyToMultiBodySystemMapping,
+        resolved_sensors: ResolvedSensors | None = None,
     ) -> None:
         """Initialize this object.
 
         :param simulation_state: The state of the simulation.
         :param body_to_multi_body_system_mapping: A mapping from body to
             multi-body system
+        :param resolved_sensors: Sequences of active hinge sensors
+            resolved earlier for the same mapping. Sequences resolved by
+            this object are added to it.
         """
         self._simulation_state = simulation_state
         self._body_to_multi_body_system_mapping = (
             body_to_multi_body_system_mapping
         )
+        self._resolved_sensors = (
+            {} if resolved_sensors is None else resolved_sensors
+        )
 
     def get_active_hinge_sensor_state(
         self, sensor: ActiveHingeSensor
@@ -110,3 +127,77 @@ class ModularRobotSensorStateImpl(ModularRobotSensorState):
             multi_body_system=self._body_to_multi_body_system_mapping.multi_body_system,
             camera=maybe_camera,
         )
+
+    def get_active_hinge_positions(
+        self, sensors: Sequence[ActiveHingeSensor]
+    ) -> npt.NDArray[np.float64]:
+        """Get the positions measured by a number of active hinge sensors.
+
+        :param sensors: The sensors.
+        :type sensors: Sequence[ActiveHingeSensor]
+        :returns: The position measured by each sensor, in the same order.
+        :rtype: npt.NDArray[np.float64]
+        """
+        key = tuple(sensor.uuid for sensor in sensors)
+        joints = self._resolved_sensors.get(key)
+        if joints is None:
+            mapping = self._body_to_multi_body_system_mapping.active_hinge_sensor_to_joint_hinge
+            joints = [mapping[UUIDKey(sensor)] for sensor in sensors]
+            self._resolved_sensors[key] = joints
+        return self._simulation_state.get_hinge_joint_positions(joints)
+
+    def get_imu_specific_force(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the specific force measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The specific force, with shape (3,).
+        :rtype: npt.NDArray[np.float64]
+        """
+        return self._simulation_state.get_imu_specific_forces([
+            self._get_sim_imu(sensor)
+        ]).reshape(3)
+
+    def get_imu_angular_rate(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the angular rate measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The angular rate, with shape (3,).
+        :rtype: npt.NDArray[np.float64]
+        """
+        return self._simulation_state.get_imu_angular_rates([
+            self._get_sim_imu(sensor)
+        ]).reshape(3)
+
+    def get_imu_orientation(
+        self, sensor: IMUSensor
+    ) -> npt.NDArray[np.float64]:
+        """Get the orientation measured by an IMU sensor.
+
+        :param sensor: The sensor.
+        :type sensor: IMUSensor
+        :returns: The orientation, with shape (4,), with the components
+            in the same order as `IMUSensorState.orientation`.
+        :rtype: npt.NDArray[np.float64]
+        """
+        self._get_sim_imu(sensor)  # Only checks the IMU is in the scene.
+        return self._simulation_state.get_multi_body_system_orientation(
+            self._body_to_multi_body_system_mapping.multi_body_system
+        )
+
+    def _get_sim_imu(self, sensor: IMUSensor) -> IMUSim:
+        """Get the simulated IMU of an IMU sensor.
+
+        :param sensor: The IMU sensor.
+        :returns: The simulated IMU.
+        """
+        maybe_imu = self._body_to_multi_body_system_mapping.imu_to_sim_imu.get(
+            UUIDKey(sensor)
+        )
+        assert maybe_imu is not None, "IMU not in scene."
+        return maybe_imu
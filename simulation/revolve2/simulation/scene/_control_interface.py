@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 from ._joint_hinge import JointHinge
 
@@ -20,3 +24,26 @@ class ControlInterface(ABC):
         :rtype: None
 
         """
+
+    def set_joint_hinge_position_targets(
+        self,
+        joint_hinges: Sequence[JointHinge],
+        positions: npt.NDArray[np.float64],
+    ) -> None:
+        """Set the position targets of a number of hinge joints at once.
+
+        Simulators can override this to write all targets in a single
+        operation. By default, the targets are set one by one.
+
+        :param joint_hinges: The hinges to set the position targets for,
+            without duplicates.
+        :type joint_hinges: Sequence[JointHinge]
+        :param positions: The position target of each hinge, in the same
+            order.
+        :type positions: npt.NDArray[np.float64]
+        :rtype: None
+        """
+        for joint_hinge, position in zip(
+            joint_hinges, positions.tolist(), strict=True
+        ):
+            self.set_joint_hinge_position_target(joint_hinge, position)
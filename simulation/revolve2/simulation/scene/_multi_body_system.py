@@ -51,41 +51,21 @@ class MultiBodySystem:
     )
     """Maps rigid bodies to their index in the rigid body list."""
 
-    _half_adjacency_matrix: list[Joint | None] = field(
+    _adjacency: list[dict[int, Joint]] = field(
         default_factory=list, init=False
     )
-    """Adjacency matrix, defining joints between rigid bodies.
+    """Joints between rigid bodies, as an adjacency list.
 
-    The the indices of the list match the following indices in the adjacency matrix:
-
-    joints | 0 1 2 3 4
-         --|----------
-         0 | - 0 2 5 9
-         1 | 0 - 1 4 8
-         2 | 2 1 - 3 7
-         3 | 5 4 3 - 6
-         4 | 9 8 7 6 -
+    For each rigid body, by index, maps the index of every rigid body it
+    is connected to onto the joint between them.
     """
 
-    def _half_matrix_index(
-        self, rigid_body1_list_index: int, rigid_body2_list_index: int
-    ) -> int:
-        """:param rigid_body1_list_index:
-        :type rigid_body1_list_index: int
-        :param rigid_body2_list_index:
-        :type rigid_body2_list_index: int
-        :rtype: int
-        """
-        assert rigid_body1_list_index != rigid_body2_list_index
-        smallest_index = min(rigid_body1_list_index, rigid_body2_list_index)
-        assert smallest_index >= 0
-        largest_index = max(rigid_body1_list_index, rigid_body2_list_index)
-        assert largest_index < len(self._rigid_bodies)
-
-        base_index = ((largest_index - 1) * largest_index // 2) + (
-            largest_index - 1
-        )
-        return base_index - smallest_index
+    _ordered_joints: list[list[Joint] | None] = field(
+        default_factory=list, init=False
+    )
+    """For each rigid body, its joints ordered by the index of the rigid
+    body they connect to, or None if not calculated since the last joint
+    was added to it."""
 
     def add_rigid_body(self, rigid_body: RigidBody) -> None:
         """Add a rigid body to the system.
@@ -98,8 +78,9 @@ class MultiBodySystem:
             UUIDKey(rigid_body) not in self._rigid_body_to_index
         ), "Rigid body already part of this multi-body system."
 
-        # Extend adjacency matrix
-        self._half_adjacency_matrix.extend([None] * len(self._rigid_bodies))
+        # Extend adjacency list
+        self._adjacency.append({})
+        self._ordered_joints.append(None)
 
         # Add rigid body
         self._rigid_body_to_index[UUIDKey(rigid_body)] = len(self._rigid_bodies)
@@ -128,17 +109,20 @@ class MultiBodySystem:
             maybe_rigid_body_index1 != maybe_rigid_body_index2
         ), "Cannot create a joint between a rigid body and itself."
 
-        # Get the index in the adjacency matrix
-        half_matrix_index = self._half_matrix_index(
-            maybe_rigid_body_index1,
-            maybe_rigid_body_index2,
-        )
         assert (
-            self._half_adjacency_matrix[half_matrix_index] is None
+            maybe_rigid_body_index2
+            not in self._adjacency[maybe_rigid_body_index1]
         ), "A joint already exists between these two rigid bodies."
 
-        # Assign the joint in the adjacency matrix
-        self._half_adjacency_matrix[half_matrix_index] = joint
+        # Add the joint to the adjacency list of both rigid bodies
+        self._adjacency[maybe_rigid_body_index1][maybe_rigid_body_index2] = (
+            joint
+        )
+        self._adjacency[maybe_rigid_body_index2][maybe_rigid_body_index1] = (
+            joint
+        )
+        self._ordered_joints[maybe_rigid_body_index1] = None
+        self._ordered_joints[maybe_rigid_body_index2] = None
 
     def has_root(self) -> bool:
         """Check whether a root has been added.
@@ -169,6 +153,9 @@ class MultiBodySystem:
     ) -> list[Joint | JointHinge]:
         """Get all joints attached to the provided rigid body.
 
+        The joints are in the order the rigid bodies at their other ends
+        were added to this system.
+
         :param rigid_body: A previously added rigid body.
         :type rigid_body: RigidBody
         :returns: The attached joints.
@@ -179,16 +166,12 @@ class MultiBodySystem:
             maybe_index is not None
         ), "Rigid body is not part of this multi-body system."
 
-        half_matrix_indices = [
-            self._half_matrix_index(maybe_index, other_body_list_index)
-            for other_body_list_index in range(len(self._rigid_bodies))
-            if other_body_list_index != maybe_index
-        ]
-        maybe_joints = [
-            self._half_adjacency_matrix[half_matrix_index]
-            for half_matrix_index in half_matrix_indices
-        ]
-        return [joint for joint in maybe_joints if joint is not None]
+        ordered_joints = self._ordered_joints[maybe_index]
+        if ordered_joints is None:
+            adjacent = self._adjacency[maybe_index]
+            ordered_joints = [adjacent[index] for index in sorted(adjacent)]
+            self._ordered_joints[maybe_index] = ordered_joints
+        return list(ordered_joints)
 
     def calculate_aabb(self) -> tuple[Vector3, AABB]:
         """Calculate the axis-aligned bounding box of this multi-body system
@@ -1,7 +1,9 @@
 import uuid
 from dataclasses import dataclass, field
 
-from pyrr import Matrix33, Quaternion, Vector3
+import numpy as np
+import numpy.typing as npt
+from pyrr import Matrix33, Vector3
 
 from ._pose import Pose
 from .geometry import (
@@ -37,6 +39,21 @@ class _AttachedSensors:
                 raise ValueError(msg)
 
 
+@dataclass(kw_only=True)
+class _MassProperties:
+    """Mass properties derived from the geometries of a rigid body."""
+
+    key: bytes
+    """The values of the geometries these properties were derived from."""
+
+    masses: npt.NDArray[np.float64]
+    positions: npt.NDArray[np.float64]
+    orientations: npt.NDArray[np.float64]
+    center_of_mass: npt.NDArray[np.float64]
+    inertia: npt.NDArray[np.float64] | None = None
+    """Calculated when first requested."""
+
+
 class RigidBody:
     """A collection of geometries and physics parameters."""
 
@@ -46,6 +63,7 @@ class RigidBody:
     dynamic_friction: float
     geometries: list[Geometry]
     sensors: _AttachedSensors
+    _cached_mass_properties: _MassProperties | None
 
     def __init__(
         self,
@@ -68,6 +86,7 @@ class RigidBody:
         self.dynamic_friction = dynamic_friction
         self.geometries = geometries
         self.sensors = _AttachedSensors()
+        self._cached_mass_properties = None
 
     @property
     def uuid(self) -> uuid.UUID:
@@ -96,18 +115,7 @@ class RigidBody:
         :returns: The center of mass.
         :rtype: Vector3
         """
-        if self.mass() == 0:
-            return sum(
-                geometry.mass * geometry.pose.position
-                for geometry in self.geometries
-            ) / len(self.geometries)
-        return (
-            sum(
-                geometry.mass * geometry.pose.position
-                for geometry in self.geometries
-            )
-            / self.mass()
-        )
+        return Vector3(self._mass_properties().center_of_mass.copy())
 
     def inertia_tensor(self) -> Matrix33:
         """Calculate the inertia tensor in the local reference frame of this
@@ -120,45 +128,129 @@ class RigidBody:
         :rtype: Matrix33
         :raises ValueError: If one of the geometries is not a box.
         """
-        com = self.center_of_mass()
-        inertia = Matrix33()
+        mass_properties = self._mass_properties()
+        if mass_properties.inertia is None:
+            mass_properties.inertia = self._calculate_inertia(mass_properties)
+        return Matrix33(mass_properties.inertia.copy())
+
+    def _mass_properties(self) -> _MassProperties:
+        """Get the mass properties of the geometries.
+
+        They are calculated again only if a geometry was added, removed
+        or changed since the last call.
+
+        :returns: The mass properties.
+        """
+        masses = np.array(
+            [geometry.mass for geometry in self.geometries], dtype=np.float64
+        )
+        positions = np.array(
+            [geometry.pose.position for geometry in self.geometries],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        orientations = np.array(
+            [geometry.pose.orientation for geometry in self.geometries],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        shapes = tuple(
+            (type(geometry), self._shape_parameters(geometry))
+            for geometry in self.geometries
+        )
+        key = (
+            masses.tobytes()
+            + positions.tobytes()
+            + orientations.tobytes()
+            + repr(shapes).encode()
+        )
+
+        if self._cached_mass_properties is None or (
+            self._cached_mass_properties.key != key
+        ):
+            mass = self.mass()
+            weighted_positions = (masses[:, np.newaxis] * positions).sum(
+                axis=0
+            )
+            self._cached_mass_properties = _MassProperties(
+                key=key,
+                masses=masses,
+                positions=positions,
+                orientations=orientations,
+                center_of_mass=weighted_positions
+                / (len(self.geometries) if mass == 0 else mass),
+            )
+        return self._cached_mass_properties
 
-        for geometry in self.geometries:
+    def _calculate_inertia(
+        self, mass_properties: _MassProperties
+    ) -> npt.NDArray[np.float64]:
+        """Calculate the inertia tensor of all geometries at once.
+
+        :param mass_properties: The mass properties of the geometries.
+        :returns: The inertia tensor.
+        :raises ValueError: If one of the geometries with mass is not a
+            box or a sphere.
+        """
+        # The principal moments of each geometry in its own frame.
+        local_moments = np.zeros((len(self.geometries), 3))
+        for index, geometry in enumerate(self.geometries):
             if geometry.mass == 0:
                 continue
 
             match geometry:
                 case GeometryBox():
-                    local_inertia = self._calculate_box_inertia(geometry)
+                    local_moments[index] = self._calculate_box_inertia(
+                        geometry
+                    ).diagonal()
                 case GeometrySphere():
-                    local_inertia = self._calculate_sphere_inertia(geometry)
+                    local_moments[index] = self._calculate_sphere_inertia(
+                        geometry
+                    ).diagonal()
                 case _:
                     msg = f"Geometries with non-zero mass of type {type(geometry)} are not supported yet."
                     raise ValueError(msg)
-
-            translation = Matrix33()
-            translation[0, 0] += geometry.mass * (
-                (geometry.pose.position.y - com.y) ** 2
-                + (geometry.pose.position.z - com.z) ** 2
-            )
-            translation[1, 1] += geometry.mass * (
-                (geometry.pose.position.x - com.x) ** 2
-                + (geometry.pose.position.z - com.z) ** 2
-            )
-            translation[2, 2] += geometry.mass * (
-                (geometry.pose.position.x - com.x) ** 2
-                + (geometry.pose.position.y - com.y) ** 2
+        with_mass = mass_properties.masses != 0
+        masses = mass_properties.masses[with_mass]
+        offsets = (
+            mass_properties.positions[with_mass]
+            - mass_properties.center_of_mass
+        ) ** 2
+
+        translations = np.zeros((len(masses), 3, 3))
+        translations[:, 0, 0] = masses * (offsets[:, 1] + offsets[:, 2])
+        translations[:, 1, 1] = masses * (offsets[:, 0] + offsets[:, 2])
+        translations[:, 2, 2] = masses * (offsets[:, 0] + offsets[:, 1])
+
+        local_inertias = np.zeros((len(masses), 3, 3))
+        for axis in range(3):
+            local_inertias[:, axis, axis] = local_moments[with_mass, axis]
+
+        rotations = self._quaternions_to_rotation_matrices(
+            mass_properties.orientations[with_mass]
+        )
+        global_inertias = (
+            np.matmul(
+                rotations.transpose(0, 2, 1),
+                np.matmul(local_inertias, rotations),
             )
+            + translations
+        )
+        return global_inertias.sum(axis=0)
 
-            ori_as_mat = self._quaternion_to_rotation_matrix(
-                geometry.pose.orientation
-            )
-            global_inertia = (
-                ori_as_mat * local_inertia * ori_as_mat.transpose()
-                + translation
-            )
-            inertia += global_inertia
-        return inertia
+    @staticmethod
+    def _shape_parameters(geometry: Geometry) -> tuple[float, ...]:
+        """Get the parameters that define the shape of a geometry.
+
+        :param geometry: The geometry.
+        :returns: The size of a box, the radius of a sphere, or nothing
+            for other geometries.
+        """
+        match geometry:
+            case GeometryBox():
+                return tuple(float(size) for size in geometry.aabb.size)
+            case GeometrySphere():
+                return (float(geometry.radius),)
+            case _:
+                return ()
 
     @staticmethod
     def _calculate_box_inertia(geometry: GeometryBox) -> Matrix33:
@@ -205,28 +297,31 @@ class RigidBody:
         return local_inertia
 
     @staticmethod
-    def _quaternion_to_rotation_matrix(quat: Quaternion) -> Matrix33:
-        """:param quat:
-        :type quat: Quaternion
-        :rtype: Matrix33
+    def _quaternions_to_rotation_matrices(
+        quats: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """:param quats: Quaternions, one per row.
+        :type quats: npt.NDArray[np.float64]
+        :rtype: npt.NDArray[np.float64]
         """
         # https://automaticaddison.com/how-to-convert-a-quaternion-to-a-rotation-matrix/
 
-        q0, q1, q2, q3 = quat
+        q0, q1, q2, q3 = quats.T
+        rotations = np.empty((len(quats), 3, 3))
 
         # First row of the rotation matrix
-        r00 = 2 * (q0 * q0 + q1 * q1) - 1
-        r01 = 2 * (q1 * q2 - q0 * q3)
-        r02 = 2 * (q1 * q3 + q0 * q2)
+        rotations[:, 0, 0] = 2 * (q0 * q0 + q1 * q1) - 1
+        rotations[:, 0, 1] = 2 * (q1 * q2 - q0 * q3)
+        rotations[:, 0, 2] = 2 * (q1 * q3 + q0 * q2)
 
         # Second row of the rotation matrix
-        r10 = 2 * (q1 * q2 + q0 * q3)
-        r11 = 2 * (q0 * q0 + q2 * q2) - 1
-        r12 = 2 * (q2 * q3 - q0 * q1)
+        rotations[:, 1, 0] = 2 * (q1 * q2 + q0 * q3)
+        rotations[:, 1, 1] = 2 * (q0 * q0 + q2 * q2) - 1
+        rotations[:, 1, 2] = 2 * (q2 * q3 - q0 * q1)
 
         # Third row of the rotation matrix
-        r20 = 2 * (q1 * q3 - q0 * q2)
-        r21 = 2 * (q2 * q3 + q0 * q1)
-        r22 = 2 * (q0 * q0 + q3 * q3) - 1
+        rotations[:, 2, 0] = 2 * (q1 * q3 - q0 * q2)
+        rotations[:, 2, 1] = 2 * (q2 * q3 + q0 * q1)
+        rotations[:, 2, 2] = 2 * (q0 * q0 + q3 * q3) - 1
 
-        return Matrix33([[r00, r01, r02], [r10, r11, r12], [r20, r21, r22]])
+        return rotations
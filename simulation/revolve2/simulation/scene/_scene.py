@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 
 from ._multi_body_system import MultiBodySystem
 from ._simulation_handler import SimulationHandler
+from .termination import TerminationCondition
 
 
 @dataclass(kw_only=True)
@@ -9,6 +10,13 @@ class Scene:
     """Description of a scene that can be simulated."""
 
     handler: SimulationHandler
+    termination_conditions: list[TerminationCondition] = field(
+        default_factory=list
+    )
+    """Conditions under which the simulation of this scene stops early.
+
+    The simulation stops when any of them is met.
+    """
     _multi_body_systems: list[MultiBodySystem] = field(
         default_factory=list, init=False
     )
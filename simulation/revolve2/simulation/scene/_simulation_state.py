@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 import numpy as np
 from numpy.typing import NDArray
@@ -52,6 +53,28 @@ class SimulationState(ABC):
 
         """
 
+    def get_multi_body_system_orientation(
+        self, multi_body_system: MultiBodySystem
+    ) -> NDArray[np.float64]:
+        """Get the orientation of a multi-body system, relative to the global
+        reference frame.
+
+        Simulators can override this to skip creating the pose. By
+        default, the orientation is taken from `get_multi_body_system_pose`.
+
+        :param multi_body_system: The multi-body system to get the
+            orientation for.
+        :type multi_body_system: MultiBodySystem
+        :returns: The orientation, with shape (4,), with the components in
+            the same order as `Pose.orientation`.
+        :rtype: NDArray[np.float64]
+
+        """
+        return np.array(
+            self.get_multi_body_system_pose(multi_body_system).orientation,
+            dtype=np.float64,
+        )
+
     @abstractmethod
     def get_hinge_joint_position(self, joint: JointHinge) -> float:
         """Get the rotational position of a hinge joint.
@@ -63,6 +86,26 @@ class SimulationState(ABC):
 
         """
 
+    def get_hinge_joint_positions(
+        self, joints: Sequence[JointHinge]
+    ) -> NDArray[np.float64]:
+        """Get the rotational positions of a number of hinge joints at once.
+
+        Simulators can override this to read all positions in a single
+        operation. By default, the positions are read one by one.
+
+        :param joints: The joints to get the rotational positions for.
+        :type joints: Sequence[JointHinge]
+        :returns: The rotational position of each joint, in the same
+            order.
+        :rtype: NDArray[np.float64]
+
+        """
+        return np.array(
+            [self.get_hinge_joint_position(joint) for joint in joints],
+            dtype=np.float64,
+        )
+
     @abstractmethod
     def get_imu_specific_force(self, imu_sensor: IMUSensor) -> Vector3:
         """Get the specific force measured an IMU.
@@ -85,6 +128,59 @@ class SimulationState(ABC):
 
         """
 
+    def get_imu_specific_forces(
+        self, imu_sensors: Sequence[IMUSensor]
+    ) -> NDArray[np.float64]:
+        """Get the specific forces measured by a number of IMUs at once.
+
+        Simulators can override this to read all IMUs in a single
+        operation. By default, the IMUs are read one by one.
+
+        :param imu_sensors: The IMUs.
+        :type imu_sensors: Sequence[IMUSensor]
+        :returns: The specific force of each IMU, in the same order, with
+            shape (len(imu_sensors), 3).
+        :rtype: NDArray[np.float64]
+
+        """
+        return np.array(
+            [self.get_imu_specific_force(imu) for imu in imu_sensors],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+
+    def get_imu_angular_rates(
+        self, imu_sensors: Sequence[IMUSensor]
+    ) -> NDArray[np.float64]:
+        """Get the angular rates measured by a number of IMUs at once.
+
+        Simulators can override this to read all IMUs in a single
+        operation. By default, the IMUs are read one by one.
+
+        :param imu_sensors: The IMUs.
+        :type imu_sensors: Sequence[IMUSensor]
+        :returns: The angular rate of each IMU, in the same order, with
+            shape (len(imu_sensors), 3).
+        :rtype: NDArray[np.float64]
+
+        """
+        return np.array(
+            [self.get_imu_angular_rate(imu) for imu in imu_sensors],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+
+    def is_unstable(self) -> bool:
+        """Check if the physics simulation became numerically unstable.
+
+        A state cannot tell on its own, so by default it is never
+        considered unstable. Simulators that detect instability override
+        this.
+
+        :returns: Whether the simulation diverged at some point.
+        :rtype: bool
+
+        """
+        return False
+
     @abstractmethod
     def get_camera_view(self, camera_sensor: CameraSensor) -> NDArray[np.uint8]:
         """Get the camera view.
@@ -0,0 +1,9 @@
+"""Conditions to stop the simulation of a scene early."""
+
+from ._flipped import Flipped
+from ._predicate import Predicate
+from ._stuck import Stuck
+from ._termination_condition import TerminationCondition
+from ._unstable import Unstable
+
+__all__ = ["Flipped", "Predicate", "Stuck", "TerminationCondition", "Unstable"]
@@ -0,0 +1,49 @@
+from pyrr import Vector3
+
+from .._multi_body_system import MultiBodySystem
+from .._simulation_state import SimulationState
+from ._termination_condition import TerminationCondition
+
+
+class Flipped(TerminationCondition):
+    """Met when a multi-body system is upside down.
+
+    That is when the z-axis of its reference frame points downwards.
+    """
+
+    _multi_body_system: MultiBodySystem
+    _min_up: float
+
+    def __init__(
+        self, multi_body_system: MultiBodySystem, min_up: float = 0.0
+    ) -> None:
+        """Initialize this object.
+
+        :param multi_body_system: The multi-body system to watch.
+        :param min_up: The world z-component of the frame's z-axis below
+            which the system counts as flipped. 0 means lying on its
+            side is still fine.
+        """
+        self._multi_body_system = multi_body_system
+        self._min_up = min_up
+
+    @property
+    def reason(self) -> str:
+        """Get why the simulation stopped when this condition is met.
+
+        :returns: A short description, reported in the results.
+        """
+        return "flipped"
+
+    def is_met(self, simulation_state: SimulationState, time: float) -> bool:
+        """Check if the simulation should stop.
+
+        :param simulation_state: The current state of the simulation.
+        :param time: The current simulation time. In seconds.
+        :returns: Whether the condition is met.
+        """
+        pose = simulation_state.get_multi_body_system_pose(
+            self._multi_body_system
+        )
+        up = pose.orientation * Vector3([0.0, 0.0, 1.0])
+        return bool(up.z < self._min_up)
@@ -0,0 +1,47 @@
+from collections.abc import Callable
+
+from .._simulation_state import SimulationState
+from ._termination_condition import TerminationCondition
+
+
+class Predicate(TerminationCondition):
+    """Met when a user supplied function says so.
+
+    When simulating in other processes, the function must be picklable,
+    so it cannot be a lambda or a local function.
+    """
+
+    _predicate: Callable[[SimulationState, float], bool]
+    _reason: str
+
+    def __init__(
+        self,
+        predicate: Callable[[SimulationState, float], bool],
+        reason: str,
+    ) -> None:
+        """Initialize this object.
+
+        :param predicate: Gets the simulation state and time, and returns
+            whether the simulation should stop.
+        :param reason: Why the simulation stopped when the predicate
+            returns True.
+        """
+        self._predicate = predicate
+        self._reason = reason
+
+    @property
+    def reason(self) -> str:
+        """Get why the simulation stopped when this condition is met.
+
+        :returns: A short description, reported in the results.
+        """
+        return self._reason
+
+    def is_met(self, simulation_state: SimulationState, time: float) -> bool:
+        """Check if the simulation should stop.
+
+        :param simulation_state: The current state of the simulation.
+        :param time: The current simulation time. In seconds.
+        :returns: Whether the condition is met.
+        """
+        return self._predicate(simulation_state, time)
@@ -0,0 +1,79 @@
+from collections import deque
+
+from pyrr import Vector3
+
+from .._multi_body_system import MultiBodySystem
+from .._simulation_state import SimulationState
+from ._termination_condition import TerminationCondition
+
+
+class Stuck(TerminationCondition):
+    """Met when a multi-body system barely moves for some time.
+
+    The horizontal displacement over the last `window` seconds is
+    compared to `min_displacement`.
+    """
+
+    _multi_body_system: MultiBodySystem
+    _window: float
+    _min_displacement: float
+    _history: deque[tuple[float, Vector3]]
+
+    def __init__(
+        self,
+        multi_body_system: MultiBodySystem,
+        window: float,
+        min_displacement: float,
+    ) -> None:
+        """Initialize this object.
+
+        :param multi_body_system: The multi-body system to watch.
+        :param window: The time over which the displacement is measured.
+            In seconds.
+        :param min_displacement: The smallest horizontal displacement over
+            the window that does not count as stuck. In meters.
+        """
+        self._multi_body_system = multi_body_system
+        self._window = window
+        self._min_displacement = min_displacement
+        self._history = deque()
+
+    @property
+    def reason(self) -> str:
+        """Get why the simulation stopped when this condition is met.
+
+        :returns: A short description, reported in the results.
+        """
+        return "stuck"
+
+    def reset(self) -> None:
+        """Forget everything seen so far, before a new simulation starts."""
+        self._history = deque()
+
+    def is_met(self, simulation_state: SimulationState, time: float) -> bool:
+        """Check if the simulation should stop.
+
+        :param simulation_state: The current state of the simulation.
+        :param time: The current simulation time. In seconds.
+        :returns: Whether the condition is met.
+        """
+        position = simulation_state.get_multi_body_system_pose(
+            self._multi_body_system
+        ).position
+        self._history.append((time, Vector3(position)))
+
+        # Keep exactly one entry at or before the start of the window.
+        while (
+            len(self._history) > 1
+            and self._history[1][0] <= time - self._window
+        ):
+            self._history.popleft()
+
+        start_time, start_position = self._history[0]
+        if time - start_time < self._window:
+            return False
+        displacement = position - start_position
+        return bool(
+            (displacement.x**2 + displacement.y**2) ** 0.5
+            < self._min_displacement
+        )
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+
+from .._simulation_state import SimulationState
+
+
+class TerminationCondition(ABC):
+    """A condition under which the simulation of a scene is stopped early.
+
+    Conditions are checked at the control frequency of the simulation.
+    Every simulation works on its own shallow copy of a condition, so
+    the same condition can be given to multiple scenes.
+    """
+
+    @property
+    @abstractmethod
+    def reason(self) -> str:
+        """Get why the simulation stopped when this condition is met.
+
+        :returns: A short description, reported in the results.
+        """
+
+    @abstractmethod
+    def is_met(self, simulation_state: SimulationState, time: float) -> bool:
+        """Check if the simulation should stop.
+
+        :param simulation_state: The current state of the simulation.
+        :param time: The current simulation time. In seconds.
+        :returns: Whether the condition is met.
+        """
+
+    def reset(self) -> None:
+        """Forget everything seen so far, before a new simulation starts.
+
+        This is called on the copy, so mutable state must be replaced
+        rather than cleared. Stateless conditions do not need to
+        override this.
+        """
@@ -0,0 +1,23 @@
+from .._simulation_state import SimulationState
+from ._termination_condition import TerminationCondition
+
+
+class Unstable(TerminationCondition):
+    """Met when the physics simulation became numerically unstable."""
+
+    @property
+    def reason(self) -> str:
+        """Get why the simulation stopped when this condition is met.
+
+        :returns: A short description, reported in the results.
+        """
+        return "unstable"
+
+    def is_met(self, simulation_state: SimulationState, time: float) -> bool:
+        """Check if the simulation should stop.
+
+        :param simulation_state: The current state of the simulation.
+        :param time: The current simulation time. In seconds.
+        :returns: Whether the condition is met.
+        """
+        return simulation_state.is_unstable()
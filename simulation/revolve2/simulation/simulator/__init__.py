@@ -2,8 +2,24 @@
 
 from ._batch import Batch
 from ._batch_parameters import BatchParameters
+from ._physics_diagnostics import PhysicsDiagnostics
 from ._record_settings import RecordSettings
+from ._recording_spec import RecordingSpec
+from ._scene_report import SceneReport
+from ._scene_result import SceneResult
+from ._scene_timings import SceneTimings
 from ._simulator import Simulator
 from ._viewer import Viewer
 
-__all__ = ["Batch", "BatchParameters", "RecordSettings", "Simulator", "Viewer"]
+__all__ = [
+    "Batch",
+    "BatchParameters",
+    "PhysicsDiagnostics",
+    "RecordSettings",
+    "RecordingSpec",
+    "SceneReport",
+    "SceneResult",
+    "SceneTimings",
+    "Simulator",
+    "Viewer",
+]
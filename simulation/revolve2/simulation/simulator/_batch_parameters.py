@@ -1,4 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from ..scene.termination import TerminationCondition
+from ._recording_spec import RecordingSpec
 
 
 @dataclass(kw_only=True)
@@ -38,3 +41,50 @@ class BatchParameters:
 
     integrator: str
     """The integrator to use for simulation."""
+
+    camera_frequency: float | None = None
+    """Hz.
+
+    How often the images of camera sensors are refreshed. Cameras are
+    only rendered when their image is actually requested. If set to
+    'None', the control frequency is used.
+    """
+
+    recording_spec: RecordingSpec = field(default_factory=RecordingSpec)
+    """Which parts of the simulation state are sampled.
+
+    By default, everything is recorded.
+    """
+
+    termination_conditions: list[TerminationCondition] = field(
+        default_factory=list
+    )
+    """Conditions under which the simulation of any scene stops early.
+
+    These are checked in addition to the conditions of the scene itself.
+    """
+
+    collect_timings: bool = False
+    """Whether to measure where the wall-clock time of each scene goes.
+
+    The timings are part of the scene reports of the simulator.
+    """
+
+    collect_physics_diagnostics: bool = False
+    """Whether to observe the energy and penetrations of each scene.
+
+    The diagnostics are part of the scene reports of the simulator. They
+    are meant for choosing the timestep and integrator, and cost some
+    time when enabled.
+    """
+
+    warm_up_time: float | None = None
+    """Seconds.
+
+    How long each scene is first simulated without control, so robots
+    can settle before they are evaluated. Each scene then starts from
+    the resulting state, at time zero. Structurally identical scenes,
+    such as the same body with different brains, share a single warm-up
+    where possible, and simulators may keep the warmed-up states between
+    batches. If set to 'None', scenes start without warm-up.
+    """
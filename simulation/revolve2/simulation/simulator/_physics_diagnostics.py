@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+
+
+@dataclass(kw_only=True)
+class PhysicsDiagnostics:
+    """How physically plausible the simulation of a single scene was.
+
+    The quantities are observed whenever the simulator stops stepping,
+    such as at control and sample events, not after every physics step.
+    """
+
+    initial_energy: float
+    """The total mechanical energy at the start. In joules."""
+
+    max_energy: float
+    """The highest total mechanical energy observed. In joules."""
+
+    final_energy: float
+    """The total mechanical energy at the end. In joules."""
+
+    max_penetration: float
+    """The deepest penetration between two colliding geometries. In
+    meters."""
+
+    @property
+    def energy_gain(self) -> float:
+        """Get how much energy the simulation added at most.
+
+        Without actuation, friction and damping only remove energy, so a
+        gain means the integration is unstable at the used timestep.
+
+        :returns: The gain in joules. Zero if energy never increased.
+        :rtype: float
+        """
+        return max(0.0, self.max_energy - self.initial_energy)
@@ -0,0 +1,41 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from ..scene._joint_hinge import JointHinge
+from ..scene._multi_body_system import MultiBodySystem
+from ..scene.sensors import CameraSensor, IMUSensor
+
+
+@dataclass(kw_only=True, frozen=True)
+class RecordingSpec:
+    """Which parts of the simulation state are sampled.
+
+    Leaving out what is not needed reduces the memory used by the results
+    and the amount of data sent between processes. Reading a part of a
+    sampled state that was not recorded raises a `KeyError`.
+    This only applies to the sampled states; scene handlers always get
+    the full state.
+
+    Each part is either recorded for all objects of its kind, for none
+    of them, or only for the objects given. Objects are matched by their
+    uuid, so the given objects may be copies of the simulated ones.
+    """
+
+    rigid_bodies: bool = True
+    """Record the pose of every body in the simulation.
+
+    If False, `xpos` and `xquat` of a sampled state only contain the
+    bodies of the recorded multi-body systems.
+    """
+
+    multi_body_systems: bool | Sequence[MultiBodySystem] = True
+    """Record the pose of the multi-body systems."""
+
+    hinge_joints: bool | Sequence[JointHinge] = True
+    """Record the position of the hinge joints."""
+
+    imu_sensors: bool | Sequence[IMUSensor] = True
+    """Record the readings of the IMU sensors."""
+
+    camera_sensors: bool | Sequence[CameraSensor] = True
+    """Record the views of the camera sensors."""
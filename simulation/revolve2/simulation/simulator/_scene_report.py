@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from ._physics_diagnostics import PhysicsDiagnostics
+from ._scene_timings import SceneTimings
+
+
+@dataclass(kw_only=True)
+class SceneReport:
+    """How the simulation of a single scene went."""
+
+    end_time: float
+    """Seconds.
+
+    The simulation time at which the simulation stopped.
+    """
+
+    termination_reason: str | None = None
+    """Why the simulation stopped early.
+
+    None if it ran for the full simulation time.
+    """
+
+    timings: SceneTimings | None = None
+    """Where the wall-clock time went.
+
+    Only measured if the batch parameters ask for it.
+    """
+
+    physics: PhysicsDiagnostics | None = None
+    """How physically plausible the simulation was.
+
+    Only observed if the batch parameters ask for it.
+    """
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from ..scene._simulation_state import SimulationState
+from ._scene_report import SceneReport
+
+
+@dataclass(kw_only=True)
+class SceneResult:
+    """The outcome of simulating a single scene."""
+
+    states: list[SimulationState]
+    """The sampled simulation states, in ascending order of time."""
+
+    report: SceneReport
+    """How the simulation went."""
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+
+@dataclass(kw_only=True)
+class SceneTimings:
+    """Where the wall-clock time of simulating a single scene went.
+
+    All durations are in seconds. A phase that happens inside another is
+    only counted for the inner one; cameras rendered for the scene
+    handler, for example, count as camera rendering and not as control.
+    The total includes the time that is not part of any phase.
+    """
+
+    total: float
+    """From building the model until the simulation stopped."""
+
+    model_build: float
+    """Converting the scene and compiling it to a model, or looking it up
+    in the model cache."""
+
+    data_allocation: float
+    """Allocating the simulation data, or resetting cached data."""
+
+    physics: float
+    """Stepping the physics."""
+
+    control: float
+    """Checking the termination conditions and calling the scene
+    handler."""
+
+    sampling: float
+    """Storing samples of the simulation state."""
+
+    camera_rendering: float
+    """Rendering the camera sensors."""
+
+    video: float
+    """Rendering, reading back and writing video frames.
+
+    When a viewer is open, its rendering is counted here as well.
+    """
+
+    num_steps: int
+    """The number of physics steps."""
+
+    simulation_time: float
+    """The simulated time. In seconds."""
+
+    @property
+    def steps_per_second(self) -> float:
+        """Get the number of physics steps per second of wall-clock time.
+
+        :returns: The steps per second.
+        :rtype: float
+        """
+        return self.num_steps / self.total if self.total > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Get the simulated time per second of wall-clock time.
+
+        Above one, the scene was simulated faster than real time.
+
+        :returns: The ratio of simulated time to wall-clock time.
+        :rtype: float
+        """
+        return self.simulation_time / self.total if self.total > 0 else 0.0
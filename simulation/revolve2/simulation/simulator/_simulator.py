@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 from ..scene._simulation_state import SimulationState
 from ._batch import Batch
+from ._scene_result import SceneResult
 
 
 class Simulator(ABC):
@@ -17,3 +18,15 @@ class Simulator(ABC):
         :rtype: list[list[SimulationState]]
 
         """
+
+    @abstractmethod
+    def simulate_batch_with_reports(self, batch: Batch) -> list[SceneResult]:
+        """Simulate the provided batch, and report how each scene went.
+
+        :param batch: The batch to run.
+        :type batch: Batch
+        :returns: The states and report of each scene, in the order of
+            the batch.
+        :rtype: list[SceneResult]
+
+        """
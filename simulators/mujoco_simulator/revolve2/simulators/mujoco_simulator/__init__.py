@@ -1,5 +1,16 @@
 """Physics simulator using the MuJoCo."""
 
+from ._cpu_affinity import CpuAffinity
+from ._distributed_simulator import DistributedSimulator
 from ._local_simulator import LocalSimulator
+from ._standard_port import STANDARD_WORKER_PORT
+from ._worker_daemon import WorkerDaemon, run_worker_daemon
 
-__all__ = ["LocalSimulator"]
+__all__ = [
+    "STANDARD_WORKER_PORT",
+    "CpuAffinity",
+    "DistributedSimulator",
+    "LocalSimulator",
+    "WorkerDaemon",
+    "run_worker_daemon",
+]
@@ -0,0 +1,5 @@
+"""Executable scripts shipped with this library.
+
+These are not meant to be imported and are simply a module because of
+packaging reasons.
+"""
@@ -0,0 +1,77 @@
+"""Worker daemon that simulates scenes for DistributedSimulators."""
+
+import argparse
+import logging
+
+from .._standard_port import STANDARD_WORKER_PORT
+from .._worker_daemon import run_worker_daemon
+
+
+def main() -> None:
+    """Run the script."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--host", default="", help="Address to listen on. Default: all."
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=STANDARD_WORKER_PORT,
+        help=f"Port to listen on. Default: {STANDARD_WORKER_PORT}.",
+    )
+    parser.add_argument(
+        "--num-simulators",
+        type=int,
+        default=None,
+        help="Scenes simulated in parallel. Default: one per CPU.",
+    )
+    parser.add_argument(
+        "--model-cache-size",
+        type=int,
+        default=32,
+        help="Compiled models kept by each worker process.",
+    )
+    parser.add_argument(
+        "--spec-compiler",
+        action="store_true",
+        help="Build models through MjSpec. Requires MuJoCo 3.2 or newer.",
+    )
+    parser.add_argument(
+        "--settled-state-directory",
+        default=None,
+        help="Directory to keep the states of warmed-up scenes in.",
+    )
+    parser.add_argument(
+        "--compiled-model-directory",
+        default=None,
+        help="Directory to keep compiled models in.",
+    )
+    parser.add_argument(
+        "--compiled-model-max-bytes",
+        type=int,
+        default=None,
+        help="Maximum bytes of kept compiled models. Default: no limit.",
+    )
+    parser.add_argument(
+        "--debug", action="store_true", help="Print debug messages."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+    )
+    run_worker_daemon(
+        host=args.host,
+        port=args.port,
+        num_simulators=args.num_simulators,
+        model_cache_size=args.model_cache_size,
+        spec_compiler=args.spec_compiler,
+        settled_state_directory=args.settled_state_directory,
+        compiled_model_directory=args.compiled_model_directory,
+        compiled_model_max_bytes=args.compiled_model_max_bytes,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import math
+from collections.abc import Iterator, Mapping
+
+import mujoco
+import numpy as np
+from numpy.typing import NDArray
+
+from ._abstraction_to_mujoco_mapping import CameraSensorMujoco
+from ._open_gl_vision import OpenGLVision
+from ._render_backend import RenderBackend
+from ._scene_timer import SceneTimer, TimedPhase
+
+
+class CameraViews(Mapping[int, NDArray[np.uint8]]):
+    """The images of the camera sensors in a scene, rendered on demand.
+
+    A camera is only rendered when its image is requested, and at most
+    once per camera step. The first request after a camera step updates
+    the scene for all cameras at once; each camera then only renders it.
+    Until the next camera step, the same images are returned.
+    """
+
+    _model: mujoco.MjModel
+    _data: mujoco.MjData
+    _camera_step: float
+    _max_geometries: int
+    _visions: dict[int, OpenGLVision]
+    _scene: mujoco.MjvScene | None
+    _scene_updated: bool
+    _images: dict[int, NDArray[np.uint8]]
+    _last_update_time: float | None
+    _timer: SceneTimer
+
+    def __init__(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        cameras: list[CameraSensorMujoco],
+        camera_step: float,
+        render_backend: RenderBackend,
+        *,
+        headless: bool,
+        max_geometries: int = 10_000,
+        timer: SceneTimer | None = None,
+    ) -> None:
+        """Initialize this object.
+
+        :param model: The mujoco model.
+        :param data: The mujoco data that is simulated.
+        :param cameras: The camera sensors to render.
+        :param camera_step: The minimum time between two renders of the
+            same camera. In seconds.
+        :param render_backend: The type of library to use for OpenGL.
+        :param headless: Whether the simulation is run in headless mode.
+        :param max_geometries: The maximum amount of geometries allowed
+            in the scene.
+        :param timer: If not None, the rendering time is measured with
+            this timer.
+        """
+        self._model = model
+        self._data = data
+        self._camera_step = camera_step
+        self._max_geometries = max_geometries
+        self._visions = {
+            camera.camera_id: OpenGLVision(
+                model=model,
+                camera=camera,
+                headless=headless,
+                open_gl_lib=render_backend,
+                max_geometries=max_geometries,
+            )
+            for camera in cameras
+        }
+        self._scene = None
+        self._scene_updated = False
+        self._images = {}
+        self._last_update_time = None
+        self._timer = SceneTimer(enabled=False) if timer is None else timer
+
+    def update(self, time: float) -> None:
+        """Let the next requests render the current state, if it is time.
+
+        :param time: The current simulation time. In seconds.
+        :type time: float
+        """
+        if self._last_update_time is not None and (
+            time < self._last_update_time + self._camera_step
+        ):
+            return
+        self._last_update_time = (
+            math.floor(time / self._camera_step) * self._camera_step
+        )
+        self._scene_updated = False
+        self._images = {}
+
+    def __getitem__(self, camera_id: int) -> NDArray[np.uint8]:
+        """Get the image of a camera, rendering it if necessary.
+
+        :param camera_id: The id of the camera in the model.
+        :type camera_id: int
+        :returns: The image (RGB).
+        :rtype: NDArray[np.uint8]
+        """
+        image = self._images.get(camera_id)
+        if image is None:
+            with self._timer.measure(TimedPhase.CAMERA_RENDERING):
+                vision = self._visions[camera_id]
+                if self._scene is None:
+                    self._scene = mujoco.MjvScene(
+                        self._model, maxgeom=self._max_geometries
+                    )
+                if not self._scene_updated:
+                    vision.update_scene(self._model, self._data, self._scene)
+                    self._scene_updated = True
+                image = vision.render(self._model, self._data, self._scene)
+            self._images[camera_id] = image
+        return image
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the ids of the cameras.
+
+        :returns: The iterator.
+        :rtype: Iterator[int]
+        """
+        return iter(self._visions)
+
+    def __len__(self) -> int:
+        """Get the number of cameras.
+
+        :returns: The number of cameras.
+        :rtype: int
+        """
+        return len(self._visions)
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+
+from revolve2.simulation.scene.termination import TerminationCondition
+from revolve2.simulation.simulator import RecordSettings, RecordingSpec
+
+from .viewers import ViewerType
+
+
+@dataclass(kw_only=True, frozen=True)
+class ChunkParameters:
+    """How to simulate a chunk of scenes, shared by all its scenes.
+
+    Chunks are sent to worker processes and worker daemons, so this is
+    kept picklable.
+    """
+
+    control_step: float
+    """The time between each call to the handle function of the scene
+    handler. In seconds."""
+
+    camera_step: float
+    """The minimum time between two renders of a camera sensor. In seconds."""
+
+    sample_step: float | None
+    """The time between each state sample of the simulation. In seconds."""
+
+    simulation_time: int | None
+    """How long to simulate for. In seconds."""
+
+    simulation_timestep: float
+    """The duration to integrate over during each step of the simulation.
+    In seconds."""
+
+    integrator: str
+    """The integrator to use."""
+
+    recording_spec: RecordingSpec
+    """Which parts of the state to sample."""
+
+    termination_conditions: list[TerminationCondition]
+    """Conditions under which to stop early, in addition to those of the
+    scene."""
+
+    collect_timings: bool
+    """Whether to measure where the wall-clock time goes."""
+
+    collect_physics_diagnostics: bool
+    """Whether to observe the energy and penetrations."""
+
+    warm_up_time: float | None
+    """If not None, how long to simulate each scene without control first.
+    In seconds."""
+
+    cast_shadows: bool
+    """Whether shadows are cast."""
+
+    fast_sim: bool
+    """If fancy rendering is disabled."""
+
+    record_settings: RecordSettings | None = None
+    """If not None, recording will be done according to these settings."""
+
+    headless: bool = True
+    """If False, a viewer will be opened."""
+
+    viewer_type: ViewerType = ViewerType.CUSTOM
+    """The viewer-implementation to use when not headless."""
+
+    start_paused: bool = False
+    """If the viewer starts in a paused state."""
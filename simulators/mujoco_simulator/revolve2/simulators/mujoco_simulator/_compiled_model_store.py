@@ -0,0 +1,305 @@
+import contextlib
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import mujoco
+from revolve2.simulation.scene import UUIDKey
+
+from ._abstraction_to_mujoco_mapping import (
+    AbstractionToMujocoMapping,
+    CameraSensorMujoco,
+    IMUSensorMujoco,
+    JointHingeMujoco,
+    MultiBodySystemMujoco,
+)
+from ._scene_structure import SceneStructure
+
+
+class CompiledModelStore:
+    """Keeps compiled models on disk, so later runs skip compiling them.
+
+    Each model is saved as a binary `.mjb` file, next to a `.json` file
+    with its mapping. The mapping is stored by the position of each object
+    in the structure of the scene, so it can be restored for any
+    structurally identical scene. Models are keyed by that structure and
+    the compilation options, and only reused with the MuJoCo version that
+    compiled them.
+
+    Worker processes and machines sharing the directory can fill it
+    concurrently. When the files grow beyond the maximum size, the least
+    recently used models are removed.
+    """
+
+    _directory: Path
+    _max_bytes: int | None
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int | None = None
+    ) -> None:
+        """Initialize this object.
+
+        :param directory: The directory to keep the models in. It is
+            created if it does not exist.
+        :param max_bytes: The maximum total size of the stored files. If
+            None, models are never removed.
+        :raises ValueError: If the maximum size is negative.
+        """
+        if max_bytes is not None and max_bytes < 0:
+            msg = "Compiled model store size cannot be negative."
+            raise ValueError(msg)
+
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+
+    @property
+    def directory(self) -> Path:
+        """Get the directory the models are kept in.
+
+        :returns: The directory.
+        :rtype: Path
+        """
+        return self._directory
+
+    @staticmethod
+    def key(
+        structure_key: str,
+        simulation_timestep: float,
+        integrator: str,
+        *,
+        cast_shadows: bool,
+        fast_sim: bool,
+        compiler: str,
+    ) -> str:
+        """Get the key of a compiled model.
+
+        :param structure_key: The key of the structure of the scene.
+        :type structure_key: str
+        :param simulation_timestep: The duration of a physics step. In
+            seconds.
+        :type simulation_timestep: float
+        :param integrator: The integrator used.
+        :type integrator: str
+        :param cast_shadows: Whether shadows are cast by the light.
+        :type cast_shadows: bool
+        :param fast_sim: If fancy rendering is disabled.
+        :type fast_sim: bool
+        :param compiler: The name of the function that compiled the
+            model.
+        :type compiler: str
+        :returns: The key.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        for part in (
+            mujoco.__version__,
+            structure_key,
+            repr(float(simulation_timestep)),
+            integrator,
+            repr(cast_shadows),
+            repr(fast_sim),
+            compiler,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(
+        self, key: str, structure: SceneStructure
+    ) -> tuple[mujoco.MjModel, AbstractionToMujocoMapping] | None:
+        """Load a compiled model.
+
+        :param key: The key of the model, see `key`.
+        :type key: str
+        :param structure: The structure of the scene to map the model to.
+        :type structure: SceneStructure
+        :returns: The model and the mapping from the scene to it, or None
+            if the model is not stored.
+        :rtype: tuple[mujoco.MjModel, AbstractionToMujocoMapping] | None
+        """
+        model_path, mapping_path = self._paths(key)
+        try:
+            mapping = _mapping_from_json(
+                json.loads(mapping_path.read_text()), structure
+            )
+            model = mujoco.MjModel.from_binary_path(str(model_path))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logging.warning(
+                f"Ignoring unreadable compiled model {key}: {error}"
+            )
+            return None
+
+        # Mark as recently used, for eviction.
+        for path in (model_path, mapping_path):
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+        return model, mapping
+
+    def put(
+        self,
+        key: str,
+        model: mujoco.MjModel,
+        mapping: AbstractionToMujocoMapping,
+        structure: SceneStructure,
+    ) -> None:
+        """Store a compiled model.
+
+        :param key: The key of the model, see `key`.
+        :type key: str
+        :param model: The model.
+        :type model: mujoco.MjModel
+        :param mapping: The mapping from the scene to the model.
+        :type mapping: AbstractionToMujocoMapping
+        :param structure: The structure of the scene the model was
+            compiled from.
+        :type structure: SceneStructure
+        """
+        model_path, mapping_path = self._paths(key)
+        # Write to temporary files first, so readers never see a partial
+        # model. The mapping is written last, as it marks a complete entry.
+        temporary_paths = []
+        try:
+            descriptor, temporary = tempfile.mkstemp(
+                dir=self._directory, suffix=".tmp"
+            )
+            os.close(descriptor)
+            temporary_paths.append(temporary)
+            mujoco.mj_saveModel(model, temporary, None)
+            os.replace(temporary, model_path)
+
+            descriptor, temporary = tempfile.mkstemp(
+                dir=self._directory, suffix=".tmp"
+            )
+            temporary_paths.append(temporary)
+            with os.fdopen(descriptor, "w") as file:
+                json.dump(_mapping_to_json(mapping, structure), file)
+            os.replace(temporary, mapping_path)
+        except OSError as error:
+            logging.warning(f"Cannot store compiled model {key}: {error}")
+            for temporary in temporary_paths:
+                Path(temporary).unlink(missing_ok=True)
+            return
+
+        if self._max_bytes is not None:
+            self._evict(self._max_bytes)
+
+    def _evict(self, max_bytes: int) -> None:
+        """Remove the least recently used models until they fit.
+
+        :param max_bytes: The maximum total size of the stored files.
+        """
+        entries = []
+        total = 0
+        for path in self._directory.glob("*.mjb"):
+            # Files may be removed by other processes in the meantime.
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            size = stat.st_size
+            with contextlib.suppress(FileNotFoundError):
+                size += path.with_suffix(".json").stat().st_size
+            entries.append((stat.st_mtime, size, path))
+            total += size
+
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.with_suffix(".json").unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        """Get the files of a model.
+
+        :param key: The key of the model.
+        :returns: The paths of the model and of its mapping.
+        """
+        return (
+            self._directory / f"{key}.mjb",
+            self._directory / f"{key}.json",
+        )
+
+
+def _mapping_to_json(
+    mapping: AbstractionToMujocoMapping, structure: SceneStructure
+) -> dict[str, list[dict[str, object]]]:
+    """Serialize a mapping by the position of each object in a structure.
+
+    :param mapping: The mapping.
+    :param structure: The structure of the scene the mapping is for.
+    :returns: The serialized mapping.
+    """
+    return {
+        "multi_body_systems": [
+            dataclasses.asdict(mapping.multi_body_system[UUIDKey(mbs)])
+            for mbs in structure.multi_body_systems
+        ],
+        "hinge_joints": [
+            dataclasses.asdict(mapping.hinge_joint[UUIDKey(joint)])
+            for joint in structure.hinge_joints
+        ],
+        "imu_sensors": [
+            dataclasses.asdict(mapping.imu_sensor[UUIDKey(imu)])
+            for imu in structure.imu_sensors
+        ],
+        "camera_sensors": [
+            dataclasses.asdict(mapping.camera_sensor[UUIDKey(camera)])
+            for camera in structure.camera_sensors
+        ],
+    }
+
+
+def _mapping_from_json(
+    serialized: dict[str, list[dict[str, Any]]], structure: SceneStructure
+) -> AbstractionToMujocoMapping:
+    """Restore a serialized mapping for a structurally identical scene.
+
+    Each field is converted explicitly, as the file is only JSON.
+
+    :param serialized: The serialized mapping.
+    :param structure: The structure of the scene to map.
+    :returns: The mapping.
+    """
+    mapping = AbstractionToMujocoMapping()
+    for mbs, fields in zip(
+        structure.multi_body_systems,
+        serialized["multi_body_systems"],
+        strict=True,
+    ):
+        mapping.multi_body_system[UUIDKey(mbs)] = MultiBodySystemMujoco(
+            id=int(fields["id"])
+        )
+    for joint, fields in zip(
+        structure.hinge_joints, serialized["hinge_joints"], strict=True
+    ):
+        mapping.hinge_joint[UUIDKey(joint)] = JointHingeMujoco(
+            id=int(fields["id"]),
+            ctrl_index_position=int(fields["ctrl_index_position"]),
+            ctrl_index_velocity=int(fields["ctrl_index_velocity"]),
+        )
+    for imu, fields in zip(
+        structure.imu_sensors, serialized["imu_sensors"], strict=True
+    ):
+        mapping.imu_sensor[UUIDKey(imu)] = IMUSensorMujoco(
+            gyro_id=int(fields["gyro_id"]),
+            accelerometer_id=int(fields["accelerometer_id"]),
+        )
+    for camera, fields in zip(
+        structure.camera_sensors, serialized["camera_sensors"], strict=True
+    ):
+        # JSON turns the size tuple into a list.
+        width, height = fields["camera_size"]
+        mapping.camera_sensor[UUIDKey(camera)] = CameraSensorMujoco(
+            camera_id=int(fields["camera_id"]),
+            camera_size=(int(width), int(height)),
+        )
+    return mapping
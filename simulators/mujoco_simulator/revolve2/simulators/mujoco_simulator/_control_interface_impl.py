@@ -1,10 +1,13 @@
+from collections.abc import Sequence
+
 import mujoco
-import numpy as np
-from revolve2.simulation.scene import ControlInterface, JointHinge, UUIDKey
+import numpy.typing as npt
+from revolve2.simulation.scene import ControlInterface, JointHinge
 
 from ._abstraction_to_mujoco_mapping import (
     AbstractionToMujocoMapping,
 )
+from ._control_plan import ControlPlan
 
 
 class ControlInterfaceImpl(ControlInterface):
@@ -12,6 +15,7 @@ class ControlInterfaceImpl(ControlInterface):
 
     _data: mujoco.MjData
     _abstraction_to_mujoco_mapping: AbstractionToMujocoMapping
+    _control_plan: ControlPlan
 
     def __init__(
         self,
@@ -26,6 +30,7 @@ class ControlInterfaceImpl(ControlInterface):
         """
         self._data = data
         self._abstraction_to_mujoco_mapping = abstraction_to_mujoco_mapping
+        self._control_plan = ControlPlan(abstraction_to_mujoco_mapping)
 
     def set_joint_hinge_position_target(
         self,
@@ -42,25 +47,40 @@ class ControlInterfaceImpl(ControlInterface):
         :type position_delta: float
         :rtype: None
         """
-        maybe_hinge_joint_mujoco = (
-            self._abstraction_to_mujoco_mapping.hinge_joint.get(
-                UUIDKey(joint_hinge)
-            )
-        )
-        assert (
-            maybe_hinge_joint_mujoco is not None
-        ), "Hinge joint does not exist in this scene."
-
-        # Set position target
-        idx_pos = maybe_hinge_joint_mujoco.ctrl_index_position
+        slot = self._control_plan.slot(joint_hinge)
+        idx_pos = self._control_plan.position_indices[slot]
+        joint_range = self._control_plan.ranges[slot]
 
         # Update the position target
-        self._data.ctrl[idx_pos] = np.clip(
-            (self._data.ctrl[idx_pos] + update if as_delta else update),
-            -joint_hinge.range,
-            joint_hinge.range,
-        )
+        target = self._data.ctrl[idx_pos] + update if as_delta else update
+        self._data.ctrl[idx_pos] = min(max(target, -joint_range), joint_range)
 
         # Set velocity target
-        idx_vel = maybe_hinge_joint_mujoco.ctrl_index_velocity
-        self._data.ctrl[idx_vel] = 0.0
+        self._data.ctrl[self._control_plan.velocity_indices[slot]] = 0.0
+
+    def set_joint_hinge_position_targets(
+        self,
+        joint_hinges: Sequence[JointHinge],
+        updates: npt.ArrayLike,
+        *,
+        as_delta: bool = True,
+    ) -> None:
+        """Set the position targets of a number of hinge joints at once.
+
+        :param joint_hinges: The hinges to set the position targets for,
+            without duplicates. Passing the same sequence every time,
+            such as all joints of a robot, is fastest.
+        :type joint_hinges: Sequence[JointHinge]
+        :param updates: The update for each hinge.
+        :type updates: npt.ArrayLike
+        :param as_delta: Whether the updates are added to the current
+            targets, instead of replacing them.
+        :type as_delta: bool
+        :rtype: None
+        """
+        self._control_plan.set_position_targets(
+            self._data,
+            self._control_plan.slots(joint_hinges),
+            updates,
+            as_delta=as_delta,
+        )
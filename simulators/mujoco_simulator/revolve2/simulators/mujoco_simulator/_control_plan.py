@@ -0,0 +1,113 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+from revolve2.simulation.scene import JointHinge
+
+from ._abstraction_to_mujoco_mapping import AbstractionToMujocoMapping
+
+
+class ControlPlan:
+    """Where the control targets of the hinge joints of a scene are stored.
+
+    Each hinge joint gets a slot, which indexes arrays of the `ctrl`
+    indices of its actuators and of its range. The slots of a sequence of
+    joints, such as all joints of a robot, are resolved once and then
+    reused, so the targets of all those joints are written with a single
+    clip and assignment.
+    """
+
+    position_indices: npt.NDArray[np.intp]
+    """The `ctrl` index of the position actuator of each slot."""
+
+    velocity_indices: npt.NDArray[np.intp]
+    """The `ctrl` index of the velocity actuator of each slot."""
+
+    ranges: npt.NDArray[np.float64]
+    """The range of the joint of each slot. In radians."""
+
+    _slots: dict[UUID, int]
+    _sequences: dict[tuple[UUID, ...], npt.NDArray[np.intp]]
+
+    def __init__(self, mapping: AbstractionToMujocoMapping) -> None:
+        """Initialize this object.
+
+        :param mapping: The mapping of the scene.
+        """
+        self._slots = {}
+        self._sequences = {}
+        position_indices: list[int] = []
+        velocity_indices: list[int] = []
+        ranges: list[float] = []
+        for key, joint_mujoco in mapping.hinge_joint.items():
+            self._slots[key.value.uuid] = len(ranges)
+            position_indices.append(joint_mujoco.ctrl_index_position)
+            velocity_indices.append(joint_mujoco.ctrl_index_velocity)
+            ranges.append(key.value.range)
+        self.position_indices = np.array(position_indices, dtype=np.intp)
+        self.velocity_indices = np.array(velocity_indices, dtype=np.intp)
+        self.ranges = np.array(ranges, dtype=np.float64)
+
+    def slot(self, joint_hinge: JointHinge) -> int:
+        """Get the slot of a hinge joint.
+
+        :param joint_hinge: The hinge joint.
+        :type joint_hinge: JointHinge
+        :returns: The slot.
+        :rtype: int
+        """
+        slot = self._slots.get(joint_hinge.uuid)
+        assert slot is not None, "Hinge joint does not exist in this scene."
+        return slot
+
+    def slots(
+        self, joint_hinges: Sequence[JointHinge]
+    ) -> npt.NDArray[np.intp]:
+        """Get the slots of a sequence of hinge joints.
+
+        :param joint_hinges: The hinge joints.
+        :type joint_hinges: Sequence[JointHinge]
+        :returns: The slot of each joint, in the same order.
+        :rtype: npt.NDArray[np.intp]
+        """
+        key = tuple(joint_hinge.uuid for joint_hinge in joint_hinges)
+        slots = self._sequences.get(key)
+        if slots is None:
+            slots = np.array(
+                [self.slot(joint_hinge) for joint_hinge in joint_hinges],
+                dtype=np.intp,
+            )
+            self._sequences[key] = slots
+        return slots
+
+    def set_position_targets(
+        self,
+        data: mujoco.MjData,
+        slots: npt.NDArray[np.intp],
+        updates: npt.ArrayLike,
+        *,
+        as_delta: bool,
+    ) -> None:
+        """Set the position targets of the joints in a number of slots.
+
+        The velocity targets of these joints are set to zero.
+
+        :param data: The MuJoCo data to alter.
+        :type data: mujoco.MjData
+        :param slots: The slots, without duplicates.
+        :type slots: npt.NDArray[np.intp]
+        :param updates: The update of each slot.
+        :type updates: npt.ArrayLike
+        :param as_delta: Whether the updates are added to the current
+            targets, instead of replacing them.
+        :type as_delta: bool
+        """
+        position_indices = self.position_indices[slots]
+        ranges = self.ranges[slots]
+        targets = np.asarray(updates, dtype=np.float64)
+        if as_delta:
+            targets = data.ctrl[position_indices] + targets
+        data.ctrl[position_indices] = np.clip(targets, -ranges, ranges)
+        data.ctrl[self.velocity_indices[slots]] = 0.0
@@ -0,0 +1,113 @@
+import os
+from enum import Enum, auto
+from pathlib import Path
+
+import threadpoolctl
+
+_NUMA_NODES = Path("/sys/devices/system/node")
+
+# Environment variables that size the thread pools of the numerical
+# libraries NumPy may be linked against.
+_THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+class CpuAffinity(Enum):
+    """How simulator worker processes are placed on the CPUs."""
+
+    NONE = auto()
+    """Leave the placement to the operating system."""
+    CORE = auto()
+    """Pin each worker to a single CPU, round robin."""
+    NUMA_NODE = auto()
+    """Pin each worker to the CPUs of a single NUMA node, round robin."""
+
+
+def affinity_supported() -> bool:
+    """Check if processes can be pinned to CPUs on this platform.
+
+    :returns: Whether pinning is supported.
+    :rtype: bool
+    """
+    return hasattr(os, "sched_setaffinity")
+
+
+def worker_cpu_sets(
+    affinity: CpuAffinity, num_workers: int
+) -> list[set[int]] | None:
+    """Get the CPUs each worker process should be pinned to.
+
+    Only CPUs this process is allowed to run on are used.
+
+    :param affinity: How to place the workers.
+    :type affinity: CpuAffinity
+    :param num_workers: The number of workers.
+    :type num_workers: int
+    :returns: A set of CPUs for each worker, or None if the workers are
+        not pinned.
+    :rtype: list[set[int]] | None
+    :raises ValueError: If pinning is not supported on this platform.
+    """
+    if affinity is CpuAffinity.NONE:
+        return None
+    if not affinity_supported():
+        msg = "Pinning workers to CPUs is not supported on this platform."
+        raise ValueError(msg)
+
+    available = os.sched_getaffinity(0)
+    if affinity is CpuAffinity.CORE:
+        groups = [{cpu} for cpu in sorted(available)]
+    else:
+        groups = [
+            node & available for node in _numa_nodes() if node & available
+        ] or [available]
+    return [groups[index % len(groups)] for index in range(num_workers)]
+
+
+def limit_library_threads() -> None:
+    """Limit the numerical libraries in this process to a single thread.
+
+    Libraries that are already loaded, such as the BLAS behind NumPy,
+    are limited directly. Libraries loaded later read the environment.
+    """
+    os.environ.update(dict.fromkeys(_THREAD_VARIABLES, "1"))
+    threadpoolctl.threadpool_limits(limits=1)
+
+
+def _numa_nodes() -> list[set[int]]:
+    """Get the CPUs of each NUMA node, as reported by Linux.
+
+    :returns: The CPUs of each node. Empty if unknown.
+    :rtype: list[set[int]]
+    """
+    nodes = sorted(
+        _NUMA_NODES.glob("node[0-9]*"), key=lambda path: int(path.name[4:])
+    )
+    return [
+        _parse_cpu_list((node / "cpulist").read_text())
+        for node in nodes
+        if (node / "cpulist").exists()
+    ]
+
+
+def _parse_cpu_list(cpu_list: str) -> set[int]:
+    """Parse a Linux CPU list, such as `0-3,8-11`.
+
+    :param cpu_list: The list.
+    :type cpu_list: str
+    :returns: The CPUs in the list.
+    :rtype: set[int]
+    """
+    cpus: set[int] = set()
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
@@ -0,0 +1,114 @@
+"""Messages between the DistributedSimulator and its worker daemons.
+
+Each message is a pickled object preceded by its length. Pickle runs
+arbitrary code when loading, so only connect simulators and workers on
+a network you trust.
+"""
+
+import pickle
+import socket
+import struct
+from dataclasses import dataclass
+from typing import Any
+
+from revolve2.simulation.scene import Scene
+
+from ._chunk_parameters import ChunkParameters
+from ._trajectory import Trajectory
+
+PROTOCOL_VERSION = 3
+
+_HEADER = struct.Struct("!Q")
+
+# Raised when a connection is lost, or a message cannot be read from it.
+CONNECTION_ERRORS = (OSError, EOFError, pickle.UnpicklingError)
+
+
+@dataclass(kw_only=True)
+class Hello:
+    """Sent by a worker when a simulator connects."""
+
+    version: int
+    """The protocol version of the worker."""
+
+    capacity: int
+    """How many scenes the worker accepts before returning a result."""
+
+
+@dataclass(kw_only=True)
+class Task:
+    """A single scene to simulate, sent by the simulator."""
+
+    task_id: int
+    scene: Scene
+    parameters: ChunkParameters
+    """How to simulate the scene, shared by all scenes of the batch."""
+
+
+@dataclass(kw_only=True)
+class Result:
+    """The outcome of a task, sent by the worker as soon as it is done."""
+
+    task_id: int
+    trajectory: Trajectory | None
+    """The result, detached from the scene objects of the worker."""
+
+    error: str | None
+    """The traceback of the simulation, if it raised."""
+
+
+def send_message(connection: socket.socket, message: object) -> None:
+    """Send a message.
+
+    :param connection: The connection to send over.
+    :param message: The message.
+    """
+    send_encoded(connection, encode_message(message))
+
+
+def encode_message(message: object) -> bytes:
+    """Pickle a message, so it can be sent more than once.
+
+    :param message: The message.
+    :returns: The encoded message, for `send_encoded`.
+    """
+    return pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def send_encoded(connection: socket.socket, encoded: bytes) -> None:
+    """Send a message encoded by `encode_message`.
+
+    :param connection: The connection to send over.
+    :param encoded: The encoded message.
+    """
+    connection.sendall(_HEADER.pack(len(encoded)) + encoded)
+
+
+def receive_message(connection: socket.socket) -> Any:
+    """Receive a message, waiting until it has arrived completely.
+
+    :param connection: The connection to receive from.
+    :returns: The message.
+    """
+    (size,) = _HEADER.unpack(_receive_exactly(connection, _HEADER.size))
+    return pickle.loads(_receive_exactly(connection, size))
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytearray:
+    """Receive a number of bytes.
+
+    :param connection: The connection to receive from.
+    :param size: The number of bytes.
+    :returns: The bytes.
+    :raises ConnectionError: If the connection closes first.
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = connection.recv_into(view[received:])
+        if count == 0:
+            msg = "Connection closed by the other side."
+            raise ConnectionError(msg)
+        received += count
+    return buffer
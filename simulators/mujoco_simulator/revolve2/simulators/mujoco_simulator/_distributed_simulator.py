@@ -0,0 +1,417 @@
+import contextlib
+import logging
+import queue
+import socket
+import threading
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Self
+
+from revolve2.simulation.scene import SimulationState
+from revolve2.simulation.simulator import Batch, SceneResult, Simulator
+
+from ._chunk_parameters import ChunkParameters
+from ._distributed_protocol import (
+    CONNECTION_ERRORS,
+    PROTOCOL_VERSION,
+    Hello,
+    Result,
+    Task,
+    encode_message,
+    receive_message,
+    send_encoded,
+)
+from ._scene_structure import SceneStructure
+from ._standard_port import STANDARD_WORKER_PORT
+from ._trajectory import Trajectory
+
+# How often an idle connection checks for scenes of lost workers.
+_POLL_INTERVAL = 0.05
+
+
+@dataclass(eq=False)
+class _WorkerConnection:
+    """An open connection to a worker daemon."""
+
+    address: tuple[str, int]
+    connection: socket.socket
+    capacity: int
+
+
+@dataclass(eq=False)
+class _PendingScene:
+    """A scene of the batch that has not been simulated yet."""
+
+    index: int
+    task_id: int
+    message: bytes
+    """The encoded task, so a retry does not pickle the scene again."""
+
+    attempts: int = 0
+
+
+# A simulated scene with its result.
+_Finished = tuple[_PendingScene, Result]
+
+
+@dataclass(eq=False)
+class _WorkerLost:
+    """Reported by a connection that failed."""
+
+    address: tuple[str, int]
+    error: Exception
+    unfinished: list[_PendingScene]
+
+
+@dataclass(eq=False)
+class _BatchRun:
+    """State shared between the connections while a batch runs."""
+
+    scenes: "queue.SimpleQueue[_PendingScene]" = field(
+        default_factory=queue.SimpleQueue
+    )
+    results: "queue.SimpleQueue[_Finished | _WorkerLost]" = field(
+        default_factory=queue.SimpleQueue
+    )
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class DistributedSimulator(Simulator):
+    """Simulator that spreads scenes over worker daemons on other machines.
+
+    Start a worker daemon on each machine, using the
+    `revolve2-simulation-worker` script or `run_worker_daemon`. Scenes
+    are handed out one at a time, so faster workers simply take more of
+    them, and each result is sent back as soon as its scene is done. When
+    the connection to a worker is lost, its unfinished scenes are
+    simulated by the other workers.
+
+    Workers that cannot be reached are skipped, and tried again on the
+    next batch. Scenes and results are pickled, so only use workers on a
+    network you trust.
+    """
+
+    _workers: list[tuple[str, int]]
+    _cast_shadows: bool
+    _fast_sim: bool
+    _max_retries: int
+    _connect_timeout: float
+    _result_timeout: float | None
+    _connections: dict[tuple[str, int], _WorkerConnection]
+    _next_task_id: int
+
+    def __init__(
+        self,
+        workers: Sequence[str | tuple[str, int]],
+        *,
+        cast_shadows: bool = False,
+        fast_sim: bool = False,
+        max_retries: int = 2,
+        connect_timeout: float = 10.0,
+        result_timeout: float | None = None,
+    ) -> None:
+        """Initialize this object.
+
+        :param workers: The worker daemons, as host and port. A host
+            without port uses the standard worker port.
+        :param cast_shadows: Whether shadows are cast in the simulation.
+        :param fast_sim: Whether more complex rendering prohibited.
+        :param max_retries: How many times a scene is sent to another
+            worker after the worker simulating it was lost.
+        :param connect_timeout: How long to wait for a worker to accept
+            the connection. In seconds.
+        :param result_timeout: How long a worker may go without returning
+            a result while it has scenes, before it is considered lost.
+            Must be longer than the worker takes for its scenes. If None,
+            only closed connections count as lost. In seconds.
+        :raises ValueError: If no workers are given.
+        """
+        if len(workers) == 0:
+            msg = "The distributed simulator needs at least one worker."
+            raise ValueError(msg)
+
+        self._workers = [
+            (worker, STANDARD_WORKER_PORT)
+            if isinstance(worker, str)
+            else worker
+            for worker in workers
+        ]
+        self._cast_shadows = cast_shadows
+        self._fast_sim = fast_sim
+        self._max_retries = max_retries
+        self._connect_timeout = connect_timeout
+        self._result_timeout = result_timeout
+        self._connections = {}
+        self._next_task_id = 0
+
+    def __enter__(self) -> Self:
+        """Enter the context of this simulator.
+
+        :returns: This simulator.
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the simulator when leaving its context.
+
+        :param exc_type: The type of the raised exception, if any.
+        :param exc_value: The raised exception, if any.
+        :param traceback: The traceback of the raised exception, if any.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Disconnect from the workers.
+
+        The simulator can still be used afterwards; it then connects
+        again.
+        """
+        for worker in self._connections.values():
+            # Shutting down also wakes a thread waiting for a result.
+            with contextlib.suppress(OSError):
+                worker.connection.shutdown(socket.SHUT_RDWR)
+            worker.connection.close()
+        self._connections = {}
+
+    def simulate_batch(self, batch: Batch) -> list[list[SimulationState]]:
+        """Simulate the provided batch by simulating each contained scene.
+
+        :param batch: The batch to run.
+        :type batch: Batch
+        :returns: List of simulation states in ascending order of time.
+        :rtype: list[list[SimulationState]]
+        """
+        return [
+            result.states for result in self.simulate_batch_with_reports(batch)
+        ]
+
+    def simulate_batch_with_reports(self, batch: Batch) -> list[SceneResult]:
+        """Simulate the provided batch, and report how each scene went.
+
+        :param batch: The batch to run.
+        :type batch: Batch
+        :returns: The states and report of each scene, in the order of
+            the batch.
+        :rtype: list[SceneResult]
+        """
+        finished = dict(self.simulate_batch_streaming(batch))
+        return [finished[index] for index in range(len(batch.scenes))]
+
+    def simulate_batch_streaming(
+        self, batch: Batch
+    ) -> Iterator[tuple[int, SceneResult]]:
+        """Simulate the provided batch, yielding each scene once it is done.
+
+        :param batch: The batch to run.
+        :type batch: Batch
+        :returns: The index of each scene in the batch with its states and
+            report, in the order the scenes finish.
+        :rtype: Iterator[tuple[int, SceneResult]]
+        """
+        for index, trajectory in self._run(batch):
+            yield (
+                index,
+                SceneResult(
+                    states=trajectory.states(), report=trajectory.report()
+                ),
+            )
+
+    def _run(self, batch: Batch) -> Iterator[tuple[int, Trajectory]]:
+        """Simulate a batch on the workers.
+
+        :param batch: The batch to run.
+        :returns: The index of each scene with its result, in the order
+            the scenes finish.
+        :raises ValueError: If the batch is recorded.
+        :raises RuntimeError: If a scene fails, or was lost more often
+            than allowed.
+        :raises ConnectionError: If all workers are lost.
+        """
+        if batch.record_settings is not None:
+            msg = "Cannot record with the distributed simulator."
+            raise ValueError(msg)
+
+        logging.info("Starting distributed simulation batch with MuJoCo.")
+
+        control_step = 1.0 / batch.parameters.control_frequency
+        parameters = ChunkParameters(
+            control_step=control_step,
+            camera_step=(
+                control_step
+                if batch.parameters.camera_frequency is None
+                else 1.0 / batch.parameters.camera_frequency
+            ),
+            sample_step=(
+                None
+                if batch.parameters.sampling_frequency is None
+                else 1.0 / batch.parameters.sampling_frequency
+            ),
+            simulation_time=batch.parameters.simulation_time,
+            simulation_timestep=batch.parameters.simulation_timestep,
+            integrator=batch.parameters.integrator,
+            recording_spec=batch.parameters.recording_spec,
+            termination_conditions=batch.parameters.termination_conditions,
+            collect_timings=batch.parameters.collect_timings,
+            collect_physics_diagnostics=(
+                batch.parameters.collect_physics_diagnostics
+            ),
+            warm_up_time=batch.parameters.warm_up_time,
+            cast_shadows=self._cast_shadows,
+            fast_sim=self._fast_sim,
+        )
+
+        self._connect()
+        run = _BatchRun()
+        for index, scene in enumerate(batch.scenes):
+            task = Task(
+                task_id=self._next_task_id, scene=scene, parameters=parameters
+            )
+            run.scenes.put(
+                _PendingScene(
+                    index=index,
+                    task_id=task.task_id,
+                    message=encode_message(task),
+                )
+            )
+            self._next_task_id += 1
+
+        threads = [
+            threading.Thread(target=_serve, args=(worker, run), daemon=True)
+            for worker in self._connections.values()
+        ]
+        for thread in threads:
+            thread.start()
+
+        alive = len(threads)
+        remaining = len(batch.scenes)
+        try:
+            while remaining > 0:
+                item = run.results.get()
+                if isinstance(item, _WorkerLost):
+                    logging.warning(
+                        f"Lost worker {item.address} ({item.error}), moving"
+                        f" {len(item.unfinished)} scenes to other workers."
+                    )
+                    alive -= 1
+                    del self._connections[item.address]
+                    for pending in item.unfinished:
+                        pending.attempts += 1
+                        if pending.attempts > self._max_retries:
+                            msg = (
+                                f"Scene {pending.index} was lost on"
+                                f" {pending.attempts} workers."
+                            )
+                            raise RuntimeError(msg)
+                        run.scenes.put(pending)
+                    if alive == 0:
+                        msg = "Lost all simulation workers."
+                        raise ConnectionError(msg)
+                    continue
+
+                pending, result = item
+                if result.error is not None:
+                    msg = (
+                        f"Simulating scene {pending.index} failed on a"
+                        f" worker:\n{result.error}"
+                    )
+                    raise RuntimeError(msg)
+                assert result.trajectory is not None
+                result.trajectory.attach(
+                    SceneStructure.from_scene(batch.scenes[pending.index])
+                )
+                remaining -= 1
+                yield pending.index, result.trajectory
+        finally:
+            run.done.set()
+            if remaining > 0:
+                # The workers still have scenes of this batch. Disconnect,
+                # so they stop and the connections do not wait for them.
+                self.close()
+            for thread in threads:
+                thread.join()
+
+        logging.info("Finished batch.")
+
+    def _connect(self) -> None:
+        """Connect to the workers that are not connected yet.
+
+        :raises ConnectionError: If no worker can be reached.
+        """
+        for address in self._workers:
+            if address in self._connections:
+                continue
+            try:
+                connection = socket.create_connection(
+                    address, timeout=self._connect_timeout
+                )
+            except OSError as error:
+                logging.warning(f"Cannot reach worker {address}: {error}")
+                continue
+            try:
+                connection.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+                connection.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1
+                )
+                hello: Hello = receive_message(connection)
+                if hello.version != PROTOCOL_VERSION:
+                    msg = (
+                        f"protocol version {hello.version} instead of"
+                        f" {PROTOCOL_VERSION}"
+                    )
+                    raise ConnectionError(msg)
+                connection.settimeout(self._result_timeout)
+            except OSError as error:
+                logging.warning(f"Cannot use worker {address}: {error}")
+                connection.close()
+                continue
+            self._connections[address] = _WorkerConnection(
+                address=address, connection=connection, capacity=hello.capacity
+            )
+
+        if len(self._connections) == 0:
+            msg = "None of the simulation workers can be reached."
+            raise ConnectionError(msg)
+
+
+def _serve(worker: _WorkerConnection, run: _BatchRun) -> None:
+    """Keep a worker supplied with scenes until the batch is done.
+
+    :param worker: The worker to supply.
+    :param run: The batch.
+    """
+    in_flight: dict[int, _PendingScene] = {}
+    try:
+        while True:
+            while len(in_flight) < worker.capacity:
+                try:
+                    pending = run.scenes.get_nowait()
+                except queue.Empty:
+                    break
+                in_flight[pending.task_id] = pending
+                send_encoded(worker.connection, pending.message)
+
+            if len(in_flight) == 0:
+                if run.done.wait(_POLL_INTERVAL):
+                    return
+                continue
+
+            result: Result = receive_message(worker.connection)
+            run.results.put((in_flight.pop(result.task_id), result))
+    except CONNECTION_ERRORS as error:
+        worker.connection.close()
+        run.results.put(
+            _WorkerLost(
+                address=worker.address,
+                error=error,
+                unfinished=list(in_flight.values()),
+            )
+        )
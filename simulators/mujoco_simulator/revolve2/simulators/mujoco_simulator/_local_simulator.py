@@ -5,27 +5,52 @@ from ._simulate_scene_minimal import simulate_scene_minimal
 logging.debug(
     "'simulate_scene_minimal' must be first import to not break the renderers"
 )
-from ._simulate_scene import simulate_scene
+# Only imported to load the renderers in this order; the workers use it.
+from ._simulate_scene import simulate_scene  # noqa: F401
 
 logging.debug(
     "'simulate_scene' must be the second import to not break the renderers"
 )
+# Pyflakes does not read noqa comments.
+del simulate_scene
 
 import concurrent.futures
 import logging
+import math
+import multiprocessing
+import weakref
 from pathlib import Path
+from types import TracebackType
+from typing import Self
 
 from revolve2.simulation.scene import SimulationState
-from revolve2.simulation.simulator import Batch, Simulator
+from revolve2.simulation.simulator import Batch, SceneResult, Simulator
 
+from ._chunk_parameters import ChunkParameters
+from ._compiled_model_store import CompiledModelStore
+from ._cpu_affinity import CpuAffinity, worker_cpu_sets
+from ._model_cache import ModelCache
+from ._scene_structure import SceneStructure
+from ._settled_state_store import SettledStateStore
+from ._shared_trajectory import SharedTrajectory
+from ._simulate_scene_headless import simulate_scene_headless
 from ._simulate_manual_scene import (
     simulate_manual_scene,
 )
+from ._simulate_scenes_lockstep import simulate_scenes_lockstep
+from ._simulation_worker import initialize_worker, simulate_scene_chunk
+from ._trajectory import Trajectory
 from .viewers import ViewerType
 
 
 class LocalSimulator(Simulator):
-    """Simulator using MuJoCo."""
+    """Simulator using MuJoCo.
+
+    With multiple simulators, the worker processes (or threads, in
+    lockstep mode) are started on the first batch and kept alive for
+    the following ones. Call `close` or use the simulator as a context
+    manager to stop them.
+    """
 
     _headless: bool
     _start_paused: bool
@@ -33,7 +58,22 @@ class LocalSimulator(Simulator):
     _cast_shadows: bool
     _fast_sim: bool
     _manual_control: bool
+    _lockstep: bool
+    _scenes_per_task: int | None
+    _model_cache_size: int
+    _spec_compiler: bool
+    _settled_state_directory: str | None
+    _compiled_model_directory: str | None
+    _compiled_model_max_bytes: int | None
+    _shared_memory: bool
+    _worker_cpu_sets: list[set[int]] | None
+    _single_threaded_workers: bool
+    _model_cache: ModelCache
     _viewer_type: ViewerType
+    _process_pool: concurrent.futures.ProcessPoolExecutor | None
+    _process_pool_finalizer: "weakref.finalize[..., LocalSimulator] | None"
+    _thread_pool: concurrent.futures.ThreadPoolExecutor | None
+    _thread_pool_finalizer: "weakref.finalize[..., LocalSimulator] | None"
 
     def __init__(
         self,
@@ -45,6 +85,16 @@ class LocalSimulator(Simulator):
         cast_shadows: bool = False,
         fast_sim: bool = False,
         manual_control: bool = False,
+        lockstep: bool = False,
+        scenes_per_task: int | None = None,
+        model_cache_size: int = 32,
+        spec_compiler: bool = False,
+        settled_state_directory: str | Path | None = None,
+        compiled_model_directory: str | Path | None = None,
+        compiled_model_max_bytes: int | None = None,
+        shared_memory: bool = True,
+        cpu_affinity: CpuAffinity = CpuAffinity.NONE,
+        single_threaded_workers: bool = False,
     ) -> None:
         """Initialize this object.
 
@@ -59,6 +109,40 @@ class LocalSimulator(Simulator):
         :param fast_sim: Whether more complex rendering prohibited.
         :param manual_control: Whether the simulation should be
             controlled manually.
+        :param lockstep: Whether to simulate all scenes of a batch in
+            lockstep in this process. Structurally identical scenes then
+            share a single model, and `num_simulators` threads step the
+            physics. Only possible in headless mode.
+        :param scenes_per_task: How many scenes a worker process
+            simulates per submitted task. If None, the scenes are split
+            in about four tasks per worker.
+        :param model_cache_size: How many compiled models each worker
+            keeps for structurally identical scenes in later batches.
+            Zero disables the cache.
+        :param spec_compiler: Whether headless simulations build their
+            models directly through MuJoCo's `MjSpec`, skipping the URDF
+            conversion. Requires MuJoCo 3.2 or newer.
+        :param settled_state_directory: If not None, the directory in
+            which the states of warmed-up scenes are kept, so later
+            batches and runs with the same bodies skip the warm-up. See
+            `BatchParameters.warm_up_time`. Otherwise they are only kept
+            in memory.
+        :param compiled_model_directory: If not None, the directory in
+            which headless simulations keep compiled models, as MuJoCo
+            binary files. Later batches and runs, such as reruns of the
+            best robots, then load the models instead of compiling them.
+        :param compiled_model_max_bytes: The maximum total size of the
+            compiled models kept on disk. The least recently used models
+            are removed first. If None, models are never removed.
+        :param shared_memory: Whether worker processes return their
+            results through shared memory instead of pickling them.
+        :param cpu_affinity: How to pin worker processes to CPUs. Pinning
+            avoids workers migrating between cores, and between sockets
+            on NUMA machines.
+        :param single_threaded_workers: Whether to limit the numerical
+            libraries in worker processes, such as the BLAS behind NumPy,
+            to a single thread, so workers do not oversubscribe the
+            machine.
         :param viewer_type: The viewer-implementation to use in the
             local simulator.
         """
@@ -66,6 +150,10 @@ class LocalSimulator(Simulator):
             msg = "Cannot have parallel simulators when visualizing."
             raise ValueError(msg)
 
+        if lockstep and not headless:
+            msg = "Lockstep simulation is only possible in headless mode."
+            raise ValueError(msg)
+
         if headless and start_paused:
             msg = "Cannot start simulation paused in headless mode."
             raise ValueError(msg)
@@ -76,11 +164,128 @@ class LocalSimulator(Simulator):
         self._cast_shadows = cast_shadows
         self._fast_sim = fast_sim
         self._manual_control = manual_control
+        self._lockstep = lockstep
+        self._scenes_per_task = scenes_per_task
+        self._model_cache_size = model_cache_size
+        self._spec_compiler = spec_compiler
+        self._settled_state_directory = (
+            None
+            if settled_state_directory is None
+            else str(settled_state_directory)
+        )
+        self._compiled_model_directory = (
+            None
+            if compiled_model_directory is None
+            else str(compiled_model_directory)
+        )
+        self._compiled_model_max_bytes = compiled_model_max_bytes
+        self._shared_memory = shared_memory
+        self._worker_cpu_sets = worker_cpu_sets(cpu_affinity, num_simulators)
+        self._single_threaded_workers = single_threaded_workers
+        self._model_cache = ModelCache(
+            max_size=model_cache_size,
+            spec_compiler=spec_compiler,
+            settled_states=SettledStateStore(settled_state_directory),
+            compiled_models=(
+                None
+                if compiled_model_directory is None
+                else CompiledModelStore(
+                    compiled_model_directory, compiled_model_max_bytes
+                )
+            ),
+        )
         self._viewer_type = (
             ViewerType.from_string(viewer_type)
             if isinstance(viewer_type, str)
             else viewer_type
         )
+        self._process_pool = None
+        self._process_pool_finalizer = None
+        self._thread_pool = None
+        self._thread_pool_finalizer = None
+
+    def __enter__(self) -> Self:
+        """Enter the context of this simulator.
+
+        :returns: This simulator.
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the simulator when leaving its context.
+
+        :param exc_type: The type of the raised exception, if any.
+        :param exc_value: The raised exception, if any.
+        :param traceback: The traceback of the raised exception, if any.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes and threads of this simulator.
+
+        The simulator can still be used afterwards; the workers are then
+        started again.
+        """
+        # Calling a finalizer shuts down its pool and detaches it, so it
+        # does not keep the stopped pool alive.
+        if self._process_pool_finalizer is not None:
+            self._process_pool_finalizer()
+            self._process_pool_finalizer = None
+            self._process_pool = None
+        if self._thread_pool_finalizer is not None:
+            self._thread_pool_finalizer()
+            self._thread_pool_finalizer = None
+            self._thread_pool = None
+
+    def _get_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Get the worker processes, starting them if necessary.
+
+        :returns: The process pool.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        if self._process_pool is None:
+            context = multiprocessing.get_context()
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._num_simulators,
+                mp_context=context,
+                initializer=initialize_worker,
+                initargs=(
+                    self._model_cache_size,
+                    self._spec_compiler,
+                    self._settled_state_directory,
+                    self._compiled_model_directory,
+                    self._compiled_model_max_bytes,
+                    self._worker_cpu_sets,
+                    context.Value("i", 0),
+                    self._single_threaded_workers,
+                ),
+            )
+            # Make sure the workers are stopped before interpreter shutdown.
+            self._process_pool_finalizer = weakref.finalize(
+                self, self._process_pool.shutdown
+            )
+        return self._process_pool
+
+    def _get_thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Get the lockstep stepping threads, starting them if necessary.
+
+        :returns: The thread pool.
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._num_simulators
+            )
+            self._thread_pool_finalizer = weakref.finalize(
+                self, self._thread_pool.shutdown
+            )
+        return self._thread_pool
 
     def simulate_batch(self, batch: Batch) -> list[list[SimulationState]]:
         """Simulate the provided batch by simulating each contained scene.
@@ -89,13 +294,49 @@ class LocalSimulator(Simulator):
         :type batch: Batch
         :returns: List of simulation states in ascending order of time.
         :rtype: list[list[SimulationState]]
-        :raises Exception: If manual control is selected, but headless
-            is enabled.
 
+        """
+        trajectories = self._simulate(batch)
+        if trajectories is None:
+            return [[]]
+        return [trajectory.states() for trajectory in trajectories]
+
+    def simulate_batch_with_reports(self, batch: Batch) -> list[SceneResult]:
+        """Simulate the provided batch, and report how each scene went.
+
+        With manual control, nothing is sampled, so there are no results.
+
+        :param batch: The batch to run.
+        :type batch: Batch
+        :returns: The states and report of each scene, in the order of
+            the batch.
+        :rtype: list[SceneResult]
+
+        """
+        trajectories = self._simulate(batch)
+        if trajectories is None:
+            return []
+        return [
+            SceneResult(states=trajectory.states(), report=trajectory.report())
+            for trajectory in trajectories
+        ]
+
+    def _simulate(self, batch: Batch) -> list[Trajectory] | None:
+        """Simulate each scene of a batch.
+
+        :param batch: The batch to run.
+        :returns: The result of each scene, or None with manual control.
+        :raises ValueError: If manual control is selected, but headless
+            is enabled, or if recording in lockstep mode.
         """
         logging.info("Starting simulation batch with MuJoCo.")
 
         control_step = 1.0 / batch.parameters.control_frequency
+        camera_step = (
+            control_step
+            if batch.parameters.camera_frequency is None
+            else 1.0 / batch.parameters.camera_frequency
+        )
         sample_step = (
             None
             if batch.parameters.sampling_frequency is None
@@ -113,45 +354,143 @@ class LocalSimulator(Simulator):
                 raise ValueError(msg)
             for scene in batch.scenes:
                 simulate_manual_scene(scene=scene)
-            return [[]]
+            return None
 
-        if self._num_simulators > 1:
-            with concurrent.futures.ProcessPoolExecutor(
-                max_workers=self._num_simulators
-            ) as executor:
-                futures = [
-                    executor.submit(
-                        # This is the function to call, followed by the parameters of the function
-                        simulate_scene,
-                        viewer_type=self._viewer_type,
-                        scene_id=scene_index,
-                        scene=scene,
-                        record_settings=batch.record_settings,
-                        control_step=control_step,
-                        sample_step=sample_step,
-                        simulation_time=batch.parameters.simulation_time,
-                        simulation_timestep=batch.parameters.simulation_timestep,
-                        integrator=batch.parameters.integrator,
-                        headless=self._headless,
-                        start_paused=self._start_paused,
-                        cast_shadows=self._cast_shadows,
-                        fast_sim=self._fast_sim,
-                    )
-                    for scene_index, scene in enumerate(batch.scenes)
+        if self._lockstep:
+            if batch.record_settings is not None:
+                msg = "Cannot record in lockstep mode."
+                raise ValueError(msg)
+            trajectories = simulate_scenes_lockstep(
+                scenes=batch.scenes,
+                control_step=control_step,
+                sample_step=sample_step,
+                simulation_time=batch.parameters.simulation_time,
+                simulation_timestep=batch.parameters.simulation_timestep,
+                integrator=batch.parameters.integrator,
+                recording_spec=batch.parameters.recording_spec,
+                termination_conditions=batch.parameters.termination_conditions,
+                collect_timings=batch.parameters.collect_timings,
+                collect_physics_diagnostics=(
+                    batch.parameters.collect_physics_diagnostics
+                ),
+                warm_up_time=batch.parameters.warm_up_time,
+                model_cache=self._model_cache,
+                executor=self._get_thread_pool(),
+                num_threads=self._num_simulators,
+                cast_shadows=self._cast_shadows,
+                fast_sim=self._fast_sim,
+            )
+        elif self._num_simulators > 1:
+            scenes_per_task = self._scenes_per_task or max(
+                1, math.ceil(len(batch.scenes) / (4 * self._num_simulators))
+            )
+            indexed_scenes = list(enumerate(batch.scenes))
+            executor = self._get_process_pool()
+            parameters = ChunkParameters(
+                control_step=control_step,
+                camera_step=camera_step,
+                sample_step=sample_step,
+                simulation_time=batch.parameters.simulation_time,
+                simulation_timestep=batch.parameters.simulation_timestep,
+                integrator=batch.parameters.integrator,
+                recording_spec=batch.parameters.recording_spec,
+                termination_conditions=batch.parameters.termination_conditions,
+                collect_timings=batch.parameters.collect_timings,
+                collect_physics_diagnostics=(
+                    batch.parameters.collect_physics_diagnostics
+                ),
+                warm_up_time=batch.parameters.warm_up_time,
+                cast_shadows=self._cast_shadows,
+                fast_sim=self._fast_sim,
+                record_settings=batch.record_settings,
+                headless=self._headless,
+                viewer_type=self._viewer_type,
+                start_paused=self._start_paused,
+            )
+            futures = [
+                executor.submit(
+                    # This is the function to call, followed by the parameters of the function
+                    simulate_scene_chunk,
+                    indexed_scenes[start : start + scenes_per_task],
+                    parameters,
+                    shared_memory=self._shared_memory,
+                )
+                for start in range(0, len(indexed_scenes), scenes_per_task)
+            ]
+            concurrent.futures.wait(futures)
+            # Chunks that succeeded may have left samples in shared memory,
+            # which must be freed even if another chunk failed.
+            shared_results = [
+                result
+                for future in futures
+                if future.exception() is None
+                for result in future.result()
+                if isinstance(result, SharedTrajectory)
+            ]
+            try:
+                chunk_results = [
+                    result for future in futures for result in future.result()
                 ]
-                results = [future.result() for future in futures]
+                trajectories = []
+                for result, scene in zip(
+                    chunk_results, batch.scenes, strict=True
+                ):
+                    structure = SceneStructure.from_scene(scene)
+                    if isinstance(result, SharedTrajectory):
+                        trajectories.append(
+                            Trajectory.from_shared(result, structure)
+                        )
+                    else:
+                        result.attach(structure)
+                        trajectories.append(result)
+            finally:
+                for shared in shared_results:
+                    shared.unlink()
+        elif self._headless and batch.record_settings is None:
+            trajectories = [
+                simulate_scene_headless(
+                    scene_id=scene_index,
+                    scene=scene,
+                    control_step=control_step,
+                    camera_step=camera_step,
+                    sample_step=sample_step,
+                    simulation_time=batch.parameters.simulation_time,
+                    simulation_timestep=batch.parameters.simulation_timestep,
+                    integrator=batch.parameters.integrator,
+                    recording_spec=batch.parameters.recording_spec,
+                    termination_conditions=batch.parameters.termination_conditions,
+                    collect_timings=batch.parameters.collect_timings,
+                    collect_physics_diagnostics=(
+                        batch.parameters.collect_physics_diagnostics
+                    ),
+                    warm_up_time=batch.parameters.warm_up_time,
+                    model_cache=self._model_cache,
+                    cast_shadows=self._cast_shadows,
+                    fast_sim=self._fast_sim,
+                )
+                for scene_index, scene in enumerate(batch.scenes)
+            ]
         else:
-            results = [
+            trajectories = [
                 simulate_scene_minimal(
                     viewer_type=self._viewer_type,
                     scene_id=scene_index,
                     scene=scene,
                     record_settings=batch.record_settings,
                     control_step=control_step,
+                    camera_step=camera_step,
                     sample_step=sample_step,
                     simulation_time=batch.parameters.simulation_time,
                     simulation_timestep=batch.parameters.simulation_timestep,
                     integrator=batch.parameters.integrator,
+                    recording_spec=batch.parameters.recording_spec,
+                    termination_conditions=batch.parameters.termination_conditions,
+                    collect_timings=batch.parameters.collect_timings,
+                    collect_physics_diagnostics=(
+                        batch.parameters.collect_physics_diagnostics
+                    ),
+                    warm_up_time=batch.parameters.warm_up_time,
+                    model_cache=self._model_cache,
                     headless=self._headless,
                     start_paused=self._start_paused,
                     cast_shadows=self._cast_shadows,
@@ -162,4 +501,4 @@ class LocalSimulator(Simulator):
 
         logging.info("Finished batch.")
 
-        return results
+        return trajectories
@@ -0,0 +1,335 @@
+import contextlib
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import mujoco
+from revolve2.simulation.scene import Scene
+
+from ._abstraction_to_mujoco_mapping import AbstractionToMujocoMapping
+from ._compiled_model_store import CompiledModelStore
+from ._scene_structure import SceneStructure
+from ._scene_timer import SceneTimer, TimedPhase
+from ._scene_to_model import scene_to_model
+from ._scene_to_model_spec import scene_to_model_spec, spec_compiler_available
+from ._settled_state_store import SettledStateStore
+from ._warm_up import start_from, warm_up
+
+
+@dataclass
+class _CacheEntry:
+    """A compiled model together with the scene it was compiled from."""
+
+    model: mujoco.MjModel
+    mapping: AbstractionToMujocoMapping
+    structure: SceneStructure
+    data: mujoco.MjData
+
+
+class ModelCache:
+    """A least-recently-used cache of compiled MuJoCo models.
+
+    Models are keyed by the structure of the scene and the simulation
+    options, so structurally identical scenes, such as the same body with
+    different brains, are only compiled once. Each entry also keeps the
+    data it was last simulated with, which is reset instead of being
+    allocated again.
+
+    Scenes can be warmed up before they are handed out. The warm-up of a
+    model is simulated once, and structurally identical scenes all start
+    from a copy of the resulting state, which is kept in a settled state
+    store. That state outlives the model in the cache.
+
+    Compiled models can also be kept on disk, in a compiled model store,
+    so models evicted from the cache and models from earlier runs are
+    loaded instead of compiled.
+    """
+
+    _max_size: int
+    _compile: Callable[..., tuple[mujoco.MjModel, AbstractionToMujocoMapping]]
+    _entries: OrderedDict[tuple[object, ...], _CacheEntry]
+    _settled_states: SettledStateStore
+    _compiled_models: CompiledModelStore | None
+    _hits: int
+    _misses: int
+
+    def __init__(
+        self,
+        max_size: int,
+        *,
+        spec_compiler: bool = False,
+        settled_states: SettledStateStore | None = None,
+        compiled_models: CompiledModelStore | None = None,
+    ) -> None:
+        """Initialize this object.
+
+        :param max_size: The maximum number of models to keep. Zero
+            disables caching.
+        :param spec_compiler: Whether to build models directly through
+            `MjSpec` instead of through URDF.
+        :param settled_states: Where to keep warmed-up states. If None,
+            they are kept in memory.
+        :param compiled_models: If not None, where compiled models are
+            kept on disk.
+        :raises ValueError: If the maximum size is negative, or the spec
+            compiler is requested but not available.
+        """
+        if max_size < 0:
+            msg = "Model cache size cannot be negative."
+            raise ValueError(msg)
+        if spec_compiler and not spec_compiler_available():
+            msg = "The spec compiler requires MuJoCo 3.2 or newer."
+            raise ValueError(msg)
+
+        self._max_size = max_size
+        self._compile = (
+            scene_to_model_spec if spec_compiler else scene_to_model
+        )
+        self._entries = OrderedDict()
+        self._settled_states = (
+            SettledStateStore() if settled_states is None else settled_states
+        )
+        self._compiled_models = compiled_models
+        self._hits = 0
+        self._misses = 0
+
+    def get(
+        self,
+        scene: Scene,
+        simulation_timestep: float,
+        integrator: str,
+        *,
+        cast_shadows: bool,
+        fast_sim: bool,
+        timer: SceneTimer | None = None,
+        warm_up_time: float | None = None,
+    ) -> tuple[mujoco.MjModel, AbstractionToMujocoMapping, mujoco.MjData]:
+        """Get the model for a scene, compiling it if it is not cached.
+
+        The returned data is in its initial state, or in the warmed-up
+        state if a warm-up time is given. It is owned by the
+        cache and handed out again for the next structurally identical
+        scene, so it must not be used after that.
+
+        :param scene: The scene to get the model for.
+        :type scene: Scene
+        :param simulation_timestep: The duration to integrate over during
+            each step of the simulation. In seconds.
+        :type simulation_timestep: float
+        :param integrator: The integrator to use.
+        :type integrator: str
+        :param *:
+        :param cast_shadows: Whether shadows are cast by the light.
+        :type cast_shadows: bool
+        :param fast_sim: If fancy rendering is disabled.
+        :type fast_sim: bool
+        :param timer: If not None, the time spent allocating or resetting
+            the data is measured with this timer.
+        :type timer: SceneTimer | None
+        :param warm_up_time: If not None, how long to simulate the scene
+            without control before handing out the data. See `warm_up`.
+            In seconds.
+        :type warm_up_time: float | None
+        :returns: The model, the mapping from the scene to the model and
+            data for the model.
+        :rtype: tuple[mujoco.MjModel, AbstractionToMujocoMapping, mujoco.MjData]
+        """
+        allocation = (
+            contextlib.nullcontext()
+            if timer is None
+            else timer.measure(TimedPhase.DATA_ALLOCATION)
+        )
+
+        if (
+            self._max_size == 0
+            and warm_up_time is None
+            and self._compiled_models is None
+        ):
+            model, mapping = self._compile(
+                scene=scene,
+                simulation_timestep=simulation_timestep,
+                integrator=integrator,
+                cast_shadows=cast_shadows,
+                fast_sim=fast_sim,
+            )
+            with allocation:
+                data = mujoco.MjData(model)
+            return model, mapping, data
+
+        structure = SceneStructure.from_scene(scene)
+        if self._max_size == 0:
+            model, mapping = self._load_or_compile(
+                scene,
+                structure,
+                simulation_timestep,
+                integrator,
+                cast_shadows=cast_shadows,
+                fast_sim=fast_sim,
+            )
+            with allocation:
+                data = mujoco.MjData(model)
+            if warm_up_time is not None:
+                self._start_settled(
+                    model, data, structure.key, integrator, warm_up_time, timer
+                )
+            return model, mapping, data
+
+        key = (
+            structure.key,
+            simulation_timestep,
+            integrator,
+            cast_shadows,
+            fast_sim,
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            with allocation:
+                mujoco.mj_resetData(entry.model, entry.data)
+            if warm_up_time is not None:
+                self._start_settled(
+                    entry.model,
+                    entry.data,
+                    structure.key,
+                    integrator,
+                    warm_up_time,
+                    timer,
+                )
+            return (
+                entry.model,
+                structure.remap(entry.mapping, entry.structure),
+                entry.data,
+            )
+
+        self._misses += 1
+        model, mapping = self._load_or_compile(
+            scene,
+            structure,
+            simulation_timestep,
+            integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+        )
+        with allocation:
+            data = mujoco.MjData(model)
+        if warm_up_time is not None:
+            self._start_settled(
+                model, data, structure.key, integrator, warm_up_time, timer
+            )
+        self._entries[key] = _CacheEntry(
+            model=model, mapping=mapping, structure=structure, data=data
+        )
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return model, mapping, data
+
+    def _load_or_compile(
+        self,
+        scene: Scene,
+        structure: SceneStructure,
+        simulation_timestep: float,
+        integrator: str,
+        *,
+        cast_shadows: bool,
+        fast_sim: bool,
+    ) -> tuple[mujoco.MjModel, AbstractionToMujocoMapping]:
+        """Load the model of a scene from disk, or compile and store it.
+
+        :param scene: The scene.
+        :param structure: The structure of the scene.
+        :param simulation_timestep: The duration to integrate over during
+            each step of the simulation. In seconds.
+        :param integrator: The integrator to use.
+        :param cast_shadows: Whether shadows are cast by the light.
+        :param fast_sim: If fancy rendering is disabled.
+        :returns: The model and the mapping from the scene to it.
+        """
+        if self._compiled_models is None:
+            return self._compile(
+                scene=scene,
+                simulation_timestep=simulation_timestep,
+                integrator=integrator,
+                cast_shadows=cast_shadows,
+                fast_sim=fast_sim,
+            )
+
+        key = CompiledModelStore.key(
+            structure.key,
+            simulation_timestep,
+            integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+            compiler=self._compile.__name__,
+        )
+        stored = self._compiled_models.get(key, structure)
+        if stored is not None:
+            return stored
+
+        model, mapping = self._compile(
+            scene=scene,
+            simulation_timestep=simulation_timestep,
+            integrator=integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+        )
+        self._compiled_models.put(key, model, mapping, structure)
+        return model, mapping
+
+    def _start_settled(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        structure_key: str,
+        integrator: str,
+        warm_up_time: float,
+        timer: SceneTimer | None,
+    ) -> None:
+        """Put data in its warmed-up state, warming up if it is not known.
+
+        :param model: The model of the data.
+        :param data: The data, in its initial state.
+        :param structure_key: The key of the structure of the scene.
+        :param integrator: The integrator of the model.
+        :param warm_up_time: How long to warm up. In seconds.
+        :param timer: If not None, the warm-up is measured as physics
+            with this timer.
+        """
+        key = SettledStateStore.key(
+            structure_key,
+            model.opt.timestep,
+            integrator,
+            warm_up_time,
+            compiler=self._compile.__name__,
+        )
+        state = self._settled_states.get(key)
+        if state is not None:
+            start_from(model, data, state)
+            return
+
+        physics = (
+            contextlib.nullcontext()
+            if timer is None
+            else timer.measure(TimedPhase.PHYSICS)
+        )
+        with physics:
+            state = warm_up(model, data, warm_up_time)
+        self._settled_states.put(key, state)
+
+    @property
+    def hits(self) -> int:
+        """Get the number of lookups that found a cached model.
+
+        :returns: The number of hits.
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Get the number of lookups that had to compile a model.
+
+        :returns: The number of misses.
+        :rtype: int
+        """
+        return self._misses
@@ -59,9 +59,11 @@ class OpenGLVision:
         """
         context = self.get_context(open_gl_lib)
         if headless:
-            self._open_gl_context = context.gl_context(*camera.camera_size)
+            self._open_gl_context = context(*camera.camera_size)
             self._open_gl_context.make_current()
-            logging.debug(f"Initialized {OpenGLVision._open_gl_context=}")
+            logging.debug(f"Initialized {self._open_gl_context=}")
+        else:
+            self._open_gl_context = None
 
         self._mujoco_context = mujoco.MjrContext(
             model, mujoco.mjtFontScale.mjFONTSCALE_150.value
@@ -90,6 +92,24 @@ class OpenGLVision:
         :returns: The rendered image (RGB format).
         :rtype: NDArray[np.uint8]
 
+        """
+        self.update_scene(model, data, self._mujoco_scene)
+        return self.render(model, data, self._mujoco_scene)
+
+    def update_scene(
+        self, model: MjModel, data: MjData, scene: mujoco.MjvScene
+    ) -> None:
+        """Update the abstract scene to the current state of the simulation.
+
+        A scene updated once can be rendered by every camera of the model,
+        using `render`.
+
+        :param model: The mujoco model.
+        :type model: MjModel
+        :param data: The mujoco data.
+        :type data: MjData
+        :param scene: The scene to update.
+        :type scene: mujoco.MjvScene
         """
         mujoco.mjv_updateScene(
             model,
@@ -98,14 +118,31 @@ class OpenGLVision:
             self._video_perturbations,
             self._camera,
             mujoco.mjtCatBit.mjCAT_ALL.value,
-            self._mujoco_scene,
+            scene,
         )
+
+    def render(
+        self, model: MjModel, data: MjData, scene: mujoco.MjvScene
+    ) -> NDArray[np.uint8]:
+        """Render an updated scene from this camera.
+
+        :param model: The mujoco model.
+        :type model: MjModel
+        :param data: The mujoco data.
+        :type data: MjData
+        :param scene: The scene, updated to the current state.
+        :type scene: mujoco.MjvScene
+        :returns: The rendered image (RGB format). The same array is
+            reused by the next render.
+        :rtype: NDArray[np.uint8]
+        """
+        if self._open_gl_context is not None:
+            self._open_gl_context.make_current()
+        mujoco.mjv_updateCamera(model, data, self._camera, scene)
         mujoco.mjr_setBuffer(
             mujoco.mjtFramebuffer.mjFB_OFFSCREEN, self._mujoco_context
         )
-        mujoco.mjr_render(
-            self._viewport, self._mujoco_scene, self._mujoco_context
-        )
+        mujoco.mjr_render(self._viewport, scene, self._mujoco_context)
         mujoco.mjr_readPixels(
             self._image, None, self._viewport, self._mujoco_context
         )
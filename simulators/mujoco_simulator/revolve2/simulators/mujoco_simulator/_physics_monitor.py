@@ -0,0 +1,68 @@
+import mujoco
+from revolve2.simulation.simulator import PhysicsDiagnostics
+
+
+class PhysicsMonitor:
+    """Observes the energy and penetrations of a simulation.
+
+    A disabled monitor observes nothing, at the cost of a single call per
+    observation.
+    """
+
+    _enabled: bool
+    _initial_energy: float | None
+    _max_energy: float
+    _final_energy: float
+    _max_penetration: float
+
+    def __init__(self, enabled: bool) -> None:
+        """Initialize this object.
+
+        :param enabled: Whether to observe anything.
+        """
+        self._enabled = enabled
+        self._initial_energy = None
+        self._max_energy = float("-inf")
+        self._final_energy = 0.0
+        self._max_penetration = 0.0
+
+    def observe(self, model: mujoco.MjModel, data: mujoco.MjData) -> None:
+        """Observe the current state of the simulation.
+
+        :param model: The simulated model.
+        :type model: mujoco.MjModel
+        :param data: The data of the simulation.
+        :type data: mujoco.MjData
+        """
+        if not self._enabled:
+            return
+
+        # Fills data.energy without enabling it for every step.
+        mujoco.mj_energyPos(model, data)
+        mujoco.mj_energyVel(model, data)
+        energy = float(data.energy[0] + data.energy[1])
+        if self._initial_energy is None:
+            self._initial_energy = energy
+        self._max_energy = max(self._max_energy, energy)
+        self._final_energy = energy
+
+        if data.ncon > 0:
+            self._max_penetration = max(
+                self._max_penetration, -float(data.contact.dist.min())
+            )
+
+    def diagnostics(self) -> PhysicsDiagnostics | None:
+        """Get what has been observed, up to now.
+
+        :returns: The diagnostics, or None if the monitor is disabled or
+            observed nothing.
+        :rtype: PhysicsDiagnostics | None
+        """
+        if self._initial_energy is None:
+            return None
+        return PhysicsDiagnostics(
+            initial_energy=self._initial_energy,
+            max_energy=self._max_energy,
+            final_energy=self._final_energy,
+            max_penetration=self._max_penetration,
+        )
@@ -0,0 +1,347 @@
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+from revolve2.simulation.scene import (
+    Joint,
+    JointHinge,
+    MultiBodySystem,
+    Pose,
+    RigidBody,
+    Scene,
+    UUIDKey,
+)
+from revolve2.simulation.scene.geometry import (
+    Geometry,
+    GeometryBox,
+    GeometryHeightmap,
+    GeometryPlane,
+    GeometrySphere,
+)
+from revolve2.simulation.scene.sensors import CameraSensor, IMUSensor
+
+from ._abstraction_to_mujoco_mapping import (
+    AbstractionToMujocoMapping,
+    CameraSensorMujoco,
+    IMUSensorMujoco,
+    JointHingeMujoco,
+    MultiBodySystemMujoco,
+)
+
+
+@dataclass(kw_only=True)
+class DetachedMapping:
+    """A mapping stored by position in the `SceneStructure` of its scene.
+
+    It does not reference the scene objects, so it is small to pickle,
+    and can be attached to the copies of the objects in another process.
+    Objects that are not in the mapping are None.
+    """
+
+    multi_body_systems: list[MultiBodySystemMujoco | None]
+    hinge_joints: list[JointHingeMujoco | None]
+    imu_sensors: list[IMUSensorMujoco | None]
+    camera_sensors: list[CameraSensorMujoco | None]
+
+
+@dataclass(eq=False)
+class SceneStructure:
+    """The structure of a scene, independent of the identity of its objects.
+
+    Two scenes with the same `key` compile to the same MuJoCo model. The
+    object lists are in a deterministic traversal order, so objects at
+    the same index in two scenes with the same key take the same place
+    in that model.
+    """
+
+    key: str
+    """Digest of everything in the scene that ends up in the model."""
+
+    multi_body_systems: list[MultiBodySystem] = field(default_factory=list)
+    hinge_joints: list[JointHinge] = field(default_factory=list)
+    imu_sensors: list[IMUSensor] = field(default_factory=list)
+    camera_sensors: list[CameraSensor] = field(default_factory=list)
+
+    @classmethod
+    def from_scene(cls, scene: Scene) -> "SceneStructure":
+        """Get the structure of a scene.
+
+        :param scene: The scene.
+        :type scene: Scene
+        :returns: The structure.
+        :rtype: SceneStructure
+        """
+        return _StructureBuilder().build(scene)
+
+    def remap(
+        self,
+        mapping: AbstractionToMujocoMapping,
+        source: "SceneStructure",
+    ) -> AbstractionToMujocoMapping:
+        """Translate a mapping made for a structurally identical scene.
+
+        :param mapping: The mapping created for the `source` scene.
+        :type mapping: AbstractionToMujocoMapping
+        :param source: The structure of the scene the mapping was made
+            for.
+        :type source: SceneStructure
+        :returns: A mapping for the scene this structure was made from.
+        :rtype: AbstractionToMujocoMapping
+        :raises ValueError: If the structures are not identical.
+        """
+        if source.key != self.key:
+            msg = (
+                "Cannot remap a mapping between structurally different scenes."
+            )
+            raise ValueError(msg)
+
+        remapped = AbstractionToMujocoMapping()
+        for src_mbs, mbs in zip(
+            source.multi_body_systems, self.multi_body_systems, strict=True
+        ):
+            remapped.multi_body_system[UUIDKey(mbs)] = (
+                mapping.multi_body_system[UUIDKey(src_mbs)]
+            )
+        for src_joint, joint in zip(
+            source.hinge_joints, self.hinge_joints, strict=True
+        ):
+            remapped.hinge_joint[UUIDKey(joint)] = mapping.hinge_joint[
+                UUIDKey(src_joint)
+            ]
+        for src_imu, imu in zip(
+            source.imu_sensors, self.imu_sensors, strict=True
+        ):
+            remapped.imu_sensor[UUIDKey(imu)] = mapping.imu_sensor[
+                UUIDKey(src_imu)
+            ]
+        for src_camera, camera in zip(
+            source.camera_sensors, self.camera_sensors, strict=True
+        ):
+            remapped.camera_sensor[UUIDKey(camera)] = mapping.camera_sensor[
+                UUIDKey(src_camera)
+            ]
+        return remapped
+
+    def detach(self, mapping: AbstractionToMujocoMapping) -> DetachedMapping:
+        """Store a mapping made for this scene by position.
+
+        :param mapping: The mapping. It may leave out objects.
+        :type mapping: AbstractionToMujocoMapping
+        :returns: The detached mapping.
+        :rtype: DetachedMapping
+        """
+        return DetachedMapping(
+            multi_body_systems=[
+                mapping.multi_body_system.get(UUIDKey(multi_body_system))
+                for multi_body_system in self.multi_body_systems
+            ],
+            hinge_joints=[
+                mapping.hinge_joint.get(UUIDKey(joint))
+                for joint in self.hinge_joints
+            ],
+            imu_sensors=[
+                mapping.imu_sensor.get(UUIDKey(imu))
+                for imu in self.imu_sensors
+            ],
+            camera_sensors=[
+                mapping.camera_sensor.get(UUIDKey(camera))
+                for camera in self.camera_sensors
+            ],
+        )
+
+    def attach(self, detached: DetachedMapping) -> AbstractionToMujocoMapping:
+        """Attach a detached mapping to the objects of this scene.
+
+        :param detached: A mapping detached from a structurally identical
+            scene.
+        :type detached: DetachedMapping
+        :returns: The mapping for the objects of this scene.
+        :rtype: AbstractionToMujocoMapping
+        """
+        mapping = AbstractionToMujocoMapping()
+        for multi_body_system, multi_body_system_mujoco in zip(
+            self.multi_body_systems, detached.multi_body_systems, strict=True
+        ):
+            if multi_body_system_mujoco is not None:
+                mapping.multi_body_system[UUIDKey(multi_body_system)] = (
+                    multi_body_system_mujoco
+                )
+        for joint, joint_mujoco in zip(
+            self.hinge_joints, detached.hinge_joints, strict=True
+        ):
+            if joint_mujoco is not None:
+                mapping.hinge_joint[UUIDKey(joint)] = joint_mujoco
+        for imu, imu_mujoco in zip(
+            self.imu_sensors, detached.imu_sensors, strict=True
+        ):
+            if imu_mujoco is not None:
+                mapping.imu_sensor[UUIDKey(imu)] = imu_mujoco
+        for camera, camera_mujoco in zip(
+            self.camera_sensors, detached.camera_sensors, strict=True
+        ):
+            if camera_mujoco is not None:
+                mapping.camera_sensor[UUIDKey(camera)] = camera_mujoco
+        return mapping
+
+
+class _StructureBuilder:
+    """Walks a scene the same way the URDF conversion does.
+
+    Everything the conversion puts in the model is fed to a digest, which
+    becomes the key of the structure. Each value is fed with a tag, so
+    different sequences of objects never produce the same bytes.
+    Anything that changes the compiled model must be fed here, or
+    scenes that differ in it would wrongly share a model.
+    """
+
+    _hash: "hashlib._Hash"
+    _structure: SceneStructure
+
+    def build(self, scene: Scene) -> SceneStructure:
+        """Get the structure of a scene.
+
+        :param scene: The scene.
+        :type scene: Scene
+        :returns: The structure, with the digest of the scene as key.
+        :rtype: SceneStructure
+        """
+        self._hash = hashlib.sha256()
+        self._structure = SceneStructure(key="")
+
+        for multi_body_system in scene.multi_body_systems:
+            self._structure.multi_body_systems.append(multi_body_system)
+            self._feed("mbs", multi_body_system.is_static)
+            self._feed_pose(multi_body_system.pose)
+            self._visit_rigid_body(
+                multi_body_system, multi_body_system.root, parent=None
+            )
+
+        self._structure.key = self._hash.hexdigest()
+        return self._structure
+
+    def _visit_rigid_body(
+        self,
+        multi_body_system: MultiBodySystem,
+        rigid_body: RigidBody,
+        parent: RigidBody | None,
+    ) -> None:
+        """Feed a rigid body and, depth first, the bodies attached to it.
+
+        Joints are undirected in a multi-body system, so the joint to the
+        parent is found again from the child. It is skipped, as it was
+        already fed when visiting the parent, and following it would walk
+        back up the tree. An end tag closes the children of the body, so
+        the digest tells siblings apart from descendants.
+
+        :param multi_body_system: The multi-body system the body is in.
+        :type multi_body_system: MultiBodySystem
+        :param rigid_body: The body to feed.
+        :type rigid_body: RigidBody
+        :param parent: The body this body was reached from, or None for
+            the root.
+        :type parent: RigidBody | None
+        """
+        self._feed(
+            "body", rigid_body.static_friction, rigid_body.dynamic_friction
+        )
+        self._feed_pose(rigid_body.initial_pose)
+        for geometry in rigid_body.geometries:
+            self._feed_geometry(geometry)
+        for imu in rigid_body.sensors.imu_sensors:
+            self._structure.imu_sensors.append(imu)
+            self._feed("imu")
+            self._feed_pose(imu.pose)
+        for camera in rigid_body.sensors.camera_sensors:
+            self._structure.camera_sensors.append(camera)
+            self._feed("camera", *camera.camera_size)
+            self._feed_pose(camera.pose)
+
+        for joint in multi_body_system.get_joints_for_rigid_body(rigid_body):
+            if parent is not None and parent.uuid in {
+                joint.rigid_body1.uuid,
+                joint.rigid_body2.uuid,
+            }:
+                continue
+            self._feed_joint(joint)
+            self._visit_rigid_body(
+                multi_body_system, joint.rigid_body2, parent=rigid_body
+            )
+        self._feed("end")
+
+    def _feed_joint(self, joint: Joint) -> None:
+        """Feed the type and pose of a joint.
+
+        For hinge joints, the axis, range, actuator limits and PID gains
+        are fed as well, as they end up in the joint and its actuators.
+
+        :param joint: The joint.
+        :type joint: Joint
+        """
+        self._feed("joint", type(joint).__name__)
+        self._feed_pose(joint.pose)
+        if isinstance(joint, JointHinge):
+            self._structure.hinge_joints.append(joint)
+            self._feed_array(joint.axis)
+            self._feed(
+                joint.range,
+                joint.effort,
+                joint.velocity,
+                joint.armature,
+                joint.pid_gain_p,
+                joint.pid_gain_d,
+            )
+
+    def _feed_geometry(self, geometry: Geometry) -> None:
+        """Feed the type, mass, pose and texture of a geometry.
+
+        The dimensions depend on the type of geometry. For a heightmap,
+        all heights are fed, as they are compiled into the model.
+
+        :param geometry: The geometry.
+        :type geometry: Geometry
+        """
+        self._feed("geom", type(geometry).__name__, geometry.mass)
+        self._feed_pose(geometry.pose)
+        self._feed(repr(geometry.texture))
+        match geometry:
+            case GeometryBox():
+                self._feed_array(geometry.aabb.size)
+            case GeometrySphere():
+                self._feed(geometry.radius)
+            case GeometryPlane():
+                self._feed_array(geometry.size)
+            case GeometryHeightmap():
+                self._feed_array(geometry.size)
+                self._feed(geometry.base_thickness)
+                self._feed_array(geometry.heights)
+
+    def _feed_pose(self, pose: Pose) -> None:
+        """Feed the position and orientation of a pose.
+
+        :param pose: The pose.
+        :type pose: Pose
+        """
+        self._feed_array(pose.position)
+        self._feed_array(pose.orientation)
+
+    def _feed_array(self, values: object) -> None:
+        """Feed the exact values of an array, as 64-bit floats.
+
+        The shape is fed first, so arrays with the same values in a
+        different shape give a different digest.
+
+        :param values: Anything numpy can turn into an array.
+        :type values: object
+        """
+        array = np.ascontiguousarray(values, dtype=np.float64)
+        self._feed(array.shape)
+        self._hash.update(array.tobytes())
+
+    def _feed(self, *values: object) -> None:
+        """Feed the representation of a few small values.
+
+        :param *values: The values. Their `repr` must be exact, which
+            holds for strings, numbers, booleans and tuples of them.
+        :type *values: object
+        """
+        self._hash.update(repr(values).encode())
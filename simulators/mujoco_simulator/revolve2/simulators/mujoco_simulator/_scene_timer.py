@@ -0,0 +1,133 @@
+import contextlib
+import time
+from contextlib import AbstractContextManager
+from enum import Enum, auto
+from types import TracebackType
+
+from revolve2.simulation.simulator import SceneTimings
+
+
+class TimedPhase(Enum):
+    """A part of simulating a scene whose wall-clock time is measured."""
+
+    MODEL_BUILD = auto()
+    DATA_ALLOCATION = auto()
+    PHYSICS = auto()
+    CONTROL = auto()
+    SAMPLING = auto()
+    CAMERA_RENDERING = auto()
+    VIDEO = auto()
+
+
+class SceneTimer:
+    """Measures where the wall-clock time of simulating a scene goes.
+
+    Phases can be nested. The time of an inner phase is not counted for
+    the outer one, so cameras rendered by the scene handler count as
+    camera rendering and not as control.
+
+    A disabled timer measures nothing, at the cost of a single call per
+    phase.
+    """
+
+    _enabled: bool
+    _start: float
+    _totals: dict[TimedPhase, float]
+    _inner: list[float]
+
+    def __init__(self, enabled: bool) -> None:
+        """Initialize this object and start the clock.
+
+        :param enabled: Whether to measure anything.
+        """
+        self._enabled = enabled
+        self._start = time.perf_counter()
+        self._totals = dict.fromkeys(TimedPhase, 0.0)
+        # For each phase that is being measured, the time spent in the
+        # phases inside it.
+        self._inner = []
+
+    def measure(self, phase: TimedPhase) -> AbstractContextManager[None]:
+        """Measure the time spent inside the returned context.
+
+        :param phase: The phase to count the time for.
+        :type phase: TimedPhase
+        :returns: The context.
+        :rtype: AbstractContextManager[None]
+        """
+        if not self._enabled:
+            return _NOT_MEASURED
+        return _Measurement(self, phase)
+
+    def timings(
+        self, simulation_time: float, simulation_timestep: float
+    ) -> SceneTimings | None:
+        """Get the measured timings, up to now.
+
+        :param simulation_time: The simulated time. In seconds.
+        :type simulation_time: float
+        :param simulation_timestep: The duration of a single physics
+            step. In seconds.
+        :type simulation_timestep: float
+        :returns: The timings, or None if the timer is disabled.
+        :rtype: SceneTimings | None
+        """
+        if not self._enabled:
+            return None
+        return SceneTimings(
+            total=time.perf_counter() - self._start,
+            model_build=self._totals[TimedPhase.MODEL_BUILD],
+            data_allocation=self._totals[TimedPhase.DATA_ALLOCATION],
+            physics=self._totals[TimedPhase.PHYSICS],
+            control=self._totals[TimedPhase.CONTROL],
+            sampling=self._totals[TimedPhase.SAMPLING],
+            camera_rendering=self._totals[TimedPhase.CAMERA_RENDERING],
+            video=self._totals[TimedPhase.VIDEO],
+            num_steps=round(simulation_time / simulation_timestep),
+            simulation_time=simulation_time,
+        )
+
+
+class _Measurement(AbstractContextManager[None]):
+    """Adds the time spent inside it to a phase of a timer."""
+
+    __slots__ = ("_timer", "_phase", "_start")
+
+    _timer: SceneTimer
+    _phase: TimedPhase
+    _start: float
+
+    def __init__(self, timer: SceneTimer, phase: TimedPhase) -> None:
+        """Initialize this object.
+
+        :param timer: The timer to add to.
+        :param phase: The phase to add to.
+        """
+        self._timer = timer
+        self._phase = phase
+
+    def __enter__(self) -> None:
+        """Start measuring."""
+        self._timer._inner.append(0.0)
+        self._start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop measuring.
+
+        :param exc_type: The type of the raised exception, if any.
+        :param exc_value: The raised exception, if any.
+        :param traceback: The traceback of the raised exception, if any.
+        """
+        elapsed = time.perf_counter() - self._start
+        inner = self._timer._inner.pop()
+        self._timer._totals[self._phase] += elapsed - inner
+        if self._timer._inner:
+            self._timer._inner[-1] += elapsed
+
+
+_NOT_MEASURED = contextlib.nullcontext()
@@ -1,10 +1,11 @@
 import logging
 import os
 import tempfile
-from itertools import product
 from typing import Any
 
 import mujoco
+import numpy as np
+import numpy.typing as npt
 
 # TODO(jmdm): necessary? -> logging.basicConfig(level=logging.DEBUG)
 from dm_control import mjcf
@@ -464,24 +465,33 @@ def _set_heightmap_values(
 ) -> None:
     """Set the values for the heightmaps.
 
+    The heightmaps must be in the order their height fields were added to
+    the model.
+
     :param heightmaps: The heightmaps.
     :type heightmaps: list[GeometryHeightmap]
     :param model: The mujoco model.
-    :rtype: None
     :type model: mujoco.MjModel
     :rtype: None
 
     """
-    heightmap_offset = 0
-
-    for heightmap in heightmaps:
-        for x, y in product(
-            range(len(heightmap.heights)), range(len(heightmap.heights[0]))
-        ):
-            model.hfield_data[y * len(heightmap.heights) + x] = (
-                heightmap.heights[x][y]
-            )
-        heightmap_offset += len(heightmap.heights) * len(heightmap.heights[0])
+    for hfield_id, heightmap in enumerate(heightmaps):
+        values = _heightfield_values(heightmap)
+        start = model.hfield_adr[hfield_id]
+        model.hfield_data[start : start + len(values)] = values
+
+
+def _heightfield_values(
+    heightmap: GeometryHeightmap,
+) -> npt.NDArray[np.float32]:
+    """Get the heights of a heightmap in the layout of its height field.
+
+    :param heightmap: The heightmap.
+    :type heightmap: GeometryHeightmap
+    :returns: The heights, with the y index varying slowest.
+    :rtype: npt.NDArray[np.float32]
+    """
+    return np.asarray(heightmap.heights, dtype=np.float32).T.ravel()
 
 
 def _create_sensor_maps(
@@ -0,0 +1,606 @@
+import uuid
+
+import mujoco
+from pyrr import Quaternion
+from revolve2.simulation.scene import (
+    JointHinge,
+    MultiBodySystem,
+    Pose,
+    RigidBody,
+    Scene,
+    UUIDKey,
+)
+from revolve2.simulation.scene.geometry import (
+    Geometry,
+    GeometryBox,
+    GeometryHeightmap,
+    GeometryPlane,
+    GeometrySphere,
+)
+from revolve2.simulation.scene.sensors import CameraSensor, IMUSensor
+
+from ._abstraction_to_mujoco_mapping import (
+    AbstractionToMujocoMapping,
+    CameraSensorMujoco,
+    IMUSensorMujoco,
+    JointHingeMujoco,
+    MultiBodySystemMujoco,
+)
+from ._scene_to_model import _set_heightmap_values
+
+
+def spec_compiler_available() -> bool:
+    """Check if the installed MuJoCo can build models through `MjSpec`.
+
+    :returns: Whether `scene_to_model_spec` can be used.
+    :rtype: bool
+    """
+    return hasattr(mujoco, "MjSpec")
+
+
+def scene_to_model_spec(
+    scene: Scene,
+    simulation_timestep: float,
+    integrator: str,
+    *,
+    cast_shadows: bool,
+    fast_sim: bool,
+) -> tuple[mujoco.MjModel, AbstractionToMujocoMapping]:
+    """Convert a scene to a MuJoCo model, directly through `MjSpec`.
+
+    Builds the same model as `scene_to_model`, but without the detour
+    through URDF, temporary files and dm_control. Values are not rounded
+    by an intermediate XML, so results can differ from `scene_to_model`
+    in the last digits.
+
+    :param scene: The scene to convert.
+    :type scene: Scene
+    :param simulation_timestep: The duration to integrate over during
+        each step of the simulation. In seconds.
+    :type simulation_timestep: float
+    :param integrator: The integrator to use.
+    :type integrator: str
+    :param *:
+    :param cast_shadows: Whether shadows are cast by the light.
+    :type cast_shadows: bool
+    :param fast_sim: If simulations have to be fast, unnecessary stuff
+        will be turned off.
+    :type fast_sim: bool
+    :returns: The created MuJoCo model and mapping from the simulation
+        abstraction to the model.
+    :rtype: tuple[mujoco.MjModel,AbstractionToMujocoMapping]
+    """
+    return _SpecBuilder(cast_shadows=cast_shadows, fast_sim=fast_sim).build(
+        scene, simulation_timestep, integrator
+    )
+
+
+class _SpecBuilder:
+    """Builds a model the same way the URDF conversion and dm_control do.
+
+    Names follow `scene_to_model`, so models from both can be used
+    interchangeably. Poses that `scene_to_model` passes to MuJoCo
+    without going through URDF keep their quaternion components in the
+    order pyrr stores them, so both build the same model.
+    """
+
+    _cast_shadows: bool
+    _fast_sim: bool
+    _spec: mujoco.MjSpec
+    _multi_body_system: MultiBodySystem
+    _prefix: str
+    _visited_rigid_bodies: set[uuid.UUID]
+    _joints_and_names: list[tuple[JointHinge, str, str]]
+    _imus_and_names: list[tuple[IMUSensor, str, str]]
+    _cameras_and_names: list[tuple[CameraSensor, str]]
+    _planes: list[GeometryPlane]
+    _heightmaps: list[GeometryHeightmap]
+
+    def __init__(self, *, cast_shadows: bool, fast_sim: bool) -> None:
+        """Initialize this object.
+
+        :param cast_shadows: Whether shadows are cast by the light.
+        :param fast_sim: If fancy rendering is disabled.
+        """
+        self._cast_shadows = cast_shadows
+        self._fast_sim = fast_sim
+
+    def build(
+        self, scene: Scene, simulation_timestep: float, integrator: str
+    ) -> tuple[mujoco.MjModel, AbstractionToMujocoMapping]:
+        """:param scene:
+        :type scene: Scene
+        :param simulation_timestep:
+        :type simulation_timestep: float
+        :param integrator:
+        :type integrator: str
+        :rtype: tuple[mujoco.MjModel, AbstractionToMujocoMapping]
+        """
+        self._spec = mujoco.MjSpec()
+        self._spec.modelname = "scene"
+        self._spec.compiler.degree = False
+        self._spec.option.timestep = simulation_timestep
+        self._spec.option.integrator = _integrator(integrator)
+        self._spec.option.gravity = [0, 0, -9.81]
+        self._spec.visual.headlight.active = 0
+        light = self._spec.worldbody.add_light(
+            pos=[0, 0, 100],
+            ambient=[0.5, 0.5, 0.5],
+            castshadow=self._cast_shadows,
+        )
+        light.type = mujoco.mjtLightType.mjLIGHT_DIRECTIONAL
+
+        self._joints_and_names = []
+        self._imus_and_names = []
+        self._cameras_and_names = []
+        self._heightmaps = []
+        for mbs_i, multi_body_system in enumerate(scene.multi_body_systems):
+            self._add_multi_body_system(multi_body_system, mbs_i)
+
+        model = self._spec.compile()
+        _set_heightmap_values(self._heightmaps, model)
+
+        mapping = AbstractionToMujocoMapping()
+        for joint, name, prefix in self._joints_and_names:
+            mapping.hinge_joint[UUIDKey(joint)] = JointHingeMujoco(
+                id=model.joint(f"{prefix}{name}").id,
+                ctrl_index_position=model.actuator(
+                    f"{prefix}actuator_position_{name}"
+                ).id,
+                ctrl_index_velocity=model.actuator(
+                    f"{prefix}actuator_velocity_{name}"
+                ).id,
+            )
+        for mbs_i, multi_body_system in enumerate(scene.multi_body_systems):
+            mapping.multi_body_system[UUIDKey(multi_body_system)] = (
+                MultiBodySystemMujoco(id=model.body(f"mbs{mbs_i}/").id)
+            )
+        for imu, gyro_name, accelerometer_name in self._imus_and_names:
+            mapping.imu_sensor[UUIDKey(imu)] = IMUSensorMujoco(
+                gyro_id=model.sensor(gyro_name).id,
+                accelerometer_id=model.sensor(accelerometer_name).id,
+            )
+        for camera, camera_name in self._cameras_and_names:
+            mapping.camera_sensor[UUIDKey(camera)] = CameraSensorMujoco(
+                camera_id=model.camera(camera_name).id,
+                camera_size=camera.camera_size,
+            )
+        return model, mapping
+
+    def _add_multi_body_system(
+        self, multi_body_system: MultiBodySystem, mbs_i: int
+    ) -> None:
+        """:param multi_body_system:
+        :type multi_body_system: MultiBodySystem
+        :param mbs_i:
+        :type mbs_i: int
+        :raises ValueError: If the multi-body system has no root.
+        """
+        if not multi_body_system.has_root():
+            msg = "Multi-body system has no root."
+            raise ValueError(msg)
+
+        self._multi_body_system = multi_body_system
+        self._prefix = f"mbs{mbs_i}/"
+        self._visited_rigid_bodies = set()
+        self._planes = []
+        first_joint = len(self._joints_and_names)
+        first_heightmap = len(self._heightmaps)
+
+        body = self._spec.worldbody.add_body(
+            name=self._prefix,
+            pos=[*multi_body_system.pose.position],
+            quat=[*multi_body_system.pose.orientation],
+        )
+        if not multi_body_system.is_static:
+            body.add_freejoint(name=self._prefix)
+
+        # The URDF root link is fused into the world of its own model, which
+        # drops its inertial. The attached body then gets its inertia from
+        # its geometries, so the root inertial is not set here either.
+        self._add_rigid_body(
+            body=body,
+            rigid_body=multi_body_system.root,
+            link_pose=multi_body_system.root.initial_pose,
+            rigid_body_name=f"mbs{mbs_i}",
+            parent_rigid_body=None,
+        )
+
+        for joint, name, prefix in self._joints_and_names[first_joint:]:
+            self._spec.add_actuator(
+                name=f"{prefix}actuator_position_{name}",
+                target=f"{prefix}{name}",
+                trntype=mujoco.mjtTrn.mjTRN_JOINT,
+                biastype=mujoco.mjtBias.mjBIAS_AFFINE,
+                gainprm=[joint.pid_gain_p] + [0.0] * 9,
+                biasprm=[0.0, -joint.pid_gain_p] + [0.0] * 8,
+            )
+            self._spec.add_actuator(
+                name=f"{prefix}actuator_velocity_{name}",
+                target=f"{prefix}{name}",
+                trntype=mujoco.mjtTrn.mjTRN_JOINT,
+                biastype=mujoco.mjtBias.mjBIAS_AFFINE,
+                gainprm=[joint.pid_gain_d] + [0.0] * 9,
+                biasprm=[0.0, 0.0, -joint.pid_gain_d] + [0.0] * 7,
+            )
+
+        self._add_planes()
+        self._add_heightmaps(first=first_heightmap)
+
+    def _add_rigid_body(
+        self,
+        body: mujoco.MjsBody,
+        rigid_body: RigidBody,
+        link_pose: Pose,
+        rigid_body_name: str,
+        parent_rigid_body: RigidBody | None,
+    ) -> None:
+        """:param body:
+        :type body: mujoco.MjsBody
+        :param rigid_body:
+        :type rigid_body: RigidBody
+        :param link_pose:
+        :type link_pose: Pose
+        :param rigid_body_name:
+        :type rigid_body_name: str
+        :param parent_rigid_body:
+        :type parent_rigid_body: RigidBody | None
+        :raises ValueError: If the multi-body system is cyclic or contains
+            unsupported geometries.
+        :raises TypeError: If a joint is not a hinge joint.
+        """
+        if rigid_body.uuid in self._visited_rigid_bodies:
+            msg = "Multi-body system is cyclic."
+            raise ValueError(msg)
+        self._visited_rigid_bodies.add(rigid_body.uuid)
+
+        to_link = link_pose.orientation.inverse
+        if parent_rigid_body is not None and rigid_body.mass() != 0.0:
+            inertia = rigid_body.inertia_tensor()
+            body.mass = rigid_body.mass()
+            body.ipos = [
+                *(
+                    to_link
+                    * (
+                        rigid_body.initial_pose.position
+                        - link_pose.position
+                        + rigid_body.initial_pose.orientation
+                        * rigid_body.center_of_mass()
+                    )
+                )
+            ]
+            body.iquat = _wxyz(to_link * rigid_body.initial_pose.orientation)
+            body.fullinertia = [
+                inertia[0][0],
+                inertia[1][1],
+                inertia[2][2],
+                inertia[0][1],
+                inertia[0][2],
+                inertia[1][2],
+            ]
+            body.explicitinertial = True
+
+        for geometry_index, geometry in enumerate(rigid_body.geometries):
+            name = f"{rigid_body_name}_geom{geometry_index}"
+            match geometry:
+                case GeometryBox():
+                    self._add_geometry(
+                        body,
+                        name,
+                        geometry,
+                        mujoco.mjtGeom.mjGEOM_BOX,
+                        [*(geometry.aabb.size / 2.0)],
+                        link_pose,
+                        rigid_body,
+                    )
+                case GeometrySphere():
+                    self._add_geometry(
+                        body,
+                        name,
+                        geometry,
+                        mujoco.mjtGeom.mjGEOM_SPHERE,
+                        [geometry.radius, 0.0, 0.0],
+                        link_pose,
+                        rigid_body,
+                    )
+                case GeometryPlane():
+                    self._check_terrain_geometry("Plane", parent_rigid_body)
+                    self._planes.append(geometry)
+                case GeometryHeightmap():
+                    self._check_terrain_geometry(
+                        "Heightmap", parent_rigid_body
+                    )
+                    self._heightmaps.append(geometry)
+                case _:
+                    msg = "Geometry not yet supported."
+                    raise ValueError(msg)
+
+        self._add_sensors(body, rigid_body, rigid_body_name)
+
+        for joint_index, joint in enumerate(
+            self._multi_body_system.get_joints_for_rigid_body(rigid_body)
+        ):
+            # Make sure we don't go back up the joint we came from.
+            if parent_rigid_body is not None and (
+                parent_rigid_body.uuid
+                in {joint.rigid_body1.uuid, joint.rigid_body2.uuid}
+            ):
+                continue
+
+            if not isinstance(joint, JointHinge):
+                msg = "Joints other that hinge joints are not yet supported."
+                raise TypeError(msg)
+
+            child_name = f"{rigid_body_name}_link{joint_index}"
+            joint_name = f"{rigid_body_name}_joint{joint_index}"
+            self._joints_and_names.append((joint, joint_name, self._prefix))
+
+            child = body.add_body(
+                name=f"{self._prefix}{child_name}",
+                pos=[*(to_link * (joint.pose.position - link_pose.position))],
+                quat=_wxyz(to_link * joint.pose.orientation),
+            )
+            child.add_joint(
+                name=f"{self._prefix}{joint_name}",
+                type=mujoco.mjtJoint.mjJNT_HINGE,
+                axis=[0.0, 1.0, 0.0],
+                range=[-joint.range, joint.range],
+                limited=mujoco.mjtLimited.mjLIMITED_TRUE,
+                actfrcrange=[-joint.effort, joint.effort],
+                actfrclimited=mujoco.mjtLimited.mjLIMITED_TRUE,
+                armature=joint.armature,
+            )
+            self._add_rigid_body(
+                body=child,
+                rigid_body=joint.rigid_body2,
+                link_pose=joint.pose,
+                rigid_body_name=child_name,
+                parent_rigid_body=rigid_body,
+            )
+
+    def _check_terrain_geometry(
+        self, kind: str, parent_rigid_body: RigidBody | None
+    ) -> None:
+        """:param kind:
+        :type kind: str
+        :param parent_rigid_body:
+        :type parent_rigid_body: RigidBody | None
+        :raises ValueError: If the geometry is not part of the root of a
+            static multi-body system.
+        """
+        if parent_rigid_body is not None:
+            msg = (
+                f"{kind} geometry can only be included in the root rigid body."
+            )
+            raise ValueError(msg)
+        if not self._multi_body_system.is_static:
+            msg = f"{kind} geometry can only be included in static multi-body systems."
+            raise ValueError(msg)
+
+    def _add_geometry(
+        self,
+        body: mujoco.MjsBody,
+        name: str,
+        geometry: Geometry,
+        geom_type: mujoco.mjtGeom,
+        size: list[float],
+        link_pose: Pose,
+        rigid_body: RigidBody,
+    ) -> None:
+        """:param body:
+        :type body: mujoco.MjsBody
+        :param name:
+        :type name: str
+        :param geometry:
+        :type geometry: Geometry
+        :param geom_type:
+        :type geom_type: mujoco.mjtGeom
+        :param size:
+        :type size: list[float]
+        :param link_pose:
+        :type link_pose: Pose
+        :param rigid_body:
+        :type rigid_body: RigidBody
+        """
+        to_link = link_pose.orientation.inverse
+        geom = body.add_geom(
+            name=f"{self._prefix}{name}",
+            type=geom_type,
+            size=size,
+            pos=[
+                *(
+                    to_link
+                    * (
+                        rigid_body.initial_pose.position
+                        - link_pose.position
+                        + rigid_body.initial_pose.orientation
+                        * geometry.pose.position
+                    )
+                )
+            ],
+            quat=_wxyz(
+                to_link
+                * rigid_body.initial_pose.orientation
+                * geometry.pose.orientation
+            ),
+        )
+        if self._fast_sim:
+            geom.rgba = (
+                geometry.texture.primary_color.to_normalized_rgba_list()
+            )
+        else:
+            material = f"{self._prefix}geom_{name}"
+            self._make_material(material, geometry)
+            geom.material = f"{material}_material"
+
+    def _add_sensors(
+        self, body: mujoco.MjsBody, rigid_body: RigidBody, name: str
+    ) -> None:
+        """:param body:
+        :type body: mujoco.MjsBody
+        :param rigid_body:
+        :type rigid_body: RigidBody
+        :param name:
+        :type name: str
+        """
+        for imu_i, imu in enumerate(rigid_body.sensors.imu_sensors):
+            site_name = f"{self._prefix}{name}_site_imu_{imu_i}"
+            body.add_site(
+                name=site_name,
+                pos=[*imu.pose.position],
+                quat=[*imu.pose.orientation],
+            )
+            gyro_name = f"{self._prefix}imu_gyro_{name}_{imu_i}"
+            self._spec.add_sensor(
+                name=gyro_name,
+                type=mujoco.mjtSensor.mjSENS_GYRO,
+                objtype=mujoco.mjtObj.mjOBJ_SITE,
+                objname=site_name,
+            )
+            accelerometer_name = (
+                f"{self._prefix}imu_accelerometer_{name}_{imu_i}"
+            )
+            self._spec.add_sensor(
+                name=accelerometer_name,
+                type=mujoco.mjtSensor.mjSENS_ACCELEROMETER,
+                objtype=mujoco.mjtObj.mjOBJ_SITE,
+                objname=site_name,
+            )
+            self._imus_and_names.append((imu, gyro_name, accelerometer_name))
+
+        # Cameras are placed in the world, like `scene_to_model` does.
+        for camera_i, camera in enumerate(rigid_body.sensors.camera_sensors):
+            camera_name = f"camera_{name}_{camera_i + 1}"
+            camera_spec = self._spec.worldbody.add_camera(
+                name=camera_name,
+                mode=mujoco.mjtCamLight.mjCAMLIGHT_FIXED,
+            )
+            camera_spec.alt.type = mujoco.mjtOrientation.mjORIENTATION_XYAXES
+            camera_spec.alt.xyaxes = [0, -1, 0, 0, 0, 1]
+            self._spec.worldbody.add_site(
+                name=f"{name}_site_camera_{camera_i + 1}",
+                pos=[*camera.pose.position],
+                quat=[*camera.pose.orientation],
+            )
+            self._cameras_and_names.append((camera, camera_name))
+
+    def _add_planes(self) -> None:
+        """Add the planes of the current multi-body system to the world."""
+        for i_plane, plane in enumerate(self._planes):
+            geom = self._spec.worldbody.add_geom(
+                type=mujoco.mjtGeom.mjGEOM_PLANE,
+                pos=[*plane.pose.position],
+                quat=[*plane.pose.orientation],
+                size=[plane.size.x / 2.0, plane.size.y / 2.0, 1.0],
+            )
+            name = f"heightmap_{i_plane}"
+            if self._fast_sim:
+                geom.rgba = (
+                    plane.texture.primary_color.to_normalized_rgba_list()
+                )
+            else:
+                self._make_material(name, plane)
+                geom.material = f"{name}_material"
+
+    def _add_heightmaps(self, first: int) -> None:
+        """Add the heightmaps of the current multi-body system to the world.
+
+        :param first: Index of the first heightmap of the current
+            multi-body system.
+        :type first: int
+        """
+        for i_heightmap, heightmap in enumerate(self._heightmaps[first:]):
+            self._spec.add_hfield(
+                name=f"hfield_{i_heightmap}",
+                nrow=len(heightmap.heights),
+                ncol=len(heightmap.heights[0]),
+                size=[*heightmap.size, heightmap.base_thickness],
+                # The heights are filled in after compilation.
+                userdata=[0.0] * heightmap.heights.size,
+            )
+            name = f"heightmap_{i_heightmap}"
+            geom = self._spec.worldbody.add_geom(
+                type=mujoco.mjtGeom.mjGEOM_HFIELD,
+                hfieldname=f"hfield_{i_heightmap}",
+                pos=[*heightmap.pose.position],
+                quat=[*heightmap.pose.orientation],
+            )
+            if self._fast_sim:
+                geom.rgba = (
+                    heightmap.texture.primary_color.to_normalized_rgba_list()
+                )
+            else:
+                self._make_material(name, heightmap)
+                geom.material = f"{name}_material"
+
+    def _make_material(self, name: str, element: Geometry) -> None:
+        """:param name:
+        :type name: str
+        :param element:
+        :type element: Geometry
+        """
+        texture = element.texture
+        material = self._spec.add_material(
+            name=f"{name}_material",
+            rgba=texture.base_color.to_normalized_rgba_list(),
+            texrepeat=[*texture.repeat],
+            emission=texture.emission,
+            specular=texture.specular,
+            shininess=texture.shininess,
+            reflectance=texture.reflectance,
+        )
+        if texture.reference is None:
+            return
+
+        width, height = texture.size
+        texture_spec = self._spec.add_texture(
+            name=f"{name}_texture",
+            type=mujoco.mjtTexture.__members__[
+                f"mjTEXTURE_{texture.map_type.value.upper()}"
+            ],
+            width=width,
+            height=height,
+            rgb1=texture.primary_color.to_normalized_rgb_list(),
+            rgb2=texture.secondary_color.to_normalized_rgb_list(),
+        )
+        reference = texture.reference
+        if reference.builtin is not None:
+            texture_spec.builtin = mujoco.mjtBuiltin.__members__[
+                f"mjBUILTIN_{reference.builtin.upper()}"
+            ]
+        if reference.file is not None:
+            texture_spec.file = reference.file
+        if reference.content_type is not None:
+            texture_spec.content_type = reference.content_type
+        if reference.gridlayout is not None:
+            texture_spec.gridlayout = reference.gridlayout
+        material.textures[mujoco.mjtTextureRole.mjTEXROLE_RGB] = (
+            f"{name}_texture"
+        )
+
+
+def _integrator(integrator: str) -> mujoco.mjtIntegrator:
+    """Get the MuJoCo integrator for its name in MJCF.
+
+    :param integrator: The name, as used in MJCF.
+    :type integrator: str
+    :returns: The integrator.
+    :rtype: mujoco.mjtIntegrator
+    :raises ValueError: If the integrator is unknown.
+    """
+    member = f"mjINT_{integrator.upper()}"
+    if member not in mujoco.mjtIntegrator.__members__:
+        msg = f"Unknown integrator: {integrator}."
+        raise ValueError(msg)
+    return mujoco.mjtIntegrator.__members__[member]
+
+
+def _wxyz(quaternion: Quaternion) -> list[float]:
+    """Get a quaternion in the component order MuJoCo uses.
+
+    :param quaternion: The quaternion.
+    :type quaternion: Quaternion
+    :returns: The w, x, y and z components.
+    :rtype: list[float]
+    """
+    return [quaternion.w, quaternion.x, quaternion.y, quaternion.z]
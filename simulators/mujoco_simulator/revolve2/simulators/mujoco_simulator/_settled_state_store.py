@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+
+
+class SettledStateStore:
+    """Remembers warmed-up states, in memory and optionally on disk.
+
+    States are keyed by the structure of the scene, which covers the
+    bodies of the robots, where they are placed and the terrain, together
+    with the physics options, the compiler and the warm-up time. A body
+    that comes back later in an evolutionary run, or in another run, then
+    starts from its settled state without simulating the warm-up again.
+
+    In memory, only the most recently used states are kept. On disk,
+    each state is a separate file, so worker processes and machines
+    sharing the directory can fill it concurrently. States are only
+    reused with the MuJoCo version that produced them.
+    """
+
+    _directory: Path | None
+    _max_size: int
+    _states: OrderedDict[str, npt.NDArray[np.float64]]
+
+    def __init__(
+        self, directory: str | Path | None = None, max_size: int = 1024
+    ) -> None:
+        """Initialize this object.
+
+        :param directory: The directory to keep the states in. It is
+            created if it does not exist. If None, states are only kept in
+            memory.
+        :param max_size: The maximum number of states kept in memory.
+        :raises ValueError: If the maximum size is negative.
+        """
+        if max_size < 0:
+            msg = "Settled state store size cannot be negative."
+            raise ValueError(msg)
+
+        self._directory = None if directory is None else Path(directory)
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._states = OrderedDict()
+
+    @property
+    def directory(self) -> Path | None:
+        """Get the directory the states are kept in.
+
+        :returns: The directory, or None if states are only kept in
+            memory.
+        :rtype: Path | None
+        """
+        return self._directory
+
+    @staticmethod
+    def key(
+        structure_key: str,
+        simulation_timestep: float,
+        integrator: str,
+        warm_up_time: float,
+        *,
+        compiler: str,
+    ) -> str:
+        """Get the key of a warmed-up state.
+
+        :param structure_key: The key of the structure of the scene.
+        :type structure_key: str
+        :param simulation_timestep: The duration of a physics step. In
+            seconds.
+        :type simulation_timestep: float
+        :param integrator: The integrator used.
+        :type integrator: str
+        :param warm_up_time: How long the scene was warmed up. In seconds.
+        :type warm_up_time: float
+        :param compiler: The name of the function that compiled the
+            model. Compilers do not produce exactly the same model.
+        :type compiler: str
+        :returns: The key.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        for part in (
+            mujoco.__version__,
+            structure_key,
+            repr(float(simulation_timestep)),
+            integrator,
+            repr(float(warm_up_time)),
+            compiler,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> npt.NDArray[np.float64] | None:
+        """Get a warmed-up state.
+
+        :param key: The key of the state, see `key`.
+        :type key: str
+        :returns: The state, or None if it is not known.
+        :rtype: npt.NDArray[np.float64] | None
+        """
+        state = self._states.get(key)
+        if state is not None:
+            self._states.move_to_end(key)
+            return state
+        if self._directory is None:
+            return None
+
+        try:
+            loaded: npt.NDArray[np.float64] = np.load(self._path(key))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logging.warning(
+                f"Ignoring unreadable settled state {key}: {error}"
+            )
+            return None
+        self._remember(key, loaded)
+        return loaded
+
+    def put(self, key: str, state: npt.NDArray[np.float64]) -> None:
+        """Remember a warmed-up state.
+
+        :param key: The key of the state, see `key`.
+        :type key: str
+        :param state: The state.
+        :type state: npt.NDArray[np.float64]
+        """
+        self._remember(key, state)
+        if self._directory is None:
+            return
+
+        # Write to a temporary file first, so readers never see a partial
+        # state.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self._directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                np.save(file, state)
+            os.replace(temporary, self._path(key))
+        except OSError as error:
+            logging.warning(f"Cannot store settled state {key}: {error}")
+            Path(temporary).unlink(missing_ok=True)
+
+    def _remember(self, key: str, state: npt.NDArray[np.float64]) -> None:
+        """Keep a state in memory, forgetting the least recently used one.
+
+        :param key: The key of the state.
+        :param state: The state.
+        """
+        self._states[key] = state
+        self._states.move_to_end(key)
+        if len(self._states) > self._max_size:
+            self._states.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        """Get the file of a state.
+
+        :param key: The key of the state.
+        :returns: The path of the file.
+        """
+        assert self._directory is not None
+        return self._directory / f"{key}.npy"
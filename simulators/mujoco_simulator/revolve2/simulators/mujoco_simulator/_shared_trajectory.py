@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from revolve2.simulation.simulator import PhysicsDiagnostics, SceneTimings
+
+from ._scene_structure import DetachedMapping
+
+
+@dataclass(kw_only=True)
+class SharedTrajectory:
+    """A small description of a trajectory stored in shared memory.
+
+    Worker processes send this back instead of the trajectory itself, so
+    only a file name and a few indices are pickled. The mapping is
+    detached, so it does not reference the scene objects of the worker.
+    """
+
+    path: str | None
+    """The memory-mapped file with the samples, or None if there are none."""
+
+    shapes: list[tuple[int, ...]]
+    """The shapes of the sample arrays, in the order they are stored."""
+
+    mapping: DetachedMapping
+
+    camera_views: list[dict[int, npt.NDArray[np.uint8]]]
+    diverged: npt.NDArray[np.bool_]
+    end_time: float
+    termination_reason: str | None
+    timings: SceneTimings | None
+    physics: PhysicsDiagnostics | None
+
+    def unlink(self) -> None:
+        """Free the shared memory of the samples, if it is not freed yet.
+
+        Views of the samples that are already mapped stay valid.
+        """
+        if self.path is not None:
+            Path(self.path).unlink(missing_ok=True)
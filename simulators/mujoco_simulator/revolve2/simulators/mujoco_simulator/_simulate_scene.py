@@ -5,18 +5,25 @@ import cv2
 import mujoco
 import numpy as np
 import numpy.typing as npt
-from revolve2.simulation.scene import Scene, SimulationState
-from revolve2.simulation.simulator import RecordSettings
+from revolve2.simulation.scene import Scene
+from revolve2.simulation.scene.termination import TerminationCondition
+from revolve2.simulation.simulator import RecordSettings, RecordingSpec
 
+from ._camera_views import CameraViews
 from ._control_interface_impl import (
     ControlInterfaceImpl,
 )
-from ._open_gl_vision import OpenGLVision
+from ._model_cache import ModelCache
+from ._physics_monitor import PhysicsMonitor
 from ._render_backend import RenderBackend
-from ._scene_to_model import scene_to_model
+from ._scene_timer import SceneTimer, TimedPhase
 from ._simulation_state_impl import (
     SimulationStateImpl,
 )
+from ._steps_until import steps_until
+from ._termination_monitor import TerminationMonitor
+from ._trajectory import Trajectory
+from ._video_encoder import VideoEncoder
 from .viewers import (
     CustomMujocoViewer,
     NativeMujocoViewer,
@@ -30,17 +37,24 @@ def simulate_scene(
     scene: Scene,
     record_settings: RecordSettings | None,
     control_step: float,
+    camera_step: float,
     sample_step: float | None,
     simulation_time: int | None,
     simulation_timestep: float,
     integrator: str,
+    recording_spec: RecordingSpec,
+    termination_conditions: list[TerminationCondition],
     render_backend: RenderBackend = RenderBackend.GLFW,
     *,
+    model_cache: ModelCache,
     headless: bool,
     start_paused: bool,
     cast_shadows: bool,
     fast_sim: bool,
-) -> list[SimulationState]:
+    collect_timings: bool = False,
+    collect_physics_diagnostics: bool = False,
+    warm_up_time: float | None = None,
+) -> Trajectory:
     """Simulate a scene.
 
     :param viewer_type: The type of viewer used for the rendering in a
@@ -57,6 +71,10 @@ def simulate_scene(
     :param control_step: The time between each call to the handle
         function of the scene handler. In seconds.
     :type control_step: float
+    :param camera_step: The minimum time between two renders of a
+        camera sensor. Cameras are only rendered when their image is
+        requested. In seconds.
+    :type camera_step: float
     :param sample_step: The time between each state sample of the
         simulation. In seconds.
     :type sample_step: float | None
@@ -65,10 +83,19 @@ def simulate_scene(
     :param simulation_timestep: The duration to integrate over during
         each step of the simulation. In seconds.
     :type simulation_timestep: float
+    :param integrator: The integrator to use.
+    :type integrator: str
+    :param recording_spec: Which parts of the state to sample.
+    :type recording_spec: RecordingSpec
+    :param termination_conditions: Conditions under which to stop
+        early, in addition to those of the scene.
+    :type termination_conditions: list[TerminationCondition]
     :param render_backend: The backend to be used for rendering (EGL by
         default and switches to GLFW if no cameras are on the robot).
     :type render_backend: RenderBackend
     :param *:
+    :param model_cache: The cache to get the compiled model from.
+    :type model_cache: ModelCache
     :param headless: If False, a viewer will be opened that allows a
         user to manually view and manually interact with the simulation.
     :type headless: bool
@@ -79,45 +106,63 @@ def simulate_scene(
     :type cast_shadows: bool
     :param fast_sim: If fancy rendering is disabled.
     :type fast_sim: bool
-    :returns: The results of simulation. The number of returned states
-        depends on `sample_step`.
-    :rtype: list[SimulationState]
+    :param collect_timings: Whether to measure where the wall-clock time
+        goes.
+    :type collect_timings: bool
+    :param collect_physics_diagnostics: Whether to observe the energy
+        and penetrations.
+    :type collect_physics_diagnostics: bool
+    :param warm_up_time: If not None, how long to simulate the scene
+        without control first. The scene then starts from the resulting
+        state, at time zero. In seconds.
+    :type warm_up_time: float | None
+    :returns: The results of simulation. The number of samples depends
+        on `sample_step`.
+    :rtype: Trajectory
     :raises ValueError: If the viewer is not able to record.
 
     """
     logging.debug("Simulating scene %d", scene_id)
+    timer = SceneTimer(enabled=collect_timings)
+    physics_monitor = PhysicsMonitor(enabled=collect_physics_diagnostics)
     """Define mujoco data and model objects for simulating."""
-    model, mapping = scene_to_model(
-        scene=scene,
-        simulation_timestep=simulation_timestep,
-        integrator=integrator,
-        cast_shadows=cast_shadows,
-        fast_sim=fast_sim,
-    )
-    data = mujoco.MjData(model)
+    with timer.measure(TimedPhase.MODEL_BUILD):
+        model, mapping, data = model_cache.get(
+            scene=scene,
+            simulation_timestep=simulation_timestep,
+            integrator=integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+            timer=timer,
+            warm_up_time=warm_up_time,
+        )
     """Define a control interface for the mujoco simulation (used to control
     robots)."""
     control_interface = ControlInterfaceImpl(
         data=data, abstraction_to_mujoco_mapping=mapping
     )
     """Make separate viewer for camera sensors."""
-    camera_viewers: dict[int, OpenGLVision] = {
-        camera.camera_id: OpenGLVision(
-            model=model,
-            camera=camera,
-            headless=headless,
-            open_gl_lib=render_backend,
-        )
-        for camera in mapping.camera_sensor.values()
-    }
+    camera_views = CameraViews(
+        model=model,
+        data=data,
+        cameras=list(mapping.camera_sensor.values()),
+        camera_step=camera_step,
+        render_backend=render_backend,
+        headless=headless,
+        timer=timer,
+    )
     """Define some additional control variables."""
     last_control_time = 0.0
     last_sample_time = 0.0
     last_video_time = 0.0  # time at which last video frame was saved
 
-    simulation_states: list[
-        SimulationState
-    ] = []  # The measured states of the simulation
+    # The measured states of the simulation
+    trajectory = Trajectory(
+        model, mapping, simulation_time, sample_step, recording_spec
+    )
+    termination_monitor = TerminationMonitor(
+        scene.termination_conditions + termination_conditions
+    )
     """If we dont have cameras and the backend is not set we go to the default
     GLFW."""
     if len(mapping.camera_sensor.values()) == 0:
@@ -153,114 +198,139 @@ def simulate_scene(
         video_step = 1 / record_settings.fps
         video_file_path = f"{record_settings.video_directory}/{scene_id}.mp4"
         fourcc = cv2.VideoWriter.fourcc(*"mp4v")
+        video_width, video_height = viewer.current_viewport_size()
         video = cv2.VideoWriter(
             video_file_path,
             fourcc,
             record_settings.fps,
-            viewer.current_viewport_size(),
+            (video_width, video_height),
         )
 
-    """
-    Compute forward dynamics without actually stepping forward in time.
-    This updates the data so we can read out the initial state.
-    """
-    mujoco.mj_forward(model, data)
-    images = {
-        camera_id: camera_viewer.process(model, data)
-        for camera_id, camera_viewer in camera_viewers.items()
-    }
+        def write_frame(img: npt.NDArray[np.uint8]) -> None:
+            # Flip the image and map to OpenCV colormap (BGR -> RGB)
+            video.write(np.flipud(img)[:, :, ::-1])
 
-    # Sample initial state.
-    if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
+        video_encoder = VideoEncoder(
+            write_frame, frame_shape=(video_height, video_width, 3)
         )
 
-    """After rendering the initial state, we enter the rendering loop."""
-    while (time := data.time) < (
-        float("inf") if simulation_time is None else simulation_time
-    ):
-        # do control if it is time
-        if time >= last_control_time + control_step:
-            last_control_time = math.floor(time / control_step) * control_step
+    # The video is also closed if the simulation fails or the viewer is
+    # quit, so the encoder thread stops and the file is finalized.
+    try:
+        """
+        Compute forward dynamics without actually stepping forward in time.
+        This updates the data so we can read out the initial state.
+        """
+        with timer.measure(TimedPhase.PHYSICS):
+            mujoco.mj_forward(model, data)
+        physics_monitor.observe(model, data)
 
-            simulation_state = SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
-            scene.handler.handle(
-                simulation_state, control_interface, control_step
-            )
+        # Sample initial state.
+        if sample_step is not None:
+            with timer.measure(TimedPhase.SAMPLING):
+                trajectory.record(data, camera_views)
 
-        # sample state if it is time
-        if sample_step is not None and time >= last_sample_time + sample_step:
-            last_sample_time = int(time / sample_step) * sample_step
-            simulation_states.append(
-                SimulationStateImpl(
-                    data=data,
-                    abstraction_to_mujoco_mapping=mapping,
-                    camera_views=images,
+        """After rendering the initial state, we enter the rendering loop."""
+        end_time = float("inf") if simulation_time is None else simulation_time
+        while (time := data.time) < end_time:
+            # do control if it is time
+            if time >= last_control_time + control_step:
+                last_control_time = (
+                    math.floor(time / control_step) * control_step
                 )
-            )
 
-        # step simulation
-        mujoco.mj_step(model, data)
-        # extract images from camera sensors.
-        images = {
-            camera_id: camera_viewer.process(model, data)
-            for camera_id, camera_viewer in camera_viewers.items()
-        }
+                camera_views.update(time)
+                with timer.measure(TimedPhase.CONTROL):
+                    simulation_state = SimulationStateImpl(
+                        data=data,
+                        abstraction_to_mujoco_mapping=mapping,
+                        camera_views=camera_views,
+                    )
+                    reason = termination_monitor.check(simulation_state, time)
+                    if reason is not None:
+                        logging.debug(
+                            f"Scene {scene_id} stopped early: {reason}"
+                        )
+                        trajectory.termination_reason = reason
+                        break
+                    scene.handler.handle(
+                        simulation_state, control_interface, control_step
+                    )
 
-        # render if not headless. also render when recording and if it time for a new video frame.
-        if not headless or (
-            record_settings is not None and time >= last_video_time + video_step
-        ):
-            viewer_return = viewer.render()
-            if viewer_return == "QUIT":
-                logging.warning("Quitting viewer")
-                raise SystemExit(0)
+            # sample state if it is time
+            if (
+                sample_step is not None
+                and time >= last_sample_time + sample_step
+            ):
+                last_sample_time = int(time / sample_step) * sample_step
+                with timer.measure(TimedPhase.SAMPLING):
+                    trajectory.record(data, camera_views)
 
-        # capture video frame if it's time
-        if record_settings is not None and time >= last_video_time + video_step:
-            last_video_time = int(time / video_step) * video_step
+            # step simulation. a viewer shows every step, otherwise step at once
+            # until the next control, sample or video event.
+            if headless:
+                next_event = min(last_control_time + control_step, end_time)
+                if sample_step is not None:
+                    next_event = min(
+                        next_event, last_sample_time + sample_step
+                    )
+                if record_settings is not None:
+                    next_event = min(next_event, last_video_time + video_step)
+                nstep = steps_until(time, next_event, simulation_timestep)
+            else:
+                nstep = 1
+            with timer.measure(TimedPhase.PHYSICS):
+                mujoco.mj_step(model, data, nstep)
+            physics_monitor.observe(model, data)
 
-            # https://github.com/deepmind/mujoco/issues/285 (see also record.cc)
-            img: npt.NDArray[np.uint8] = np.empty(
-                (*viewer.current_viewport_size(), 3),
-                dtype=np.uint8,
-            )
+            # render if not headless. also render when recording and if it time for a new video frame.
+            if not headless or (
+                record_settings is not None
+                and time >= last_video_time + video_step
+            ):
+                with timer.measure(TimedPhase.VIDEO):
+                    viewer_return = viewer.render()
+                if viewer_return == "QUIT":
+                    logging.warning("Quitting viewer")
+                    raise SystemExit(0)
 
-            mujoco.mjr_readPixels(
-                rgb=img,
-                depth=None,
-                viewport=viewer.view_port,
-                con=viewer.context,
-            )
-            # Flip the image and map to OpenCV colormap (BGR -> RGB)
-            img = np.flipud(img)[:, :, ::-1]
-            video.write(img)
+            # capture video frame if it's time
+            if (
+                record_settings is not None
+                and time >= last_video_time + video_step
+            ):
+                last_video_time = int(time / video_step) * video_step
 
-    """Once simulation is done we close the potential viewer and release the potential video."""
-    if not headless or record_settings is not None:
-        viewer.close_viewer()
+                with timer.measure(TimedPhase.VIDEO):
+                    # https://github.com/deepmind/mujoco/issues/285 (see also record.cc)
+                    img = video_encoder.get_buffer()
+                    mujoco.mjr_readPixels(
+                        rgb=img,
+                        depth=None,
+                        viewport=viewer.view_port,
+                        con=viewer.context,
+                    )
+                    # Converting and writing happens in the encoder thread.
+                    video_encoder.write(img)
 
-    if record_settings is not None:
-        video.release()
+        """Once simulation is done we close the potential viewer and release the potential video."""
+        if not headless or record_settings is not None:
+            viewer.close_viewer()
+    finally:
+        if record_settings is not None:
+            with timer.measure(TimedPhase.VIDEO):
+                try:
+                    video_encoder.close()
+                finally:
+                    video.release()
 
     # Sample one final time.
     if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
-        )
+        with timer.measure(TimedPhase.SAMPLING):
+            trajectory.record(data, camera_views)
 
+    trajectory.end_time = data.time
+    trajectory.timings = timer.timings(data.time, simulation_timestep)
+    trajectory.physics = physics_monitor.diagnostics()
     logging.debug(f"Scene {scene_id} done.")
-    return simulation_states
+    return trajectory
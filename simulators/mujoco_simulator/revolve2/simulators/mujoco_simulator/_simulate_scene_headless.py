@@ -0,0 +1,186 @@
+import logging
+import math
+
+import mujoco
+from revolve2.simulation.scene import Scene
+from revolve2.simulation.scene.termination import TerminationCondition
+from revolve2.simulation.simulator import RecordingSpec
+
+from ._camera_views import CameraViews
+from ._control_interface_impl import ControlInterfaceImpl
+from ._model_cache import ModelCache
+from ._physics_monitor import PhysicsMonitor
+from ._render_backend import RenderBackend
+from ._scene_timer import SceneTimer, TimedPhase
+from ._simulation_state_impl import SimulationStateImpl
+from ._steps_until import steps_until
+from ._termination_monitor import TerminationMonitor
+from ._trajectory import Trajectory
+
+
+def simulate_scene_headless(
+    scene_id: int,
+    scene: Scene,
+    control_step: float,
+    camera_step: float,
+    sample_step: float | None,
+    simulation_time: int | None,
+    simulation_timestep: float,
+    integrator: str,
+    recording_spec: RecordingSpec,
+    termination_conditions: list[TerminationCondition],
+    model_cache: ModelCache,
+    render_backend: RenderBackend = RenderBackend.EGL,
+    *,
+    cast_shadows: bool,
+    fast_sim: bool,
+    collect_timings: bool = False,
+    collect_physics_diagnostics: bool = False,
+    warm_up_time: float | None = None,
+) -> Trajectory:
+    """Simulate a scene without viewer, recording or any other rendering.
+
+    Only camera sensors that are part of the scene are rendered, when the
+    scene handler requests their images. The physics is stepped in one
+    go from one control or sample event to the next.
+
+    :param scene_id: An id for this scene, unique between all scenes ran
+        in parallel.
+    :type scene_id: int
+    :param scene: The scene to simulate.
+    :type scene: Scene
+    :param control_step: The time between each call to the handle
+        function of the scene handler. In seconds.
+    :type control_step: float
+    :param camera_step: The minimum time between two renders of a
+        camera sensor. Cameras are only rendered when their image is
+        requested. In seconds.
+    :type camera_step: float
+    :param sample_step: The time between each state sample of the
+        simulation. In seconds.
+    :type sample_step: float | None
+    :param simulation_time: How long to simulate for. In seconds.
+    :type simulation_time: int | None
+    :param simulation_timestep: The duration to integrate over during
+        each step of the simulation. In seconds.
+    :type simulation_timestep: float
+    :param integrator: The integrator to use.
+    :type integrator: str
+    :param recording_spec: Which parts of the state to sample.
+    :type recording_spec: RecordingSpec
+    :param termination_conditions: Conditions under which to stop
+        early, in addition to those of the scene.
+    :type termination_conditions: list[TerminationCondition]
+    :param model_cache: The cache to get the compiled model from.
+    :type model_cache: ModelCache
+    :param render_backend: The backend used to render camera sensors.
+    :type render_backend: RenderBackend
+    :param *:
+    :param cast_shadows: If shadows are cast.
+    :type cast_shadows: bool
+    :param fast_sim: If fancy rendering is disabled.
+    :type fast_sim: bool
+    :param collect_timings: Whether to measure where the wall-clock time
+        goes.
+    :type collect_timings: bool
+    :param collect_physics_diagnostics: Whether to observe the energy
+        and penetrations.
+    :type collect_physics_diagnostics: bool
+    :param warm_up_time: If not None, how long to simulate the scene
+        without control first. Structurally identical scenes share the
+        warm-up, and start from the resulting state at time zero. In
+        seconds.
+    :type warm_up_time: float | None
+    :returns: The results of simulation. The number of samples depends
+        on `sample_step`.
+    :rtype: Trajectory
+    """
+    logging.debug("Simulating scene %d headless", scene_id)
+
+    timer = SceneTimer(enabled=collect_timings)
+    physics_monitor = PhysicsMonitor(enabled=collect_physics_diagnostics)
+    with timer.measure(TimedPhase.MODEL_BUILD):
+        model, mapping, data = model_cache.get(
+            scene=scene,
+            simulation_timestep=simulation_timestep,
+            integrator=integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+            timer=timer,
+            warm_up_time=warm_up_time,
+        )
+    control_interface = ControlInterfaceImpl(
+        data=data, abstraction_to_mujoco_mapping=mapping
+    )
+    camera_views = CameraViews(
+        model=model,
+        data=data,
+        cameras=list(mapping.camera_sensor.values()),
+        camera_step=camera_step,
+        render_backend=render_backend,
+        headless=True,
+        timer=timer,
+    )
+
+    last_control_time = 0.0
+    last_sample_time = 0.0
+    trajectory = Trajectory(
+        model, mapping, simulation_time, sample_step, recording_spec
+    )
+    termination_monitor = TerminationMonitor(
+        scene.termination_conditions + termination_conditions
+    )
+    end_time = float("inf") if simulation_time is None else simulation_time
+
+    with timer.measure(TimedPhase.PHYSICS):
+        mujoco.mj_forward(model, data)
+    physics_monitor.observe(model, data)
+
+    if sample_step is not None:
+        with timer.measure(TimedPhase.SAMPLING):
+            trajectory.record(data, camera_views)
+
+    while (time := data.time) < end_time:
+        if time >= last_control_time + control_step:
+            last_control_time = math.floor(time / control_step) * control_step
+            camera_views.update(time)
+            with timer.measure(TimedPhase.CONTROL):
+                simulation_state = SimulationStateImpl(
+                    data=data,
+                    abstraction_to_mujoco_mapping=mapping,
+                    camera_views=camera_views,
+                )
+                reason = termination_monitor.check(simulation_state, time)
+                if reason is not None:
+                    logging.debug(f"Scene {scene_id} stopped early: {reason}")
+                    trajectory.termination_reason = reason
+                    break
+                scene.handler.handle(
+                    simulation_state, control_interface, control_step
+                )
+
+        if sample_step is not None and time >= last_sample_time + sample_step:
+            last_sample_time = int(time / sample_step) * sample_step
+            with timer.measure(TimedPhase.SAMPLING):
+                trajectory.record(data, camera_views)
+
+        next_event = min(last_control_time + control_step, end_time)
+        if sample_step is not None:
+            next_event = min(next_event, last_sample_time + sample_step)
+        with timer.measure(TimedPhase.PHYSICS):
+            mujoco.mj_step(
+                model,
+                data,
+                steps_until(time, next_event, simulation_timestep),
+            )
+        physics_monitor.observe(model, data)
+
+    if sample_step is not None:
+        with timer.measure(TimedPhase.SAMPLING):
+            trajectory.record(data, camera_views)
+
+    trajectory.end_time = data.time
+    trajectory.timings = timer.timings(data.time, simulation_timestep)
+    trajectory.physics = physics_monitor.diagnostics()
+    logging.debug(f"Scene {scene_id} done.")
+    return trajectory
@@ -1,9 +1,9 @@
+import contextlib
 import logging
 import os
 from pathlib import Path
 
 import cv2
-import numpy as np
 
 print("Setting environment variable to use GPU rendering:")
 os.environ["MUJOCO_GL"] = "egl"
@@ -17,15 +17,22 @@ from time import time as tt
 
 import mediapy as media
 import mujoco
-from revolve2.simulation.scene import Scene, SimulationState
+from revolve2.simulation.scene import Scene
+from revolve2.simulation.scene.termination import TerminationCondition
+from revolve2.simulation.simulator import RecordingSpec
 
 from ._control_interface_impl import (
     ControlInterfaceImpl,
 )
-from ._scene_to_model import scene_to_model
+from ._model_cache import ModelCache
+from ._physics_monitor import PhysicsMonitor
+from ._scene_timer import SceneTimer, TimedPhase
 from ._simulation_state_impl import (
     SimulationStateImpl,
 )
+from ._termination_monitor import TerminationMonitor
+from ._trajectory import Trajectory
+from ._video_encoder import VideoEncoder
 
 
 def __draw_label(img, text, pos, bg_color):
@@ -50,19 +57,29 @@ def simulate_scene_minimal(
     sample_step: float | None,
     simulation_time: int | None,
     control_step: float,
+    recording_spec: RecordingSpec,
+    termination_conditions: list[TerminationCondition],
     *,
+    model_cache: ModelCache,
     cast_shadows: bool,
     fast_sim: bool,
+    collect_timings: bool = False,
+    collect_physics_diagnostics: bool = False,
+    warm_up_time: float | None = None,
     **kwargs,
-):
-    model, mapping = scene_to_model(
-        scene=scene,
-        simulation_timestep=simulation_timestep,
-        integrator=integrator,
-        cast_shadows=cast_shadows,
-        fast_sim=fast_sim,
-    )
-    data = mujoco.MjData(model)
+) -> Trajectory:
+    timer = SceneTimer(enabled=collect_timings)
+    physics_monitor = PhysicsMonitor(enabled=collect_physics_diagnostics)
+    with timer.measure(TimedPhase.MODEL_BUILD):
+        model, mapping, data = model_cache.get(
+            scene=scene,
+            simulation_timestep=simulation_timestep,
+            integrator=integrator,
+            cast_shadows=cast_shadows,
+            fast_sim=fast_sim,
+            timer=timer,
+            warm_up_time=warm_up_time,
+        )
 
     control_interface = ControlInterfaceImpl(
         data=data, abstraction_to_mujoco_mapping=mapping
@@ -73,82 +90,103 @@ def simulate_scene_minimal(
 
     images = {}
 
-    simulation_states: list[SimulationState] = []
+    trajectory = Trajectory(
+        model, mapping, simulation_time, sample_step, recording_spec
+    )
+    termination_monitor = TerminationMonitor(
+        scene.termination_conditions + termination_conditions
+    )
 
-    mujoco.mj_forward(model, data)
+    with timer.measure(TimedPhase.PHYSICS):
+        mujoco.mj_forward(model, data)
+    physics_monitor.observe(model, data)
 
     if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
-        )
+        with timer.measure(TimedPhase.SAMPLING):
+            trajectory.record(data, images)
 
     # enable joint visualization option:
     scene_option = mujoco.MjvOption()
     scene_option.flags[mujoco.mjtVisFlag.mjVIS_JOINT] = True
 
-    frames = []
     w, h = 640, 480
     framerate = 24
     renderer = mujoco.Renderer(model, height=h, width=w)
 
-    while (time := data.time) < (
-        float("inf") if simulation_time is None else simulation_time
-    ):
-        if len(frames) < data.time * framerate:
-            renderer.update_scene(data, scene_option=scene_option)
-            pixels = renderer.render()
-            # TODO(jmdm): the video maker should probably store the frames on disc, later these frames can be joined into a video, so that text can be appropriately added to the video
-            # TODO(jmdm): the frame name (stored on disk) should be 0..0.jpg to n..n.jpg or something similar; we can calculate the 0 padding by making an estimate on the number of total frames (duration (seconds) * framerate (frames per second))
-            frames.append(pixels)
-
-        if time >= last_control_time + control_step:
-            last_control_time = math.floor(time / control_step) * control_step
-
-            simulation_state = SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
-            scene.handler.handle(
-                simulation_state, control_interface, control_step
-            )
-
-        if sample_step is not None and time >= last_sample_time + sample_step:
-            last_sample_time = int(time / sample_step) * sample_step
-            simulation_states.append(
-                SimulationStateImpl(
-                    data=data,
-                    abstraction_to_mujoco_mapping=mapping,
-                    camera_views=images,
-                )
-            )
-
-        mujoco.mj_step(model, data)
-
+    # make dir if not exists
+    Path("video").mkdir(parents=True, exist_ok=True)
     timestamp = int(tt())
     name = ""
-
     logging.info(f"Writing video to video/{timestamp}{name}.mp4")
-    logging.info(f"Frames dimension: {np.array(frames).shape}")
 
-    # make dir if not exists
-    Path("video").mkdir(parents=True, exist_ok=True)
+    # Frames are encoded while simulating, instead of being kept in
+    # memory until the end. The stack also closes the video if the
+    # simulation fails.
+    with contextlib.ExitStack() as video_stack:
+        video = video_stack.enter_context(
+            media.VideoWriter(
+                path=f"video/{timestamp}{name}.mp4",
+                shape=(h, w),
+                fps=framerate,
+            )
+        )
+        video_encoder = VideoEncoder(video.add_image, frame_shape=(h, w, 3))
+        video_stack.callback(video_encoder.close)
+        num_frames = 0
+
+        while (time := data.time) < (
+            float("inf") if simulation_time is None else simulation_time
+        ):
+            if num_frames < data.time * framerate:
+                with timer.measure(TimedPhase.VIDEO):
+                    renderer.update_scene(data, scene_option=scene_option)
+                    pixels = video_encoder.get_buffer()
+                    renderer.render(out=pixels)
+                    # TODO(jmdm): the video maker should probably store the frames on disc, later these frames can be joined into a video, so that text can be appropriately added to the video
+                    # TODO(jmdm): the frame name (stored on disk) should be 0..0.jpg to n..n.jpg or something similar; we can calculate the 0 padding by making an estimate on the number of total frames (duration (seconds) * framerate (frames per second))
+                    video_encoder.write(pixels)
+                num_frames += 1
+
+            if time >= last_control_time + control_step:
+                last_control_time = (
+                    math.floor(time / control_step) * control_step
+                )
 
-    media.write_video(
-        path=f"video/{timestamp}{name}.mp4", images=frames, fps=framerate
-    )
+                with timer.measure(TimedPhase.CONTROL):
+                    simulation_state = SimulationStateImpl(
+                        data=data,
+                        abstraction_to_mujoco_mapping=mapping,
+                        camera_views=images,
+                    )
+                    reason = termination_monitor.check(simulation_state, time)
+                    if reason is not None:
+                        trajectory.termination_reason = reason
+                        break
+                    scene.handler.handle(
+                        simulation_state, control_interface, control_step
+                    )
+
+            if (
+                sample_step is not None
+                and time >= last_sample_time + sample_step
+            ):
+                last_sample_time = int(time / sample_step) * sample_step
+                with timer.measure(TimedPhase.SAMPLING):
+                    trajectory.record(data, images)
+
+            with timer.measure(TimedPhase.PHYSICS):
+                mujoco.mj_step(model, data)
+            physics_monitor.observe(model, data)
+
+        with timer.measure(TimedPhase.VIDEO):
+            video_stack.close()
+    logging.info(f"Wrote {num_frames} frames of {h}x{w}.")
 
     if sample_step is not None:
-        simulation_states.append(
-            SimulationStateImpl(
-                data=data,
-                abstraction_to_mujoco_mapping=mapping,
-                camera_views=images,
-            )
-        )
+        with timer.measure(TimedPhase.SAMPLING):
+            trajectory.record(data, images)
 
-    return simulation_states
+    trajectory.end_time = data.time
+    trajectory.timings = timer.timings(data.time, simulation_timestep)
+    trajectory.physics = physics_monitor.diagnostics()
+    return trajectory
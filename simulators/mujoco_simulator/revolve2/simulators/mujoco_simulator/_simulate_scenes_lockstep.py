@@ -0,0 +1,446 @@
+import logging
+import math
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+from revolve2.simulation.scene import Scene
+from revolve2.simulation.scene.termination import TerminationCondition
+from revolve2.simulation.simulator import RecordingSpec
+
+from ._abstraction_to_mujoco_mapping import AbstractionToMujocoMapping
+from ._control_interface_impl import ControlInterfaceImpl
+from ._model_cache import ModelCache
+from ._physics_monitor import PhysicsMonitor
+from ._scene_structure import SceneStructure
+from ._scene_timer import SceneTimer, TimedPhase
+from ._simulation_state_impl import SimulationStateImpl
+from ._steps_until import steps_until
+from ._termination_monitor import TerminationMonitor
+from ._trajectory import Trajectory
+from ._warm_up import get_state, start_from
+
+
+def simulate_scenes_lockstep(
+    scenes: list[Scene],
+    control_step: float,
+    sample_step: float | None,
+    simulation_time: int | None,
+    simulation_timestep: float,
+    integrator: str,
+    recording_spec: RecordingSpec,
+    termination_conditions: list[TerminationCondition],
+    model_cache: ModelCache,
+    executor: Executor,
+    num_threads: int,
+    *,
+    cast_shadows: bool,
+    fast_sim: bool,
+    collect_timings: bool = False,
+    collect_physics_diagnostics: bool = False,
+    warm_up_time: float | None = None,
+) -> list[Trajectory]:
+    """Simulate multiple scenes in lockstep, headless.
+
+    Scenes that are structurally identical share one MuJoCo model, each
+    with its own data. All data advance together between control and
+    sample events, with the physics stepped from `executor`. MuJoCo
+    releases the GIL while stepping, so threads run in parallel.
+
+    Only the stepping schedule and the physics are shared between
+    scenes. The scene handlers, and so the controllers, are still called
+    one after another in the calling thread.
+
+    :param scenes: The scenes to simulate.
+    :type scenes: list[Scene]
+    :param control_step: The time between each call to the handle
+        function of the scene handler. In seconds.
+    :type control_step: float
+    :param sample_step: The time between each state sample of the
+        simulation. In seconds.
+    :type sample_step: float | None
+    :param simulation_time: How long to simulate for. In seconds.
+    :type simulation_time: int | None
+    :param simulation_timestep: The duration to integrate over during
+        each step of the simulation. In seconds.
+    :type simulation_timestep: float
+    :param integrator: The integrator to use.
+    :type integrator: str
+    :param recording_spec: Which parts of the state to sample.
+    :type recording_spec: RecordingSpec
+    :param termination_conditions: Conditions under which to stop a
+        scene early, in addition to those of the scene. Stopped scenes
+        are no longer stepped.
+    :type termination_conditions: list[TerminationCondition]
+    :param model_cache: The cache to get the compiled models from.
+    :type model_cache: ModelCache
+    :param executor: The executor to step the physics from.
+    :type executor: Executor
+    :param num_threads: Into how many chunks to split the scenes when
+        stepping.
+    :type num_threads: int
+    :param *:
+    :param cast_shadows: If shadows are cast.
+    :type cast_shadows: bool
+    :param fast_sim: If fancy rendering is disabled.
+    :type fast_sim: bool
+    :param collect_timings: Whether to measure where the wall-clock time
+        of each scene goes. All scenes are timed over the whole batch,
+        and only the physics of the scene itself is counted as such.
+    :type collect_timings: bool
+    :param collect_physics_diagnostics: Whether to observe the energy
+        and penetrations of each scene.
+    :type collect_physics_diagnostics: bool
+    :param warm_up_time: If not None, how long to simulate each scene
+        without control first. The warm-up is simulated once for each
+        model, and all scenes sharing it start from the resulting state
+        at time zero. In seconds.
+    :type warm_up_time: float | None
+    :returns: The results of simulation for each scene. The number of
+        samples depends on `sample_step`.
+    :rtype: list[Trajectory]
+    :raises ValueError: If the simulation time is unbounded or a scene
+        contains camera sensors.
+    """
+    if simulation_time is None:
+        msg = "Lockstep simulation requires a finite simulation time."
+        raise ValueError(msg)
+
+    lockstep_scenes = _load_scenes(
+        scenes,
+        simulation_time,
+        sample_step,
+        simulation_timestep,
+        integrator,
+        recording_spec,
+        termination_conditions,
+        model_cache,
+        cast_shadows=cast_shadows,
+        fast_sim=fast_sim,
+        collect_timings=collect_timings,
+        collect_physics_diagnostics=collect_physics_diagnostics,
+        warm_up_time=warm_up_time,
+    )
+    _run(
+        lockstep_scenes,
+        control_step,
+        sample_step,
+        simulation_time,
+        simulation_timestep,
+        executor,
+        num_threads,
+    )
+    return [lockstep_scene.trajectory for lockstep_scene in lockstep_scenes]
+
+
+@dataclass(kw_only=True)
+class _LockstepScene:
+    """A scene with everything needed to simulate it in lockstep."""
+
+    scene: Scene
+    model: mujoco.MjModel
+    mapping: AbstractionToMujocoMapping
+    data: mujoco.MjData
+    timer: SceneTimer
+    physics_monitor: PhysicsMonitor
+    control_interface: ControlInterfaceImpl
+    termination_monitor: TerminationMonitor
+    trajectory: Trajectory
+
+
+def _load_scenes(
+    scenes: list[Scene],
+    simulation_time: int,
+    sample_step: float | None,
+    simulation_timestep: float,
+    integrator: str,
+    recording_spec: RecordingSpec,
+    termination_conditions: list[TerminationCondition],
+    model_cache: ModelCache,
+    *,
+    cast_shadows: bool,
+    fast_sim: bool,
+    collect_timings: bool,
+    collect_physics_diagnostics: bool,
+    warm_up_time: float | None,
+) -> list[_LockstepScene]:
+    """Get a model and data for each scene.
+
+    Structurally identical scenes share a model, and a warm-up.
+
+    :param scenes: The scenes.
+    :param simulation_time: How long to simulate for. In seconds.
+    :param sample_step: The time between each state sample. In seconds.
+    :param simulation_timestep: The duration of a physics step. In
+        seconds.
+    :param integrator: The integrator to use.
+    :param recording_spec: Which parts of the state to sample.
+    :param termination_conditions: Conditions under which to stop a
+        scene early, in addition to those of the scene.
+    :param model_cache: The cache to get the compiled models from.
+    :param cast_shadows: If shadows are cast.
+    :param fast_sim: If fancy rendering is disabled.
+    :param collect_timings: Whether to measure where the wall-clock time
+        of each scene goes.
+    :param collect_physics_diagnostics: Whether to observe the energy
+        and penetrations of each scene.
+    :param warm_up_time: If not None, how long to simulate each model
+        without control first. In seconds.
+    :returns: The loaded scenes.
+    :raises ValueError: If a scene contains camera sensors.
+    """
+    structures = [SceneStructure.from_scene(scene) for scene in scenes]
+    models: dict[str, tuple[mujoco.MjModel, AbstractionToMujocoMapping, int]]
+    models = {}
+    warm_up_states: dict[str, npt.NDArray[np.float64]] = {}
+    lockstep_scenes = []
+    for scene_index, (scene, structure) in enumerate(
+        zip(scenes, structures, strict=True)
+    ):
+        timer = SceneTimer(enabled=collect_timings)
+        with timer.measure(TimedPhase.MODEL_BUILD):
+            if structure.key not in models:
+                model, mapping, data = model_cache.get(
+                    scene=scene,
+                    simulation_timestep=simulation_timestep,
+                    integrator=integrator,
+                    cast_shadows=cast_shadows,
+                    fast_sim=fast_sim,
+                    timer=timer,
+                    warm_up_time=warm_up_time,
+                )
+                models[structure.key] = (model, mapping, scene_index)
+                if warm_up_time is not None:
+                    warm_up_states[structure.key] = get_state(model, data)
+            else:
+                model, source_mapping, source_index = models[structure.key]
+                mapping = structure.remap(
+                    source_mapping, structures[source_index]
+                )
+                with timer.measure(TimedPhase.DATA_ALLOCATION):
+                    data = mujoco.MjData(model)
+                    if warm_up_time is not None:
+                        start_from(model, data, warm_up_states[structure.key])
+        if len(mapping.camera_sensor) != 0:
+            msg = "Camera sensors are not supported in lockstep simulation."
+            raise ValueError(msg)
+        lockstep_scenes.append(
+            _LockstepScene(
+                scene=scene,
+                model=model,
+                mapping=mapping,
+                data=data,
+                timer=timer,
+                physics_monitor=PhysicsMonitor(
+                    enabled=collect_physics_diagnostics
+                ),
+                control_interface=ControlInterfaceImpl(
+                    data=data, abstraction_to_mujoco_mapping=mapping
+                ),
+                termination_monitor=TerminationMonitor(
+                    scene.termination_conditions + termination_conditions
+                ),
+                trajectory=Trajectory(
+                    model,
+                    mapping,
+                    simulation_time,
+                    sample_step,
+                    recording_spec,
+                ),
+            )
+        )
+    logging.debug(
+        f"Lockstep: {len(scenes)} scenes share {len(models)} models."
+    )
+    return lockstep_scenes
+
+
+def _run(
+    lockstep_scenes: list[_LockstepScene],
+    control_step: float,
+    sample_step: float | None,
+    simulation_time: int,
+    simulation_timestep: float,
+    executor: Executor,
+    num_threads: int,
+) -> None:
+    """Simulate loaded scenes until they end or stop.
+
+    :param lockstep_scenes: The scenes.
+    :param control_step: The time between each call to the handle
+        function of the scene handlers. In seconds.
+    :param sample_step: The time between each state sample. In seconds.
+    :param simulation_time: How long to simulate for. In seconds.
+    :param simulation_timestep: The duration of a physics step. In
+        seconds.
+    :param executor: The executor to step the physics from.
+    :param num_threads: Into how many chunks to split the scenes when
+        stepping.
+    """
+    for lockstep_scene in lockstep_scenes:
+        with lockstep_scene.timer.measure(TimedPhase.PHYSICS):
+            mujoco.mj_forward(lockstep_scene.model, lockstep_scene.data)
+        lockstep_scene.physics_monitor.observe(
+            lockstep_scene.model, lockstep_scene.data
+        )
+
+    # The scenes that are still being simulated.
+    active = lockstep_scenes
+    chunks = _chunk(active, num_threads)
+    if sample_step is not None:
+        _record(active)
+
+    # All data share the timestep, so a single clock drives every scene.
+    last_control_time = 0.0
+    last_sample_time = 0.0
+    while active and (time := active[0].data.time) < simulation_time:
+        if time >= last_control_time + control_step:
+            last_control_time = math.floor(time / control_step) * control_step
+            stopped = _control(active, time, control_step)
+            if stopped:
+                _stop(stopped, sample_step, simulation_timestep)
+                active = [
+                    lockstep_scene
+                    for lockstep_scene in active
+                    if lockstep_scene not in stopped
+                ]
+                chunks = _chunk(active, num_threads)
+                if not active:
+                    break
+
+        if sample_step is not None and time >= last_sample_time + sample_step:
+            last_sample_time = int(time / sample_step) * sample_step
+            _record(active)
+
+        next_event = min(last_control_time + control_step, simulation_time)
+        if sample_step is not None:
+            next_event = min(next_event, last_sample_time + sample_step)
+        _step(
+            executor,
+            chunks,
+            steps_until(time, next_event, simulation_timestep),
+        )
+
+    _stop(active, sample_step, simulation_timestep)
+
+
+def _control(
+    lockstep_scenes: list[_LockstepScene], time: float, control_step: float
+) -> list[_LockstepScene]:
+    """Check the termination conditions and call the handler of scenes.
+
+    The handlers are called one after another.
+
+    :param lockstep_scenes: The scenes.
+    :param time: The current simulation time. In seconds.
+    :param control_step: The time until the next call. In seconds.
+    :returns: The scenes that stopped, whose handlers were not called.
+    """
+    stopped = []
+    for lockstep_scene in lockstep_scenes:
+        with lockstep_scene.timer.measure(TimedPhase.CONTROL):
+            state = SimulationStateImpl(
+                data=lockstep_scene.data,
+                abstraction_to_mujoco_mapping=lockstep_scene.mapping,
+                camera_views={},
+            )
+            reason = lockstep_scene.termination_monitor.check(state, time)
+            if reason is not None:
+                lockstep_scene.trajectory.termination_reason = reason
+                stopped.append(lockstep_scene)
+                continue
+            lockstep_scene.scene.handler.handle(
+                state, lockstep_scene.control_interface, control_step
+            )
+    return stopped
+
+
+def _record(lockstep_scenes: list[_LockstepScene]) -> None:
+    """Sample the current state of scenes.
+
+    :param lockstep_scenes: The scenes.
+    """
+    for lockstep_scene in lockstep_scenes:
+        with lockstep_scene.timer.measure(TimedPhase.SAMPLING):
+            lockstep_scene.trajectory.record(lockstep_scene.data, {})
+
+
+def _stop(
+    lockstep_scenes: list[_LockstepScene],
+    sample_step: float | None,
+    simulation_timestep: float,
+) -> None:
+    """Take the last sample of scenes and complete their trajectories.
+
+    :param lockstep_scenes: The scenes.
+    :param sample_step: The time between each state sample. In seconds.
+    :param simulation_timestep: The duration of a physics step.
+    """
+    if sample_step is not None:
+        _record(lockstep_scenes)
+    for lockstep_scene in lockstep_scenes:
+        _finish(lockstep_scene, simulation_timestep)
+
+
+def _step(
+    executor: Executor, chunks: list[list[_LockstepScene]], nstep: int
+) -> None:
+    """Step the physics of all chunks of scenes in parallel.
+
+    :param executor: The executor to step the physics from.
+    :param chunks: The chunks.
+    :param nstep: The number of steps.
+    """
+    futures = [executor.submit(_step_chunk, chunk, nstep) for chunk in chunks]
+    for future in futures:
+        future.result()
+    for chunk in chunks:
+        for lockstep_scene in chunk:
+            lockstep_scene.physics_monitor.observe(
+                lockstep_scene.model, lockstep_scene.data
+            )
+
+
+def _step_chunk(chunk: list[_LockstepScene], nstep: int) -> None:
+    """Step the physics of a number of scenes.
+
+    :param chunk: The scenes.
+    :param nstep: The number of steps.
+    """
+    for lockstep_scene in chunk:
+        with lockstep_scene.timer.measure(TimedPhase.PHYSICS):
+            mujoco.mj_step(lockstep_scene.model, lockstep_scene.data, nstep)
+
+
+def _finish(
+    lockstep_scene: _LockstepScene, simulation_timestep: float
+) -> None:
+    """Complete the trajectory of a scene that stopped.
+
+    :param lockstep_scene: The scene.
+    :param simulation_timestep: The duration of a physics step.
+    """
+    data = lockstep_scene.data
+    trajectory = lockstep_scene.trajectory
+    trajectory.end_time = data.time
+    trajectory.timings = lockstep_scene.timer.timings(
+        data.time, simulation_timestep
+    )
+    trajectory.physics = lockstep_scene.physics_monitor.diagnostics()
+
+
+def _chunk(
+    lockstep_scenes: list[_LockstepScene], num_chunks: int
+) -> list[list[_LockstepScene]]:
+    """Split scenes over chunks that are stepped in parallel.
+
+    :param lockstep_scenes: The scenes.
+    :param num_chunks: The maximum number of chunks.
+    :returns: The non-empty chunks.
+    """
+    return [
+        lockstep_scenes[i::num_chunks]
+        for i in range(min(num_chunks, len(lockstep_scenes)))
+    ]
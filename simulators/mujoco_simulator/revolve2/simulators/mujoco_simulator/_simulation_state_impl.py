@@ -1,3 +1,8 @@
+import weakref
+from collections.abc import Mapping, Sequence
+from typing import ClassVar
+from uuid import UUID
+
 import mujoco
 import numpy as np
 import numpy.typing as npt
@@ -26,13 +31,44 @@ class SimulationStateImpl(SimulationState):
     _qpos: npt.NDArray[np.float64]
     _sensordata: npt.NDArray[np.float64]
     _abstraction_to_mujoco_mapping: AbstractionToMujocoMapping
-    _camera_views: dict[int, npt.NDArray[np.uint8]]
+    _camera_views: Mapping[int, npt.NDArray[np.uint8]]
+    _diverged: bool
+
+    # Indices into `qpos` of sequences of hinge joints, by the uuids of
+    # those joints, for each mapping. A state is created for every
+    # control step, so the indices are kept for as long as the mapping.
+    _hinge_position_indices: ClassVar[
+        weakref.WeakKeyDictionary[
+            AbstractionToMujocoMapping,
+            dict[tuple[UUID, ...], npt.NDArray[np.intp]],
+        ]
+    ] = weakref.WeakKeyDictionary()
+
+    # Indices into `sensordata` of the gyroscopes and accelerometers of
+    # sequences of IMUs, by the uuids of those IMUs, for each mapping.
+    _imu_sensordata_indices: ClassVar[
+        weakref.WeakKeyDictionary[
+            AbstractionToMujocoMapping,
+            dict[
+                tuple[UUID, ...],
+                tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]],
+            ],
+        ]
+    ] = weakref.WeakKeyDictionary()
+
+    # MuJoCo resets the data when it detects these, so the state itself
+    # may look fine afterwards.
+    _DIVERGENCE_WARNINGS = (
+        mujoco.mjtWarning.mjWARN_BADQPOS,
+        mujoco.mjtWarning.mjWARN_BADQVEL,
+        mujoco.mjtWarning.mjWARN_BADQACC,
+    )
 
     def __init__(
         self,
         data: mujoco.MjData,
         abstraction_to_mujoco_mapping: AbstractionToMujocoMapping,
-        camera_views: dict[int, npt.NDArray[np.uint8]],
+        camera_views: Mapping[int, npt.NDArray[np.uint8]],
     ) -> None:
         """Initialize this object.
 
@@ -43,7 +79,8 @@ class SimulationStateImpl(SimulationState):
         :param data: The data to copy from.
         :param abstraction_to_mujoco_mapping: A mapping between
             simulation abstraction and mujoco.
-        :param camera_views: The camera views.
+        :param camera_views: The camera views. They may be rendered
+            when requested, so they are not copied.
         """
         self._xpos = data.xpos.copy()
         self._xquat = data.xquat.copy()
@@ -51,6 +88,63 @@ class SimulationStateImpl(SimulationState):
         self._sensordata = data.sensordata.copy()
         self._abstraction_to_mujoco_mapping = abstraction_to_mujoco_mapping
         self._camera_views = camera_views
+        self._diverged = self.has_diverged(data)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        xpos: npt.NDArray[np.float64],
+        xquat: npt.NDArray[np.float64],
+        qpos: npt.NDArray[np.float64],
+        sensordata: npt.NDArray[np.float64],
+        abstraction_to_mujoco_mapping: AbstractionToMujocoMapping,
+        camera_views: dict[int, npt.NDArray[np.uint8]],
+        diverged: bool,
+    ) -> "SimulationStateImpl":
+        """Create a state from already captured arrays, without copying.
+
+        :param xpos: The positions of all bodies.
+        :type xpos: npt.NDArray[np.float64]
+        :param xquat: The orientations of all bodies.
+        :type xquat: npt.NDArray[np.float64]
+        :param qpos: The generalized positions.
+        :type qpos: npt.NDArray[np.float64]
+        :param sensordata: The sensor readings.
+        :type sensordata: npt.NDArray[np.float64]
+        :param abstraction_to_mujoco_mapping: A mapping between
+            simulation abstraction and mujoco.
+        :type abstraction_to_mujoco_mapping: AbstractionToMujocoMapping
+        :param camera_views: The camera views.
+        :type camera_views: dict[int, npt.NDArray[np.uint8]]
+        :param diverged: Whether MuJoCo had detected divergence when the
+            arrays were captured. See `has_diverged`.
+        :type diverged: bool
+        :returns: The state.
+        :rtype: SimulationStateImpl
+        """
+        state = cls.__new__(cls)
+        state._xpos = xpos
+        state._xquat = xquat
+        state._qpos = qpos
+        state._sensordata = sensordata
+        state._abstraction_to_mujoco_mapping = abstraction_to_mujoco_mapping
+        state._camera_views = camera_views
+        state._diverged = diverged
+        return state
+
+    @classmethod
+    def has_diverged(cls, data: mujoco.MjData) -> bool:
+        """Check if MuJoCo detected divergence in a simulation so far.
+
+        :param data: The data of the simulation.
+        :type data: mujoco.MjData
+        :returns: Whether it diverged.
+        :rtype: bool
+        """
+        return any(
+            data.warning[warning].number > 0
+            for warning in cls._DIVERGENCE_WARNINGS
+        )
 
     def xpos(self) -> npt.NDArray[np.float64]:
         """Get the position of all bodies.
@@ -131,6 +225,25 @@ class SimulationStateImpl(SimulationState):
             Quaternion(self._xquat[body_mujoco.id]),
         )
 
+    def get_multi_body_system_orientation(
+        self, multi_body_system: MultiBodySystem
+    ) -> npt.NDArray[np.float64]:
+        """Get the orientation of a multi-body system, relative to the global
+        reference frame.
+
+        :param multi_body_system: The multi-body system to get the
+            orientation for.
+        :type multi_body_system: MultiBodySystem
+        :returns: The orientation, with shape (4,), with the components in
+            the same order as `Pose.orientation`.
+        :rtype: npt.NDArray[np.float64]
+
+        """
+        body_mujoco = self._abstraction_to_mujoco_mapping.multi_body_system[
+            UUIDKey(multi_body_system)
+        ]
+        return np.array(self._xquat[body_mujoco.id], dtype=np.float64)
+
     def get_hinge_joint_position(self, joint: JointHinge) -> float:
         """Get the rotational position of a hinge joint.
 
@@ -145,6 +258,30 @@ class SimulationStateImpl(SimulationState):
         ]
         return float(self._qpos[joint_mujoco.id])
 
+    def get_hinge_joint_positions(
+        self, joints: Sequence[JointHinge]
+    ) -> npt.NDArray[np.float64]:
+        """Get the rotational positions of a number of hinge joints at once.
+
+        :param joints: The joints to get the rotational positions for.
+        :type joints: Sequence[JointHinge]
+        :returns: The rotational position of each joint, in the same
+            order.
+        :rtype: npt.NDArray[np.float64]
+
+        """
+        mapping = self._abstraction_to_mujoco_mapping
+        sequences = self._hinge_position_indices.setdefault(mapping, {})
+        key = tuple(joint.uuid for joint in joints)
+        indices = sequences.get(key)
+        if indices is None:
+            indices = np.array(
+                [mapping.hinge_joint[UUIDKey(joint)].id for joint in joints],
+                dtype=np.intp,
+            )
+            sequences[key] = indices
+        return self._qpos[indices]
+
     def get_imu_specific_force(self, imu_sensor: IMUSensor) -> Vector3:
         """Get the specific force measured an IMU.
 
@@ -177,6 +314,77 @@ class SimulationStateImpl(SimulationState):
         angular_rate = self._sensordata[gyro_id : gyro_id + 3]
         return Vector3(angular_rate)
 
+    def get_imu_specific_forces(
+        self, imu_sensors: Sequence[IMUSensor]
+    ) -> npt.NDArray[np.float64]:
+        """Get the specific forces measured by a number of IMUs at once.
+
+        :param imu_sensors: The IMUs.
+        :type imu_sensors: Sequence[IMUSensor]
+        :returns: The specific force of each IMU, in the same order, with
+            shape (len(imu_sensors), 3).
+        :rtype: npt.NDArray[np.float64]
+
+        """
+        _, accelerometer_indices = self._get_imu_indices(imu_sensors)
+        return self._sensordata[accelerometer_indices]
+
+    def get_imu_angular_rates(
+        self, imu_sensors: Sequence[IMUSensor]
+    ) -> npt.NDArray[np.float64]:
+        """Get the angular rates measured by a number of IMUs at once.
+
+        :param imu_sensors: The IMUs.
+        :type imu_sensors: Sequence[IMUSensor]
+        :returns: The angular rate of each IMU, in the same order, with
+            shape (len(imu_sensors), 3).
+        :rtype: npt.NDArray[np.float64]
+
+        """
+        gyro_indices, _ = self._get_imu_indices(imu_sensors)
+        return self._sensordata[gyro_indices]
+
+    def _get_imu_indices(
+        self, imu_sensors: Sequence[IMUSensor]
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Get the indices into `sensordata` of a sequence of IMUs.
+
+        :param imu_sensors: The IMUs.
+        :returns: The indices of the gyroscopes and of the accelerometers,
+            each with shape (len(imu_sensors), 3).
+        """
+        mapping = self._abstraction_to_mujoco_mapping
+        sequences = self._imu_sensordata_indices.setdefault(mapping, {})
+        key = tuple(imu.uuid for imu in imu_sensors)
+        indices = sequences.get(key)
+        if indices is None:
+            imus_mujoco = [
+                mapping.imu_sensor[UUIDKey(imu)] for imu in imu_sensors
+            ]
+            starts = np.array(
+                [
+                    (imu_mujoco.gyro_id, imu_mujoco.accelerometer_id)
+                    for imu_mujoco in imus_mujoco
+                ],
+                dtype=np.intp,
+            ).reshape(-1, 2)
+            axes = np.arange(3, dtype=np.intp)
+            indices = (
+                starts[:, 0, np.newaxis] + axes,
+                starts[:, 1, np.newaxis] + axes,
+            )
+            sequences[key] = indices
+        return indices
+
+    def is_unstable(self) -> bool:
+        """Check if the physics simulation became numerically unstable.
+
+        :returns: Whether the simulation diverged at some point.
+        :rtype: bool
+
+        """
+        return self._diverged or not bool(np.isfinite(self._qpos).all())
+
     def get_camera_view(
         self, camera_sensor: CameraSensor
     ) -> npt.NDArray[np.uint8]:
@@ -0,0 +1,187 @@
+"""Functions that run inside the worker processes of the LocalSimulator."""
+
+import importlib
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from revolve2.simulation.scene import Scene
+
+from ._chunk_parameters import ChunkParameters
+from ._compiled_model_store import CompiledModelStore
+from ._cpu_affinity import limit_library_threads
+from ._model_cache import ModelCache
+from ._scene_structure import SceneStructure
+from ._settled_state_store import SettledStateStore
+from ._shared_trajectory import SharedTrajectory
+from ._simulate_scene import simulate_scene
+from ._simulate_scene_headless import simulate_scene_headless
+from ._trajectory import Trajectory
+
+if TYPE_CHECKING:
+    from multiprocessing.sharedctypes import Synchronized
+
+_WARM_UP_MODULES = ["mujoco", "dm_control.mjcf", "cv2", "mediapy"]
+
+# Each worker process keeps its own compiled models between tasks.
+_model_cache = ModelCache(max_size=0)
+
+
+def initialize_worker(
+    model_cache_size: int,
+    spec_compiler: bool,
+    settled_state_directory: str | None,
+    compiled_model_directory: str | None,
+    compiled_model_max_bytes: int | None,
+    cpu_sets: list[set[int]] | None,
+    num_started_workers: "Synchronized[int] | None",
+    single_threaded: bool,
+) -> None:
+    """Prepare a freshly started worker process.
+
+    Imports the heavy dependencies up front, so the first batch does not
+    pay for them.
+
+    :param model_cache_size: How many compiled models the worker keeps.
+    :type model_cache_size: int
+    :param spec_compiler: Whether the worker builds models through
+        `MjSpec`.
+    :type spec_compiler: bool
+    :param settled_state_directory: If not None, the directory in which
+        the warmed-up states of scenes are kept.
+    :type settled_state_directory: str | None
+    :param compiled_model_directory: If not None, the directory in which
+        compiled models are kept.
+    :type compiled_model_directory: str | None
+    :param compiled_model_max_bytes: The maximum total size of the
+        compiled models kept on disk. If None, they are never removed.
+    :type compiled_model_max_bytes: int | None
+    :param cpu_sets: If not None, the sets of CPUs to pin the workers
+        to, round robin in the order the workers start.
+    :type cpu_sets: list[set[int]] | None
+    :param num_started_workers: Counts the workers that have started,
+        to pick the set of CPUs. Required if `cpu_sets` is given.
+    :type num_started_workers: Synchronized[int] | None
+    :param single_threaded: Whether to limit the numerical libraries in
+        the worker to a single thread.
+    :type single_threaded: bool
+    """
+    if cpu_sets is not None and num_started_workers is not None:
+        with num_started_workers.get_lock():
+            worker_index = num_started_workers.value
+            num_started_workers.value += 1
+        cpus = cpu_sets[worker_index % len(cpu_sets)]
+        os.sched_setaffinity(0, cpus)
+        logging.debug(f"Simulation worker pinned to CPUs {sorted(cpus)}.")
+    if single_threaded:
+        limit_library_threads()
+
+    global _model_cache
+    _model_cache = ModelCache(
+        max_size=model_cache_size,
+        spec_compiler=spec_compiler,
+        settled_states=SettledStateStore(settled_state_directory),
+        compiled_models=(
+            None
+            if compiled_model_directory is None
+            else CompiledModelStore(
+                compiled_model_directory, compiled_model_max_bytes
+            )
+        ),
+    )
+    for module in _WARM_UP_MODULES:
+        importlib.import_module(module)
+    logging.debug("Simulation worker ready.")
+
+
+def simulate_scene_chunk(
+    scenes: list[tuple[int, Scene]],
+    parameters: ChunkParameters,
+    *,
+    shared_memory: bool,
+) -> list[Trajectory] | list[SharedTrajectory]:
+    """Simulate several scenes one after the other.
+
+    Scenes that are neither viewed nor recorded go through the headless
+    engine.
+
+    :param scenes: The scenes with their ids.
+    :type scenes: list[tuple[int, Scene]]
+    :param parameters: How to simulate the scenes.
+    :type parameters: ChunkParameters
+    :param *:
+    :param shared_memory: Whether to move the results to shared memory
+        and only return descriptions of them. Otherwise the results are
+        returned detached from the scene objects.
+    :type shared_memory: bool
+    :returns: The results of each scene, in order.
+    :rtype: list[Trajectory] | list[SharedTrajectory]
+    """
+    if parameters.headless and parameters.record_settings is None:
+        trajectories = [
+            simulate_scene_headless(
+                scene_id=scene_id,
+                scene=scene,
+                control_step=parameters.control_step,
+                camera_step=parameters.camera_step,
+                sample_step=parameters.sample_step,
+                simulation_time=parameters.simulation_time,
+                simulation_timestep=parameters.simulation_timestep,
+                integrator=parameters.integrator,
+                recording_spec=parameters.recording_spec,
+                termination_conditions=parameters.termination_conditions,
+                model_cache=_model_cache,
+                cast_shadows=parameters.cast_shadows,
+                fast_sim=parameters.fast_sim,
+                collect_timings=parameters.collect_timings,
+                collect_physics_diagnostics=(
+                    parameters.collect_physics_diagnostics
+                ),
+                warm_up_time=parameters.warm_up_time,
+            )
+            for scene_id, scene in scenes
+        ]
+    else:
+        trajectories = [
+            simulate_scene(
+                viewer_type=parameters.viewer_type,
+                scene_id=scene_id,
+                scene=scene,
+                record_settings=parameters.record_settings,
+                control_step=parameters.control_step,
+                camera_step=parameters.camera_step,
+                sample_step=parameters.sample_step,
+                simulation_time=parameters.simulation_time,
+                simulation_timestep=parameters.simulation_timestep,
+                integrator=parameters.integrator,
+                recording_spec=parameters.recording_spec,
+                termination_conditions=parameters.termination_conditions,
+                model_cache=_model_cache,
+                headless=parameters.headless,
+                start_paused=parameters.start_paused,
+                cast_shadows=parameters.cast_shadows,
+                fast_sim=parameters.fast_sim,
+                collect_timings=parameters.collect_timings,
+                collect_physics_diagnostics=(
+                    parameters.collect_physics_diagnostics
+                ),
+                warm_up_time=parameters.warm_up_time,
+            )
+            for scene_id, scene in scenes
+        ]
+
+    if not shared_memory:
+        for trajectory, (_, scene) in zip(trajectories, scenes, strict=True):
+            trajectory.detach(SceneStructure.from_scene(scene))
+        return trajectories
+    shared_trajectories: list[SharedTrajectory] = []
+    try:
+        for trajectory, (_, scene) in zip(trajectories, scenes, strict=True):
+            shared_trajectories.append(
+                trajectory.share(SceneStructure.from_scene(scene))
+            )
+    except BaseException:
+        for shared in shared_trajectories:
+            shared.unlink()
+        raise
+    return shared_trajectories
@@ -0,0 +1,3 @@
+"""The standard port on which simulation worker daemons listen."""
+
+STANDARD_WORKER_PORT = 20813
@@ -0,0 +1,23 @@
+import math
+
+
+def steps_until(time: float, event_time: float, timestep: float) -> int:
+    """Get the number of physics steps until an event is due.
+
+    The simulation loops step this many times at once with
+    `mujoco.mj_step`, so Python only runs when something has to happen.
+    A partial step is rounded up, so the event is due after stepping.
+    Only when the number of steps is within floating point error above a
+    whole number is it rounded down instead; the caller re-checks the
+    event after stepping and steps again if it is not yet due.
+
+    :param time: The current simulation time.
+    :type time: float
+    :param event_time: The time of the next event.
+    :type event_time: float
+    :param timestep: The simulation timestep.
+    :type timestep: float
+    :returns: The number of steps, at least one.
+    :rtype: int
+    """
+    return max(1, math.ceil((event_time - time) / timestep - 1e-6))
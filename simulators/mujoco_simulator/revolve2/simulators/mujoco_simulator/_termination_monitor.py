@@ -0,0 +1,42 @@
+import copy
+
+from revolve2.simulation.scene import SimulationState
+from revolve2.simulation.scene.termination import TerminationCondition
+
+
+class TerminationMonitor:
+    """Checks the termination conditions of a single simulation."""
+
+    _conditions: list[TerminationCondition]
+
+    def __init__(self, conditions: list[TerminationCondition]) -> None:
+        """Initialize this object.
+
+        :param conditions: The conditions to check. They are copied, so
+            they can be shared between simulations.
+        """
+        self._conditions = [copy.copy(condition) for condition in conditions]
+        for condition in self._conditions:
+            condition.reset()
+
+    def check(
+        self, simulation_state: SimulationState, time: float
+    ) -> str | None:
+        """Check if the simulation should stop.
+
+        All conditions are checked, so stateful conditions see every
+        state.
+
+        :param simulation_state: The current state of the simulation.
+        :type simulation_state: SimulationState
+        :param time: The current simulation time. In seconds.
+        :type time: float
+        :returns: The reason of the first condition that is met, or None.
+        :rtype: str | None
+        """
+        reasons = [
+            condition.reason
+            for condition in self._conditions
+            if condition.is_met(simulation_state, time)
+        ]
+        return reasons[0] if reasons else None
@@ -0,0 +1,470 @@
+import math
+import os
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Any, TypeVar
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+from revolve2.simulation.scene import (
+    JointHinge,
+    MultiBodySystem,
+    SimulationState,
+    UUIDKey,
+)
+from revolve2.simulation.scene.sensors import CameraSensor, IMUSensor
+from revolve2.simulation.simulator import (
+    PhysicsDiagnostics,
+    RecordingSpec,
+    SceneReport,
+    SceneTimings,
+)
+
+from ._abstraction_to_mujoco_mapping import (
+    AbstractionToMujocoMapping,
+    IMUSensorMujoco,
+    JointHingeMujoco,
+    MultiBodySystemMujoco,
+)
+from ._scene_structure import DetachedMapping, SceneStructure
+from ._shared_trajectory import SharedTrajectory
+from ._simulation_state_impl import SimulationStateImpl
+
+# Shared memory on Linux; elsewhere a regular temporary file, which the
+# operating system mostly keeps in memory as well.
+_SHARED_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+_T = TypeVar("_T", MultiBodySystem, JointHinge, IMUSensor, CameraSensor)
+_V = TypeVar("_V")
+_S = TypeVar("_S", np.float64, np.bool_)
+
+
+class Trajectory:
+    """The sampled states of a single simulation.
+
+    All samples are stored in a few preallocated arrays, one row per
+    sample, instead of in separate state objects. This keeps allocation
+    out of the simulation loop, and sends a trajectory between processes
+    as a handful of contiguous buffers.
+
+    Only the parts selected by the recording spec are stored. The
+    trajectory then keeps its own mapping, which points into the stored
+    slices instead of into the MuJoCo data.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    end_time: float
+    """The simulation time at which the simulation stopped. In seconds."""
+
+    termination_reason: str | None
+    """Why the simulation stopped early, or None if it ran to the end."""
+
+    timings: SceneTimings | None
+    """Where the wall-clock time went, if it was measured."""
+
+    physics: PhysicsDiagnostics | None
+    """How physically plausible the simulation was, if it was observed."""
+
+    _abstraction_to_mujoco_mapping: AbstractionToMujocoMapping
+    _detached_mapping: DetachedMapping | None
+    _body_ids: npt.NDArray[np.int64] | None
+    _qpos_ids: npt.NDArray[np.int64]
+    _sensordata_ids: npt.NDArray[np.int64]
+    _camera_ids: tuple[int, ...]
+    _xpos: npt.NDArray[np.float64]
+    _xquat: npt.NDArray[np.float64]
+    _qpos: npt.NDArray[np.float64]
+    _sensordata: npt.NDArray[np.float64]
+    _camera_views: list[dict[int, npt.NDArray[np.uint8]]]
+    _diverged: npt.NDArray[np.bool_]
+    _count: int
+
+    def __init__(
+        self,
+        model: mujoco.MjModel,
+        abstraction_to_mujoco_mapping: AbstractionToMujocoMapping,
+        simulation_time: float | None,
+        sample_step: float | None,
+        recording_spec: RecordingSpec | None = None,
+    ) -> None:
+        """Initialize this object.
+
+        :param model: The model that is simulated.
+        :param abstraction_to_mujoco_mapping: A mapping between
+            simulation abstraction and mujoco.
+        :param simulation_time: How long is simulated. In seconds. If
+            None, the arrays grow as needed.
+        :param sample_step: The time between samples. In seconds. If
+            None, nothing is sampled.
+        :param recording_spec: Which parts of the state to store. If
+            None, everything is stored.
+        """
+        if sample_step is None:
+            capacity = 0
+        elif simulation_time is None:
+            capacity = self._INITIAL_CAPACITY
+        else:
+            # The initial and final state are sampled as well.
+            capacity = math.ceil(simulation_time / sample_step) + 2
+
+        spec = RecordingSpec() if recording_spec is None else recording_spec
+        mapping = AbstractionToMujocoMapping()
+        multi_body_systems = _selected(
+            spec.multi_body_systems,
+            abstraction_to_mujoco_mapping.multi_body_system,
+        )
+
+        if spec.rigid_bodies:
+            self._body_ids = None
+            mapping.multi_body_system = dict(multi_body_systems)
+        else:
+            body_ids: list[int] = []
+            for key, multi_body_system_mujoco in multi_body_systems:
+                mapping.multi_body_system[key] = MultiBodySystemMujoco(
+                    id=len(body_ids)
+                )
+                body_ids.append(multi_body_system_mujoco.id)
+            self._body_ids = np.array(body_ids, dtype=np.int64)
+
+        # Hinge joints and IMUs are read at the same indices as
+        # `SimulationStateImpl` reads them.
+        qpos_ids: list[int] = []
+        for joint_key, joint_mujoco in _selected(
+            spec.hinge_joints, abstraction_to_mujoco_mapping.hinge_joint
+        ):
+            mapping.hinge_joint[joint_key] = JointHingeMujoco(
+                id=len(qpos_ids),
+                ctrl_index_position=joint_mujoco.ctrl_index_position,
+                ctrl_index_velocity=joint_mujoco.ctrl_index_velocity,
+            )
+            qpos_ids.append(joint_mujoco.id)
+        self._qpos_ids = np.array(qpos_ids, dtype=np.int64)
+
+        sensordata_ids: list[int] = []
+        for imu_key, imu_mujoco in _selected(
+            spec.imu_sensors, abstraction_to_mujoco_mapping.imu_sensor
+        ):
+            mapping.imu_sensor[imu_key] = IMUSensorMujoco(
+                gyro_id=len(sensordata_ids),
+                accelerometer_id=len(sensordata_ids) + 3,
+            )
+            sensordata_ids.extend(
+                range(imu_mujoco.gyro_id, imu_mujoco.gyro_id + 3)
+            )
+            sensordata_ids.extend(
+                range(
+                    imu_mujoco.accelerometer_id,
+                    imu_mujoco.accelerometer_id + 3,
+                )
+            )
+        self._sensordata_ids = np.array(sensordata_ids, dtype=np.int64)
+
+        mapping.camera_sensor = dict(
+            _selected(
+                spec.camera_sensors,
+                abstraction_to_mujoco_mapping.camera_sensor,
+            )
+        )
+        self._camera_ids = tuple(
+            camera_mujoco.camera_id
+            for camera_mujoco in mapping.camera_sensor.values()
+        )
+
+        num_bodies = (
+            model.nbody if self._body_ids is None else len(self._body_ids)
+        )
+        self._abstraction_to_mujoco_mapping = mapping
+        self._detached_mapping = None
+        self._xpos = np.empty((capacity, num_bodies, 3))
+        self._xquat = np.empty((capacity, num_bodies, 4))
+        self._qpos = np.empty((capacity, len(self._qpos_ids)))
+        self._sensordata = np.empty((capacity, len(self._sensordata_ids)))
+        self._camera_views = []
+        self._diverged = np.empty(capacity, dtype=np.bool_)
+        self._count = 0
+        self.end_time = 0.0
+        self.termination_reason = None
+        self.timings = None
+        self.physics = None
+
+    def __len__(self) -> int:
+        """Get the number of recorded samples.
+
+        :returns: The number of samples.
+        :rtype: int
+        """
+        return self._count
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state for pickling, without the unused capacity.
+
+        :returns: The state.
+        :rtype: dict[str, Any]
+        """
+        state = self.__dict__.copy()
+        for name in ("_xpos", "_xquat", "_qpos", "_sensordata", "_diverged"):
+            state[name] = state[name][: self._count]
+        return state
+
+    def share(self, structure: SceneStructure) -> SharedTrajectory:
+        """Move the samples to shared memory, to send them to another process.
+
+        :param structure: The structure of the simulated scene.
+        :type structure: SceneStructure
+        :returns: The description to pass to `from_shared`, which frees
+            the memory again. If it is never called, call
+            `SharedTrajectory.unlink` instead.
+        :rtype: SharedTrajectory
+        """
+        arrays = [
+            array[: self._count]
+            for array in (
+                self._xpos,
+                self._xquat,
+                self._qpos,
+                self._sensordata,
+            )
+        ]
+        if sum(array.size for array in arrays) == 0:
+            path = None
+        else:
+            with tempfile.NamedTemporaryFile(
+                dir=_SHARED_DIRECTORY,
+                prefix="revolve2-trajectory-",
+                delete=False,
+            ) as file:
+                path = file.name
+                try:
+                    for array in arrays:
+                        array.tofile(file)
+                except BaseException:
+                    os.unlink(path)
+                    raise
+
+        return SharedTrajectory(
+            path=path,
+            shapes=[array.shape for array in arrays],
+            mapping=structure.detach(self._abstraction_to_mujoco_mapping),
+            camera_views=self._camera_views[: self._count],
+            diverged=self._diverged[: self._count].copy(),
+            end_time=self.end_time,
+            termination_reason=self.termination_reason,
+            timings=self.timings,
+            physics=self.physics,
+        )
+
+    @classmethod
+    def from_shared(
+        cls, shared: SharedTrajectory, structure: SceneStructure
+    ) -> "Trajectory":
+        """Open a trajectory that another process moved to shared memory.
+
+        The samples are mapped into this process without copying. The
+        trajectory can be read, but no longer recorded to.
+
+        :param shared: The description created by `share`.
+        :type shared: SharedTrajectory
+        :param structure: The structure of the simulated scene, made from
+            the scene objects of this process.
+        :type structure: SceneStructure
+        :returns: The trajectory.
+        :rtype: Trajectory
+        """
+        if shared.path is None:
+            buffer = np.empty(0)
+        else:
+            buffer = np.memmap(shared.path, dtype=np.float64, mode="c").view(
+                np.ndarray
+            )
+            # The mapping stays valid, and the memory is freed once the
+            # last view of it is gone.
+            shared.unlink()
+        arrays = []
+        offset = 0
+        for shape in shared.shapes:
+            size = math.prod(shape)
+            arrays.append(buffer[offset : offset + size].reshape(shape))
+            offset += size
+
+        trajectory = cls.__new__(cls)
+        trajectory._abstraction_to_mujoco_mapping = structure.attach(
+            shared.mapping
+        )
+        trajectory._detached_mapping = None
+        trajectory._body_ids = None
+        trajectory._qpos_ids = np.empty(0, dtype=np.int64)
+        trajectory._sensordata_ids = np.empty(0, dtype=np.int64)
+        trajectory._camera_ids = ()
+        (
+            trajectory._xpos,
+            trajectory._xquat,
+            trajectory._qpos,
+            trajectory._sensordata,
+        ) = arrays
+        trajectory._camera_views = shared.camera_views
+        trajectory._diverged = shared.diverged
+        trajectory._count = len(shared.camera_views)
+        trajectory.end_time = shared.end_time
+        trajectory.termination_reason = shared.termination_reason
+        trajectory.timings = shared.timings
+        trajectory.physics = shared.physics
+        return trajectory
+
+    def detach(self, structure: SceneStructure) -> None:
+        """Detach the trajectory from the objects of the simulated scene.
+
+        Pickling the trajectory then does not pickle the scene objects.
+        The states cannot be read until it is attached again.
+
+        :param structure: The structure of the simulated scene.
+        :type structure: SceneStructure
+        """
+        self._detached_mapping = structure.detach(
+            self._abstraction_to_mujoco_mapping
+        )
+        self._abstraction_to_mujoco_mapping = AbstractionToMujocoMapping()
+
+    def attach(self, structure: SceneStructure) -> None:
+        """Attach a detached trajectory to the objects of a scene.
+
+        :param structure: The structure of the simulated scene, made from
+            the scene objects of this process.
+        :type structure: SceneStructure
+        :raises RuntimeError: If the trajectory is not detached.
+        """
+        if self._detached_mapping is None:
+            msg = "The trajectory is not detached."
+            raise RuntimeError(msg)
+        self._abstraction_to_mujoco_mapping = structure.attach(
+            self._detached_mapping
+        )
+        self._detached_mapping = None
+
+    def record(
+        self,
+        data: mujoco.MjData,
+        camera_views: Mapping[int, npt.NDArray[np.uint8]],
+    ) -> None:
+        """Append the current state of the simulation.
+
+        :param data: The data to copy from.
+        :type data: mujoco.MjData
+        :param camera_views: The camera views. Only the views of the
+            recorded camera sensors are copied, and so rendered.
+        :type camera_views: Mapping[int, npt.NDArray[np.uint8]]
+        """
+        if self._count == len(self._xpos):
+            self._grow()
+        if self._body_ids is None:
+            self._xpos[self._count] = data.xpos
+            self._xquat[self._count] = data.xquat
+        else:
+            np.take(
+                data.xpos, self._body_ids, axis=0, out=self._xpos[self._count]
+            )
+            np.take(
+                data.xquat,
+                self._body_ids,
+                axis=0,
+                out=self._xquat[self._count],
+            )
+        np.take(data.qpos, self._qpos_ids, out=self._qpos[self._count])
+        np.take(
+            data.sensordata,
+            self._sensordata_ids,
+            out=self._sensordata[self._count],
+        )
+        self._diverged[self._count] = SimulationStateImpl.has_diverged(data)
+        self._camera_views.append({
+            camera_id: camera_views[camera_id].copy()
+            for camera_id in self._camera_ids
+            if camera_id in camera_views
+        })
+        self._count += 1
+
+    def report(self) -> SceneReport:
+        """Get how the simulation went.
+
+        :returns: The report.
+        :rtype: SceneReport
+        """
+        return SceneReport(
+            end_time=self.end_time,
+            termination_reason=self.termination_reason,
+            timings=self.timings,
+            physics=self.physics,
+        )
+
+    def states(self) -> list[SimulationState]:
+        """Get the recorded samples as simulation states.
+
+        The states are views into this trajectory; no data is copied.
+
+        :returns: The states, in order of time.
+        :rtype: list[SimulationState]
+        :raises RuntimeError: If the trajectory is detached.
+        """
+        if self._detached_mapping is not None:
+            msg = "Attach the trajectory to its scene to read its states."
+            raise RuntimeError(msg)
+        return [
+            SimulationStateImpl.from_arrays(
+                xpos=self._xpos[index],
+                xquat=self._xquat[index],
+                qpos=self._qpos[index],
+                sensordata=self._sensordata[index],
+                abstraction_to_mujoco_mapping=self._abstraction_to_mujoco_mapping,
+                camera_views=self._camera_views[index],
+                diverged=bool(self._diverged[index]),
+            )
+            for index in range(self._count)
+        ]
+
+    def _grow(self) -> None:
+        """Double the capacity of the arrays."""
+        capacity = max(self._INITIAL_CAPACITY, 2 * len(self._xpos))
+        self._xpos = _resized(self._xpos, capacity)
+        self._xquat = _resized(self._xquat, capacity)
+        self._qpos = _resized(self._qpos, capacity)
+        self._sensordata = _resized(self._sensordata, capacity)
+        self._diverged = _resized(self._diverged, capacity)
+
+
+def _selected(
+    selection: bool | Sequence[_T],
+    mapping: dict[UUIDKey[_T], _V],
+) -> list[tuple[UUIDKey[_T], _V]]:
+    """Get the mapped objects that are selected by a recording spec.
+
+    :param selection: All objects, none, or the objects to select.
+    :type selection: bool | Sequence[_T]
+    :param mapping: The mapping of all objects.
+    :type mapping: dict[UUIDKey[_T], _V]
+    :returns: The selected objects with their mapping, in mapping order.
+    :rtype: list[tuple[UUIDKey[_T], _V]]
+    """
+    if isinstance(selection, bool):
+        return list(mapping.items()) if selection else []
+    uuids = {value.uuid for value in selection}
+    return [
+        (key, value)
+        for key, value in mapping.items()
+        if key.value.uuid in uuids
+    ]
+
+
+def _resized(array: npt.NDArray[_S], capacity: int) -> npt.NDArray[_S]:
+    """Get a copy of an array with more rows.
+
+    :param array: The array.
+    :type array: npt.NDArray[_S]
+    :param capacity: The new number of rows.
+    :type capacity: int
+    :returns: The copy. Rows beyond the original are uninitialized.
+    :rtype: npt.NDArray[_S]
+    """
+    resized = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
@@ -0,0 +1,96 @@
+import queue
+import threading
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+
+class VideoEncoder:
+    """Writes video frames from a background thread.
+
+    Frames are rendered into a fixed pool of reusable pixel buffers,
+    which are handed to the encoder thread through a bounded queue. When
+    all buffers are waiting to be encoded, the simulation waits for the
+    encoder, so memory use does not grow with the length of the video.
+    """
+
+    _write_frame: Callable[[npt.NDArray[np.uint8]], None]
+    _free_buffers: queue.SimpleQueue[npt.NDArray[np.uint8]]
+    _frames: queue.Queue[npt.NDArray[np.uint8] | None]
+    _thread: threading.Thread
+    _error: Exception | None
+
+    def __init__(
+        self,
+        write_frame: Callable[[npt.NDArray[np.uint8]], None],
+        frame_shape: tuple[int, int, int],
+        num_buffers: int = 8,
+    ) -> None:
+        """Initialize this object and start the encoder thread.
+
+        :param write_frame: Encodes a single frame. Called from the
+            encoder thread. The frame must not be used after it returns.
+        :param frame_shape: The shape of a frame, as (height, width,
+            channels).
+        :param num_buffers: How many frames can be waiting at once.
+        """
+        self._write_frame = write_frame
+        self._free_buffers = queue.SimpleQueue()
+        for _ in range(num_buffers):
+            self._free_buffers.put(np.empty(frame_shape, dtype=np.uint8))
+        self._frames = queue.Queue(maxsize=num_buffers)
+        self._error = None
+        self._thread = threading.Thread(target=self._encode, daemon=True)
+        self._thread.start()
+
+    def get_buffer(self) -> npt.NDArray[np.uint8]:
+        """Get a buffer to render the next frame into.
+
+        Blocks until the encoder has freed one.
+
+        :returns: The buffer. Its content is undefined.
+        :rtype: npt.NDArray[np.uint8]
+        """
+        return self._free_buffers.get()
+
+    def write(self, buffer: npt.NDArray[np.uint8]) -> None:
+        """Queue a frame for encoding.
+
+        :param buffer: A buffer from `get_buffer`, containing the frame.
+            It belongs to the encoder again afterwards.
+        :type buffer: npt.NDArray[np.uint8]
+        :raises RuntimeError: If encoding an earlier frame failed.
+        """
+        self._raise_if_failed()
+        self._frames.put(buffer)
+
+    def close(self) -> None:
+        """Encode the remaining frames and stop the encoder thread.
+
+        :raises RuntimeError: If encoding any frame failed.
+        """
+        self._frames.put(None)
+        self._thread.join()
+        self._raise_if_failed()
+
+    def _encode(self) -> None:
+        """Encode frames until `close` is called."""
+        while (buffer := self._frames.get()) is not None:
+            if self._error is None:
+                try:
+                    self._write_frame(buffer)
+                except Exception as error:
+                    # Keep taking frames so the simulation never waits
+                    # forever; the error is raised on its next write.
+                    self._error = error
+            self._free_buffers.put(buffer)
+
+    def _raise_if_failed(self) -> None:
+        """Raise the error of the encoder thread, if any.
+
+        :raises RuntimeError: If encoding a frame failed.
+        """
+        if self._error is not None:
+            msg = "Encoding a video frame failed."
+            raise RuntimeError(msg) from self._error
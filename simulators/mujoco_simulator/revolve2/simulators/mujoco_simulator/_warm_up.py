@@ -0,0 +1,86 @@
+import mujoco
+import numpy as np
+import numpy.typing as npt
+
+from ._steps_until import steps_until
+
+
+def warm_up(
+    model: mujoco.MjModel, data: mujoco.MjData, warm_up_time: float
+) -> npt.NDArray[np.float64]:
+    """Simulate without control, and get the state to start scenes from.
+
+    The actuators keep their initial targets, so robots are dropped in
+    their initial pose and left to settle. Afterwards the clock is set
+    back to zero.
+
+    :param model: The model to simulate.
+    :type model: mujoco.MjModel
+    :param data: The data to simulate, in its initial state. It is left
+        in the warmed-up state.
+    :type data: mujoco.MjData
+    :param warm_up_time: How long to simulate. In seconds.
+    :type warm_up_time: float
+    :returns: The warmed-up state, to pass to `start_from`.
+    :rtype: npt.NDArray[np.float64]
+    :raises ValueError: If the installed MuJoCo cannot take snapshots of
+        the state.
+    """
+    if not warm_up_available():
+        msg = "Warming up scenes requires MuJoCo 3.0 or newer."
+        raise ValueError(msg)
+
+    if warm_up_time > 0.0:
+        mujoco.mj_step(
+            model, data, steps_until(0.0, warm_up_time, model.opt.timestep)
+        )
+    data.time = 0.0
+    return get_state(model, data)
+
+
+def get_state(
+    model: mujoco.MjModel, data: mujoco.MjData
+) -> npt.NDArray[np.float64]:
+    """Take a snapshot of the simulation state.
+
+    :param model: The simulated model.
+    :type model: mujoco.MjModel
+    :param data: The data to take the snapshot of.
+    :type data: mujoco.MjData
+    :returns: The snapshot.
+    :rtype: npt.NDArray[np.float64]
+    """
+    # Everything that determines how the simulation continues.
+    spec = mujoco.mjtState.mjSTATE_INTEGRATION
+    state = np.empty(mujoco.mj_stateSize(model, spec))
+    mujoco.mj_getState(model, data, state, spec)
+    return state
+
+
+def start_from(
+    model: mujoco.MjModel,
+    data: mujoco.MjData,
+    state: npt.NDArray[np.float64],
+) -> None:
+    """Put data in a state taken by `get_state`.
+
+    Quantities derived from the state are not computed, so call
+    `mujoco.mj_forward` before reading them.
+
+    :param model: The simulated model.
+    :type model: mujoco.MjModel
+    :param data: The data to put in the state.
+    :type data: mujoco.MjData
+    :param state: The snapshot.
+    :type state: npt.NDArray[np.float64]
+    """
+    mujoco.mj_setState(model, data, state, mujoco.mjtState.mjSTATE_INTEGRATION)
+
+
+def warm_up_available() -> bool:
+    """Check if the installed MuJoCo can take snapshots of the state.
+
+    :returns: Whether scenes can be warmed up.
+    :rtype: bool
+    """
+    return hasattr(mujoco, "mj_getState")
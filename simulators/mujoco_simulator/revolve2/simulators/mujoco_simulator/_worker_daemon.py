@@ -0,0 +1,343 @@
+import concurrent.futures
+import contextlib
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from types import TracebackType
+from typing import Any, Self
+
+from ._distributed_protocol import (
+    CONNECTION_ERRORS,
+    PROTOCOL_VERSION,
+    Hello,
+    Result,
+    Task,
+    receive_message,
+    send_message,
+)
+from ._simulation_worker import initialize_worker, simulate_scene_chunk
+from ._standard_port import STANDARD_WORKER_PORT
+
+
+class WorkerDaemon:
+    """Simulates scenes for DistributedSimulators that connect over TCP.
+
+    Each scene is simulated headless by a pool of local worker
+    processes, the same as a LocalSimulator does, and its result is sent
+    back as soon as it is done.
+
+    Scenes and results are pickled, so only run a worker daemon on a
+    network you trust.
+    """
+
+    _num_simulators: int
+    _model_cache_size: int
+    _spec_compiler: bool
+    _settled_state_directory: str | None
+    _compiled_model_directory: str | None
+    _compiled_model_max_bytes: int | None
+    _socket: socket.socket
+    _process_pool: concurrent.futures.ProcessPoolExecutor
+    _pool_lock: threading.Lock
+    _connections: set[socket.socket]
+    _closed: bool
+
+    def __init__(
+        self,
+        host: str = "",
+        port: int = STANDARD_WORKER_PORT,
+        num_simulators: int | None = None,
+        *,
+        model_cache_size: int = 32,
+        spec_compiler: bool = False,
+        settled_state_directory: str | None = None,
+        compiled_model_directory: str | None = None,
+        compiled_model_max_bytes: int | None = None,
+    ) -> None:
+        """Initialize this object and start listening.
+
+        :param host: The address to listen on. Empty for all interfaces.
+        :param port: The port to listen on. Zero picks a free port, see
+            `address`.
+        :param num_simulators: The number of scenes simulated in
+            parallel. If None, one for each CPU.
+        :param model_cache_size: How many compiled models each worker
+            process keeps for structurally identical scenes.
+        :param spec_compiler: Whether models are built directly through
+            MuJoCo's `MjSpec`, skipping the URDF conversion.
+        :param settled_state_directory: If not None, the directory in
+            which the states of warmed-up scenes are kept.
+        :param compiled_model_directory: If not None, the directory in
+            which compiled models are kept.
+        :param compiled_model_max_bytes: The maximum total size of the
+            compiled models kept on disk. If None, they are never
+            removed.
+        """
+        self._num_simulators = num_simulators or os.cpu_count() or 1
+        self._model_cache_size = model_cache_size
+        self._spec_compiler = spec_compiler
+        self._settled_state_directory = settled_state_directory
+        self._compiled_model_directory = compiled_model_directory
+        self._compiled_model_max_bytes = compiled_model_max_bytes
+        self._socket = socket.create_server((host, port))
+        self._process_pool = self._start_process_pool()
+        self._pool_lock = threading.Lock()
+        self._connections = set()
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        """Enter the context of this daemon.
+
+        :returns: This daemon.
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the daemon when leaving its context.
+
+        :param exc_type: The type of the raised exception, if any.
+        :param exc_value: The raised exception, if any.
+        :param traceback: The traceback of the raised exception, if any.
+        """
+        self.close()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Get the address the daemon listens on.
+
+        :returns: The host and port.
+        :rtype: tuple[str, int]
+        """
+        host, port = self._socket.getsockname()[:2]
+        return host, port
+
+    def serve_forever(self) -> None:
+        """Accept simulators until the daemon is closed.
+
+        Each connected simulator is served from its own thread, and all
+        of them share the worker processes.
+
+        :raises OSError: If accepting fails for another reason than the
+            daemon being closed.
+        """
+        logging.info(
+            f"Simulation worker daemon listening on {self.address} with"
+            f" {self._num_simulators} simulators."
+        )
+        while True:
+            try:
+                connection, address = self._socket.accept()
+            except OSError:
+                if self._closed:
+                    return
+                raise
+            threading.Thread(
+                target=self._serve, args=(connection, address), daemon=True
+            ).start()
+
+    def close(self) -> None:
+        """Disconnect all simulators and stop the worker processes."""
+        if self._closed:
+            return
+        self._closed = True
+        self._socket.close()
+        for connection in list(self._connections):
+            with contextlib.suppress(OSError):
+                connection.shutdown(socket.SHUT_RDWR)
+        self._process_pool.shutdown(cancel_futures=True)
+
+    def _start_process_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Start the worker processes.
+
+        The processes are not forked from the daemon itself, so they do
+        not inherit its threads and connections. A connection then closes
+        as soon as the daemon dies.
+
+        :returns: The process pool.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self._num_simulators,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=initialize_worker,
+            initargs=(
+                self._model_cache_size,
+                self._spec_compiler,
+                self._settled_state_directory,
+                self._compiled_model_directory,
+                self._compiled_model_max_bytes,
+                None,
+                None,
+                False,
+            ),
+        )
+
+    def _serve(
+        self, connection: socket.socket, address: tuple[str, int]
+    ) -> None:
+        """Simulate the tasks of a single simulator until it disconnects.
+
+        :param connection: The connection to the simulator.
+        :param address: The address of the simulator.
+        """
+        logging.info(f"Simulator {address} connected.")
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send_lock = threading.Lock()
+        futures: set[concurrent.futures.Future[Any]] = set()
+        self._connections.add(connection)
+        with connection:
+            try:
+                # Enough tasks to keep every process busy while results
+                # are on their way back.
+                send_message(
+                    connection,
+                    Hello(
+                        version=PROTOCOL_VERSION,
+                        capacity=2 * self._num_simulators,
+                    ),
+                )
+                while True:
+                    task: Task = receive_message(connection)
+                    with self._pool_lock:
+                        process_pool = self._process_pool
+                        future = process_pool.submit(
+                            simulate_scene_chunk,
+                            [(task.task_id, task.scene)],
+                            task.parameters,
+                            shared_memory=False,
+                        )
+                    futures.add(future)
+                    future.add_done_callback(futures.discard)
+                    future.add_done_callback(
+                        partial(
+                            self._send_result,
+                            process_pool,
+                            connection,
+                            send_lock,
+                            task.task_id,
+                        )
+                    )
+            except (*CONNECTION_ERRORS, RuntimeError) as error:
+                # A runtime error means the worker processes were stopped
+                # or died, and the simulator should move on.
+                logging.info(f"Simulator {address} disconnected: {error}")
+            finally:
+                self._connections.discard(connection)
+                for future in list(futures):
+                    future.cancel()
+
+    def _send_result(
+        self,
+        process_pool: concurrent.futures.ProcessPoolExecutor,
+        connection: socket.socket,
+        send_lock: threading.Lock,
+        task_id: int,
+        future: "concurrent.futures.Future[Any]",
+    ) -> None:
+        """Send the result of a task back to its simulator.
+
+        If a worker process died, the pool is restarted and the simulator
+        is disconnected, so it simulates the unfinished scenes elsewhere.
+
+        :param process_pool: The pool that simulated the task.
+        :param connection: The connection to the simulator.
+        :param send_lock: Lock that keeps messages from interleaving.
+        :param task_id: The id of the task.
+        :param future: The finished simulation.
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, BrokenProcessPool):
+            logging.exception(
+                "A worker process died. Restarting the workers.",
+                exc_info=error,
+            )
+            with self._pool_lock:
+                if not self._closed and self._process_pool is process_pool:
+                    self._process_pool = self._start_process_pool()
+            with contextlib.suppress(OSError):
+                connection.shutdown(socket.SHUT_RDWR)
+            return
+        if error is None:
+            (trajectory,) = future.result()
+            result = Result(task_id=task_id, trajectory=trajectory, error=None)
+        else:
+            # The simulation itself failed, which the simulator reports.
+            result = Result(
+                task_id=task_id,
+                trajectory=None,
+                error="".join(traceback.format_exception(error)),
+            )
+        with send_lock:
+            try:
+                send_message(connection, result)
+            except OSError as send_error:
+                logging.debug(f"Could not return task {task_id}: {send_error}")
+
+
+def run_worker_daemon(
+    host: str = "",
+    port: int = STANDARD_WORKER_PORT,
+    num_simulators: int | None = None,
+    *,
+    model_cache_size: int = 32,
+    spec_compiler: bool = False,
+    settled_state_directory: str | None = None,
+    compiled_model_directory: str | None = None,
+    compiled_model_max_bytes: int | None = None,
+) -> None:
+    """Run a simulation worker daemon until interrupted or terminated.
+
+    :param host: The address to listen on. Empty for all interfaces.
+    :type host: str
+    :param port: The port to listen on.
+    :type port: int
+    :param num_simulators: The number of scenes simulated in parallel. If
+        None, one for each CPU.
+    :type num_simulators: int | None
+    :param *:
+    :param model_cache_size: How many compiled models each worker process
+        keeps for structurally identical scenes.
+    :type model_cache_size: int
+    :param spec_compiler: Whether models are built directly through
+        MuJoCo's `MjSpec`, skipping the URDF conversion.
+    :type spec_compiler: bool
+    :param settled_state_directory: If not None, the directory in which
+        the states of warmed-up scenes are kept.
+    :type settled_state_directory: str | None
+    :param compiled_model_directory: If not None, the directory in which
+        compiled models are kept.
+    :type compiled_model_directory: str | None
+    :param compiled_model_max_bytes: The maximum total size of the
+        compiled models kept on disk. If None, they are never removed.
+    :type compiled_model_max_bytes: int | None
+    """
+    # Stop the worker processes as well when terminated.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with WorkerDaemon(
+        host,
+        port,
+        num_simulators,
+        model_cache_size=model_cache_size,
+        spec_compiler=spec_compiler,
+        settled_state_directory=settled_state_directory,
+        compiled_model_directory=compiled_model_directory,
+        compiled_model_max_bytes=compiled_model_max_bytes,
+    ) as daemon:
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            logging.info("Simulation worker daemon stopped.")
@@ -0,0 +1,38 @@
+"""A scene handler for unit tests."""
+
+from revolve2.simulation.scene import (
+    ControlInterface,
+    SimulationHandler,
+    SimulationState,
+)
+
+
+class Handler(SimulationHandler):
+    """A handler that does nothing, or fails if asked to."""
+
+    _fail: bool
+
+    def __init__(self, *, fail: bool = False) -> None:
+        """Initialize this object.
+
+        :param fail: Whether to raise an error when called.
+        :type fail: bool
+        """
+        self._fail = fail
+
+    def handle(
+        self, state: SimulationState, control: ControlInterface, dt: float
+    ) -> None:
+        """Handle a simulation frame.
+
+        :param state: The current state of the simulation.
+        :type state: SimulationState
+        :param control: Interface for setting control targets.
+        :type control: ControlInterface
+        :param dt: The time since the last call to this function.
+        :type dt: float
+        :raises RuntimeError: If this handler fails.
+        """
+        if self._fail:
+            msg = "Failing on purpose."
+            raise RuntimeError(msg)
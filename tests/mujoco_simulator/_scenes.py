@@ -0,0 +1,105 @@
+"""Scenes for unit tests."""
+
+from collections.abc import Callable
+
+import numpy as np
+from pyrr import Vector3
+from revolve2.ci_group import modular_robots_v2, terrains
+from revolve2.modular_robot import ModularRobot
+from revolve2.modular_robot.body.base import Body
+from revolve2.modular_robot.body.sensors import IMUSensor
+from revolve2.modular_robot.brain.cpg import BrainCpgNetworkNeighborRandom
+from revolve2.modular_robot_simulation import ModularRobotScene, to_batch
+from revolve2.simulation.scene import (
+    AABB,
+    MultiBodySystem,
+    Pose,
+    RigidBody,
+    Scene,
+)
+from revolve2.simulation.scene.geometry import GeometryBox, GeometryPlane
+from revolve2.simulation.scene.geometry.textures import Texture
+from revolve2.simulation.scene.vector2 import Vector2
+from revolve2.simulation.simulator import BatchParameters
+
+from tests.mujoco_simulator._handler import Handler
+
+PARAMETERS = BatchParameters(
+    simulation_time=1,
+    sampling_frequency=10,
+    simulation_timestep=0.001,
+    control_frequency=10,
+    integrator="Euler",
+)
+"""The parameters to simulate the scenes with."""
+
+
+def make_robot_scene(
+    make_body: Callable[[], Body] = modular_robots_v2.gecko_v2,
+    pose: Pose | None = None,
+) -> Scene:
+    """Make a scene of a robot with an IMU on flat terrain.
+
+    :param make_body: Creates the body of the robot.
+    :type make_body: Callable[[], Body]
+    :param pose: The pose of the robot, or None for the default pose.
+    :type pose: Pose | None
+    :returns: The scene.
+    :rtype: Scene
+    """
+    body = make_body()
+    body.core.add_sensor(IMUSensor(position=Vector3([0.075, 0.075, 0.14])))
+    brain = BrainCpgNetworkNeighborRandom(
+        body=body, rng=np.random.default_rng(0)
+    )
+    modular_robot_scene = ModularRobotScene(terrain=terrains.flat())
+    modular_robot_scene.add_robot(
+        ModularRobot(body, brain), pose=Pose() if pose is None else pose
+    )
+    batch, _ = to_batch(modular_robot_scene, PARAMETERS)
+    return batch.scenes[0]
+
+
+def make_box_scene(pose: Pose) -> Scene:
+    """Make a scene of a box that falls onto a plane.
+
+    The box is the second multi-body system of the scene.
+
+    :param pose: The pose of the box.
+    :type pose: Pose
+    :returns: The scene.
+    :rtype: Scene
+    """
+    scene = Scene(handler=Handler())
+
+    ground = MultiBodySystem(pose=Pose(), is_static=True)
+    ground.add_rigid_body(
+        RigidBody(
+            initial_pose=Pose(),
+            static_friction=1.0,
+            dynamic_friction=1.0,
+            geometries=[
+                GeometryPlane(pose=Pose(), mass=0.0, size=Vector2([5.0, 5.0]))
+            ],
+        )
+    )
+    scene.add_multi_body_system(ground)
+
+    box = MultiBodySystem(pose=pose, is_static=False)
+    box.add_rigid_body(
+        RigidBody(
+            initial_pose=Pose(),
+            static_friction=1.0,
+            dynamic_friction=1.0,
+            geometries=[
+                GeometryBox(
+                    pose=Pose(),
+                    mass=1.0,
+                    texture=Texture(),
+                    aabb=AABB(Vector3([0.1, 0.2, 0.3])),
+                )
+            ],
+        )
+    )
+    scene.add_multi_body_system(box)
+    return scene
@@ -0,0 +1,91 @@
+import mujoco
+import numpy as np
+import pytest
+from revolve2.simulation.scene import JointHinge
+from revolve2.simulators.mujoco_simulator._control_plan import ControlPlan
+from revolve2.simulators.mujoco_simulator._scene_to_model import (
+    scene_to_model,
+)
+
+from tests.mujoco_simulator._scenes import PARAMETERS, make_robot_scene
+
+
+def _make_plan() -> tuple[ControlPlan, mujoco.MjData, list[JointHinge]]:
+    """Make the control plan of a robot scene.
+
+    :returns: The plan, the data of the scene and its hinge joints.
+    :rtype: tuple[ControlPlan, mujoco.MjData, list[JointHinge]]
+    """
+    model, mapping = scene_to_model(
+        make_robot_scene(),
+        PARAMETERS.simulation_timestep,
+        PARAMETERS.integrator,
+        cast_shadows=False,
+        fast_sim=True,
+    )
+    joints = [key.value for key in mapping.hinge_joint]
+    return ControlPlan(mapping), mujoco.MjData(model), joints
+
+
+def test_targets_follow_the_order_of_the_joints() -> None:
+    """Test that each update goes to the joint at the same position."""
+    plan, data, joints = _make_plan()
+    joints.reverse()
+    data.ctrl[:] = 1.0
+
+    slots = plan.slots(joints)
+    updates = np.linspace(-0.1, 0.1, len(joints))
+    plan.set_position_targets(data, slots, updates, as_delta=False)
+
+    for joint, update in zip(joints, updates, strict=True):
+        slot = plan.slot(joint)
+        assert data.ctrl[plan.position_indices[slot]] == update
+        assert data.ctrl[plan.velocity_indices[slot]] == 0.0
+
+
+def test_targets_are_clipped_to_the_joint_range() -> None:
+    """Test that targets beyond the range of a joint are clipped."""
+    plan, data, joints = _make_plan()
+    slots = plan.slots(joints)
+    updates = np.array([
+        (-100.0 if index % 2 else 100.0) for index in range(len(joints))
+    ])
+
+    plan.set_position_targets(data, slots, updates, as_delta=False)
+
+    assert np.array_equal(
+        data.ctrl[plan.position_indices[slots]],
+        np.sign(updates) * plan.ranges[slots],
+    )
+
+
+def test_delta_targets_add_to_the_current_targets() -> None:
+    """Test that deltas are added to the current targets, then clipped."""
+    plan, data, joints = _make_plan()
+    slots = plan.slots(joints[:2])
+    ranges = plan.ranges[slots]
+    plan.set_position_targets(data, slots, [0.1, -0.1], as_delta=False)
+
+    plan.set_position_targets(data, slots, [0.2, -100.0], as_delta=True)
+
+    targets = data.ctrl[plan.position_indices[slots]]
+    assert targets[0] == pytest.approx(min(0.3, ranges[0]))
+    assert targets[1] == -ranges[1]
+
+
+def test_slots_are_resolved_once_per_sequence() -> None:
+    """Test that the slots of a sequence of joints are cached."""
+    plan, _, joints = _make_plan()
+
+    assert plan.slots(joints) is plan.slots(list(joints))
+    assert plan.slots(joints) is not plan.slots(joints[::-1])
+    assert list(plan.slots(joints)) == list(range(len(joints)))
+
+
+def test_unknown_joint_has_no_slot() -> None:
+    """Test that a joint of another scene is rejected."""
+    plan, _, _ = _make_plan()
+    _, _, other_joints = _make_plan()
+
+    with pytest.raises(AssertionError):
+        plan.slot(other_joints[0])
@@ -0,0 +1,200 @@
+import socket
+import threading
+from collections.abc import Iterator
+
+import pytest
+from pyrr import Quaternion, Vector3
+from revolve2.simulation.scene import (
+    AABB,
+    MultiBodySystem,
+    Pose,
+    RigidBody,
+    Scene,
+    SimulationState,
+)
+from revolve2.simulation.scene.geometry import GeometryBox, GeometryPlane
+from revolve2.simulation.scene.geometry.textures import Texture
+from revolve2.simulation.scene.vector2 import Vector2
+from revolve2.simulation.simulator import Batch, BatchParameters
+from revolve2.simulators.mujoco_simulator import (
+    DistributedSimulator,
+    LocalSimulator,
+    WorkerDaemon,
+)
+from revolve2.simulators.mujoco_simulator._distributed_protocol import (
+    PROTOCOL_VERSION,
+    Hello,
+    Task,
+    receive_message,
+    send_message,
+)
+
+from tests.mujoco_simulator._handler import Handler
+
+_NUM_SCENES = 6
+
+
+def _make_batch() -> Batch:
+    """Make a batch of boxes that fall onto a plane from different poses.
+
+    :returns: The batch.
+    :rtype: Batch
+    """
+    batch = Batch(
+        parameters=BatchParameters(
+            simulation_time=1,
+            sampling_frequency=10,
+            simulation_timestep=0.001,
+            control_frequency=10,
+            integrator="Euler",
+        )
+    )
+    for index in range(_NUM_SCENES):
+        scene = Scene(handler=Handler())
+
+        ground = MultiBodySystem(pose=Pose(), is_static=True)
+        ground.add_rigid_body(
+            RigidBody(
+                initial_pose=Pose(),
+                static_friction=1.0,
+                dynamic_friction=1.0,
+                geometries=[
+                    GeometryPlane(
+                        pose=Pose(), mass=0.0, size=Vector2([5.0, 5.0])
+                    )
+                ],
+            )
+        )
+        scene.add_multi_body_system(ground)
+
+        box = MultiBodySystem(
+            pose=Pose(
+                Vector3([0.0, 0.0, 0.2 + 0.1 * index]),
+                Quaternion.from_x_rotation(0.3 * index),
+            ),
+            is_static=False,
+        )
+        box.add_rigid_body(
+            RigidBody(
+                initial_pose=Pose(),
+                static_friction=1.0,
+                dynamic_friction=1.0,
+                geometries=[
+                    GeometryBox(
+                        pose=Pose(),
+                        mass=1.0,
+                        texture=Texture(),
+                        aabb=AABB(Vector3([0.1, 0.2, 0.3])),
+                    )
+                ],
+            )
+        )
+        scene.add_multi_body_system(box)
+
+        batch.scenes.append(scene)
+    return batch
+
+
+def _box_positions(
+    batch: Batch, results: list[list[SimulationState]]
+) -> list[list[tuple[float, ...]]]:
+    """Get the position of the box in every sampled state.
+
+    :param batch: The simulated batch.
+    :type batch: Batch
+    :param results: The results of the batch.
+    :type results: list[list[SimulationState]]
+    :returns: The positions, for each scene.
+    :rtype: list[list[tuple[float, ...]]]
+    """
+    return [
+        [
+            tuple(
+                state.get_multi_body_system_pose(
+                    scene.multi_body_systems[1]
+                ).position
+            )
+            for state in states
+        ]
+        for scene, states in zip(batch.scenes, results, strict=True)
+    ]
+
+
+@pytest.fixture
+def worker_addresses() -> Iterator[list[tuple[str, int]]]:
+    """Start two worker daemons on this machine.
+
+    :yields: The addresses of the daemons.
+    """
+    daemons = [
+        WorkerDaemon("127.0.0.1", 0, num_simulators=1) for _ in range(2)
+    ]
+    for daemon in daemons:
+        threading.Thread(target=daemon.serve_forever, daemon=True).start()
+    try:
+        yield [daemon.address for daemon in daemons]
+    finally:
+        for daemon in daemons:
+            daemon.close()
+
+
+def _serve_then_disconnect(
+    listener: socket.socket, received: list[Task]
+) -> None:
+    """Act as a worker that accepts scenes, but is lost before returning any.
+
+    :param listener: The socket to accept the simulator on.
+    :type listener: socket.socket
+    :param received: Receives the tasks sent to this worker.
+    :type received: list[Task]
+    """
+    connection, _ = listener.accept()
+    with connection:
+        send_message(connection, Hello(version=PROTOCOL_VERSION, capacity=2))
+        while len(received) < 2:
+            received.append(receive_message(connection))
+
+
+def test_results_equal_local_simulator(
+    worker_addresses: list[tuple[str, int]],
+) -> None:
+    """Test that the workers simulate the same as a local simulator."""
+    batch = _make_batch()
+    expected = LocalSimulator(headless=True).simulate_batch(batch)
+
+    with DistributedSimulator(
+        worker_addresses, result_timeout=60.0
+    ) as simulator:
+        results = simulator.simulate_batch_with_reports(batch)
+
+    assert all(result.report.end_time > 0 for result in results)
+    assert _box_positions(
+        batch, [result.states for result in results]
+    ) == _box_positions(batch, expected)
+
+
+def test_scenes_of_lost_worker_are_simulated_elsewhere(
+    worker_addresses: list[tuple[str, int]],
+) -> None:
+    """Test that the scenes of a lost worker are moved to another one."""
+    batch = _make_batch()
+    expected = LocalSimulator(headless=True).simulate_batch(batch)
+
+    received: list[Task] = []
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        lost_worker = threading.Thread(
+            target=_serve_then_disconnect,
+            args=(listener, received),
+            daemon=True,
+        )
+        lost_worker.start()
+        # The lost worker is served first, so it gets scenes.
+        with DistributedSimulator(
+            [listener.getsockname()[:2], worker_addresses[0]],
+            result_timeout=60.0,
+        ) as simulator:
+            results = simulator.simulate_batch(batch)
+        lost_worker.join()
+
+    assert len(received) == 2
+    assert _box_positions(batch, results) == _box_positions(batch, expected)
@@ -0,0 +1,148 @@
+import random
+
+import pytest
+from pyrr import Vector3
+from revolve2.simulation.scene import (
+    Joint,
+    JointHinge,
+    MultiBodySystem,
+    Pose,
+    RigidBody,
+    UUIDKey,
+)
+
+_NUM_RIGID_BODIES = 8
+
+
+def _make_rigid_body() -> RigidBody:
+    """Make a rigid body without geometries.
+
+    :returns: The rigid body.
+    :rtype: RigidBody
+    """
+    return RigidBody(
+        initial_pose=Pose(),
+        static_friction=1.0,
+        dynamic_friction=1.0,
+        geometries=[],
+    )
+
+
+def _make_joint(rigid_body1: RigidBody, rigid_body2: RigidBody) -> JointHinge:
+    """Make a hinge joint between two rigid bodies.
+
+    :param rigid_body1: The first rigid body.
+    :type rigid_body1: RigidBody
+    :param rigid_body2: The second rigid body.
+    :type rigid_body2: RigidBody
+    :returns: The joint.
+    :rtype: JointHinge
+    """
+    return JointHinge(
+        pose=Pose(),
+        rigid_body1=rigid_body1,
+        rigid_body2=rigid_body2,
+        axis=Vector3([0.0, 1.0, 0.0]),
+        range=1.0,
+        effort=1.0,
+        velocity=1.0,
+        armature=0.0,
+        pid_gain_p=1.0,
+        pid_gain_d=0.0,
+    )
+
+
+def _expected_joints(
+    rigid_bodies: list[RigidBody], joints: list[Joint], rigid_body: RigidBody
+) -> list[Joint]:
+    """Get the joints of a rigid body the way a full scan finds them.
+
+    :param rigid_bodies: The rigid bodies, in the order they were added.
+    :type rigid_bodies: list[RigidBody]
+    :param joints: The joints of the system.
+    :type joints: list[Joint]
+    :param rigid_body: The rigid body to get the joints of.
+    :type rigid_body: RigidBody
+    :returns: The joints, ordered by the rigid body at their other end.
+    :rtype: list[Joint]
+    """
+    expected = []
+    for other in rigid_bodies:
+        for joint in joints:
+            ends = {UUIDKey(joint.rigid_body1), UUIDKey(joint.rigid_body2)}
+            if ends == {UUIDKey(rigid_body), UUIDKey(other)}:
+                expected.append(joint)
+    return expected
+
+
+def test_joints_are_ordered_by_rigid_body() -> None:
+    """Test that joints come in the order their rigid bodies were added."""
+    rng = random.Random(0)
+    system = MultiBodySystem(pose=Pose(), is_static=False)
+    rigid_bodies = [_make_rigid_body() for _ in range(_NUM_RIGID_BODIES)]
+    for rigid_body in rigid_bodies:
+        system.add_rigid_body(rigid_body)
+    pairs = [
+        (rigid_bodies[first], rigid_bodies[second])
+        for first in range(_NUM_RIGID_BODIES)
+        for second in range(first + 1, _NUM_RIGID_BODIES)
+        if rng.random() < 0.5
+    ]
+    rng.shuffle(pairs)
+    joints: list[Joint] = []
+    for pair in pairs:
+        rigid_body1, rigid_body2 = pair if rng.random() < 0.5 else pair[::-1]
+        joints.append(_make_joint(rigid_body1, rigid_body2))
+        system.add_joint(joints[-1])
+
+    for rigid_body in rigid_bodies:
+        assert system.get_joints_for_rigid_body(
+            rigid_body
+        ) == _expected_joints(rigid_bodies, joints, rigid_body)
+
+
+def test_adding_a_joint_updates_the_order() -> None:
+    """Test that joints added after a lookup show up in later lookups."""
+    system = MultiBodySystem(pose=Pose(), is_static=False)
+    rigid_bodies = [_make_rigid_body() for _ in range(3)]
+    for rigid_body in rigid_bodies:
+        system.add_rigid_body(rigid_body)
+    last = _make_joint(rigid_bodies[0], rigid_bodies[2])
+    system.add_joint(last)
+
+    assert system.get_joints_for_rigid_body(rigid_bodies[0]) == [last]
+
+    first = _make_joint(rigid_bodies[1], rigid_bodies[0])
+    system.add_joint(first)
+
+    assert system.get_joints_for_rigid_body(rigid_bodies[0]) == [first, last]
+    assert system.get_joints_for_rigid_body(rigid_bodies[1]) == [first]
+
+
+def test_returned_joints_are_a_copy() -> None:
+    """Test that altering the returned list does not alter the system."""
+    system = MultiBodySystem(pose=Pose(), is_static=False)
+    rigid_bodies = [_make_rigid_body() for _ in range(2)]
+    for rigid_body in rigid_bodies:
+        system.add_rigid_body(rigid_body)
+    joint = _make_joint(rigid_bodies[0], rigid_bodies[1])
+    system.add_joint(joint)
+
+    system.get_joints_for_rigid_body(rigid_bodies[0]).clear()
+
+    assert system.get_joints_for_rigid_body(rigid_bodies[0]) == [joint]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_second_joint_between_rigid_bodies_is_rejected(reverse: bool) -> None:
+    """Test that two rigid bodies can be joined only once."""
+    system = MultiBodySystem(pose=Pose(), is_static=False)
+    rigid_bodies = [_make_rigid_body() for _ in range(2)]
+    for rigid_body in rigid_bodies:
+        system.add_rigid_body(rigid_body)
+    system.add_joint(_make_joint(rigid_bodies[0], rigid_bodies[1]))
+
+    if reverse:
+        rigid_bodies.reverse()
+    with pytest.raises(AssertionError):
+        system.add_joint(_make_joint(rigid_bodies[0], rigid_bodies[1]))
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from pyrr import Quaternion, Vector3
+from revolve2.simulation.scene import AABB, Pose, RigidBody
+from revolve2.simulation.scene.geometry import GeometryBox, GeometrySphere
+from revolve2.simulation.scene.geometry.textures import Texture
+
+
+def _make_rigid_body() -> RigidBody:
+    """Make a rigid body of an offset box and sphere.
+
+    :returns: The rigid body.
+    :rtype: RigidBody
+    """
+    return RigidBody(
+        initial_pose=Pose(),
+        static_friction=1.0,
+        dynamic_friction=1.0,
+        geometries=[
+            GeometryBox(
+                pose=Pose(
+                    Vector3([0.1, 0.0, 0.0]),
+                    Quaternion.from_z_rotation(0.3),
+                ),
+                mass=1.0,
+                texture=Texture(),
+                aabb=AABB(Vector3([0.1, 0.2, 0.3])),
+            ),
+            GeometrySphere(
+                pose=Pose(Vector3([0.0, -0.2, 0.1])),
+                mass=0.5,
+                texture=Texture(),
+                radius=0.05,
+            ),
+        ],
+    )
+
+
+def _assert_same_mass_properties(
+    rigid_body: RigidBody, expected: RigidBody
+) -> None:
+    """Check that two rigid bodies have the same mass properties.
+
+    :param rigid_body: The rigid body to check.
+    :type rigid_body: RigidBody
+    :param expected: A rigid body with the expected mass properties.
+    :type expected: RigidBody
+    """
+    np.testing.assert_allclose(
+        np.asarray(rigid_body.center_of_mass()),
+        np.asarray(expected.center_of_mass()),
+    )
+    np.testing.assert_allclose(
+        np.asarray(rigid_body.inertia_tensor()),
+        np.asarray(expected.inertia_tensor()),
+    )
+
+
+def test_moving_a_geometry_in_place_invalidates_the_cache() -> None:
+    """Test that mutating the pose of a geometry is seen."""
+    rigid_body = _make_rigid_body()
+    rigid_body.inertia_tensor()
+
+    rigid_body.geometries[0].pose.position.x = 0.4
+    rigid_body.geometries[1].pose.orientation[:] = Quaternion.from_x_rotation(
+        0.7
+    )
+    expected = _make_rigid_body()
+    expected.geometries[0].pose.position.x = 0.4
+    expected.geometries[1].pose.orientation[:] = Quaternion.from_x_rotation(
+        0.7
+    )
+
+    _assert_same_mass_properties(rigid_body, expected)
+    assert not np.allclose(
+        rigid_body.inertia_tensor(), _make_rigid_body().inertia_tensor()
+    )
+
+
+@pytest.mark.parametrize("change", ["mass", "radius", "size", "geometry"])
+def test_changing_geometries_invalidates_the_cache(change: str) -> None:
+    """Test that adding a geometry or changing its mass or shape is seen."""
+    rigid_body = _make_rigid_body()
+    rigid_body.inertia_tensor()
+    box = rigid_body.geometries[0]
+    sphere = rigid_body.geometries[1]
+    assert isinstance(box, GeometryBox)
+    assert isinstance(sphere, GeometrySphere)
+
+    match change:
+        case "mass":
+            box.mass = 2.0
+        case "radius":
+            sphere.radius = 0.1
+        case "size":
+            box.aabb.size.x = 0.5
+        case "geometry":
+            rigid_body.geometries.append(
+                GeometrySphere(
+                    pose=Pose(Vector3([0.3, 0.3, 0.3])),
+                    mass=0.2,
+                    texture=Texture(),
+                    radius=0.02,
+                )
+            )
+    fresh = RigidBody(
+        initial_pose=Pose(),
+        static_friction=1.0,
+        dynamic_friction=1.0,
+        geometries=rigid_body.geometries,
+    )
+
+    _assert_same_mass_properties(rigid_body, fresh)
+
+
+def test_returned_mass_properties_are_copies() -> None:
+    """Test that altering a result does not alter the cached values."""
+    rigid_body = _make_rigid_body()
+    center_of_mass = np.array(rigid_body.center_of_mass())
+    inertia_tensor = np.array(rigid_body.inertia_tensor())
+
+    rigid_body.center_of_mass()[:] = 0.0
+    rigid_body.inertia_tensor()[:] = 0.0
+
+    assert np.array_equal(rigid_body.center_of_mass(), center_of_mass)
+    assert np.array_equal(rigid_body.inertia_tensor(), inertia_tensor)
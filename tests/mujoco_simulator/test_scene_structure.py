@@ -0,0 +1,132 @@
+import pytest
+from pyrr import Quaternion, Vector3
+from revolve2.ci_group import modular_robots_v2
+from revolve2.simulation.scene import Pose, Scene, UUIDKey
+from revolve2.simulators.mujoco_simulator._abstraction_to_mujoco_mapping import (
+    AbstractionToMujocoMapping,
+)
+from revolve2.simulators.mujoco_simulator._scene_structure import (
+    SceneStructure,
+)
+from revolve2.simulators.mujoco_simulator._scene_to_model import (
+    scene_to_model,
+)
+
+from tests.mujoco_simulator._scenes import PARAMETERS, make_robot_scene
+
+
+def _compile(scene: Scene) -> AbstractionToMujocoMapping:
+    """Compile a scene to a model.
+
+    :param scene: The scene.
+    :type scene: Scene
+    :returns: The mapping of the scene to the model.
+    :rtype: AbstractionToMujocoMapping
+    """
+    _, mapping = scene_to_model(
+        scene,
+        PARAMETERS.simulation_timestep,
+        PARAMETERS.integrator,
+        cast_shadows=False,
+        fast_sim=True,
+    )
+    return mapping
+
+
+def test_identical_scenes_have_equal_keys() -> None:
+    """Test that separately built copies of a scene share a key."""
+    first = SceneStructure.from_scene(make_robot_scene())
+    second = SceneStructure.from_scene(make_robot_scene())
+
+    assert len(first.multi_body_systems) == 2
+    assert len(first.hinge_joints) > 0
+    assert len(first.imu_sensors) == 1
+    assert first.key == second.key
+    assert all(
+        UUIDKey(a) != UUIDKey(b)
+        for a, b in zip(first.hinge_joints, second.hinge_joints, strict=True)
+    )
+
+
+def test_different_scenes_have_different_keys() -> None:
+    """Test that anything that ends up in the model changes the key."""
+    key = SceneStructure.from_scene(make_robot_scene()).key
+
+    other_body = make_robot_scene(modular_robots_v2.spider_v2)
+    moved = make_robot_scene(pose=Pose(Vector3([0.5, 0.0, 0.0])))
+    rotated = make_robot_scene(
+        pose=Pose(orientation=Quaternion.from_z_rotation(0.5))
+    )
+    more_friction = make_robot_scene()
+    more_friction.multi_body_systems[1].root.static_friction += 0.1
+
+    for scene in [other_body, moved, rotated, more_friction]:
+        assert SceneStructure.from_scene(scene).key != key
+
+
+def test_remap_translates_between_identical_scenes() -> None:
+    """Test that a remapped mapping points to the same model elements."""
+    source_scene = make_robot_scene()
+    target_scene = make_robot_scene()
+    source = SceneStructure.from_scene(source_scene)
+    target = SceneStructure.from_scene(target_scene)
+    source_mapping = _compile(source_scene)
+    expected = _compile(target_scene)
+
+    remapped = target.remap(source_mapping, source)
+
+    assert remapped.multi_body_system == expected.multi_body_system
+    assert remapped.hinge_joint == expected.hinge_joint
+    assert remapped.imu_sensor == expected.imu_sensor
+    assert remapped.camera_sensor == expected.camera_sensor
+
+
+def test_remap_rejects_different_scenes() -> None:
+    """Test that a mapping is not remapped onto a different scene."""
+    source_scene = make_robot_scene()
+    source = SceneStructure.from_scene(source_scene)
+    target = SceneStructure.from_scene(
+        make_robot_scene(modular_robots_v2.spider_v2)
+    )
+    mapping = _compile(source_scene)
+
+    with pytest.raises(ValueError, match="structurally different"):
+        target.remap(mapping, source)
+
+
+def test_detach_attach_round_trip() -> None:
+    """Test that a detached mapping attaches to the same or a copied scene."""
+    scene = make_robot_scene()
+    structure = SceneStructure.from_scene(scene)
+    copy = SceneStructure.from_scene(make_robot_scene())
+    mapping = _compile(scene)
+
+    detached = structure.detach(mapping)
+    attached = structure.attach(detached)
+    attached_to_copy = copy.attach(detached)
+    remapped = copy.remap(mapping, structure)
+
+    assert attached.multi_body_system == mapping.multi_body_system
+    assert attached.hinge_joint == mapping.hinge_joint
+    assert attached.imu_sensor == mapping.imu_sensor
+    assert attached_to_copy.hinge_joint == remapped.hinge_joint
+    assert attached_to_copy.imu_sensor == remapped.imu_sensor
+
+
+def test_detach_keeps_left_out_objects_out() -> None:
+    """Test that objects missing from a mapping stay missing."""
+    scene = make_robot_scene()
+    structure = SceneStructure.from_scene(scene)
+    mapping = _compile(scene)
+    left_out = UUIDKey(structure.hinge_joints[0])
+    del mapping.hinge_joint[left_out]
+    mapping.imu_sensor.clear()
+
+    detached = structure.detach(mapping)
+    attached = structure.attach(detached)
+
+    assert detached.hinge_joints[0] is None
+    assert detached.imu_sensors == [None]
+    assert left_out not in attached.hinge_joint
+    assert attached.hinge_joint == mapping.hinge_joint
+    assert attached.imu_sensor == {}
@@ -0,0 +1,89 @@
+import numpy as np
+import numpy.typing as npt
+import pytest
+from revolve2.simulation.simulator import Batch
+from revolve2.simulators.mujoco_simulator import LocalSimulator
+from revolve2.simulators.mujoco_simulator._scene_to_model import (
+    scene_to_model,
+)
+from revolve2.simulators.mujoco_simulator._scene_to_model_spec import (
+    scene_to_model_spec,
+    spec_compiler_available,
+)
+
+from tests.mujoco_simulator._scenes import PARAMETERS, make_robot_scene
+
+pytestmark = pytest.mark.skipif(
+    not spec_compiler_available(),
+    reason="MuJoCo is too old to compile model specs.",
+)
+
+
+def _positions(*, spec_compiler: bool) -> npt.NDArray[np.float64]:
+    """Simulate a robot scene and get the sampled positions of the robot.
+
+    :param spec_compiler: Whether to compile the scene from a model spec.
+    :type spec_compiler: bool
+    :returns: The positions.
+    :rtype: npt.NDArray[np.float64]
+    """
+    batch = Batch(parameters=PARAMETERS)
+    batch.scenes.append(make_robot_scene())
+    robot = batch.scenes[0].multi_body_systems[1]
+    states = LocalSimulator(
+        headless=True, spec_compiler=spec_compiler
+    ).simulate_batch(batch)[0]
+    return np.array([
+        state.get_multi_body_system_pose(robot).position for state in states
+    ])
+
+
+def test_spec_model_matches_xml_model() -> None:
+    """Test that both compilers build the same model and mapping."""
+    scene = make_robot_scene()
+    xml_model, xml_mapping = scene_to_model(
+        scene,
+        PARAMETERS.simulation_timestep,
+        PARAMETERS.integrator,
+        cast_shadows=False,
+        fast_sim=True,
+    )
+    spec_model, spec_mapping = scene_to_model_spec(
+        scene,
+        PARAMETERS.simulation_timestep,
+        PARAMETERS.integrator,
+        cast_shadows=False,
+        fast_sim=True,
+    )
+
+    for size in ["nbody", "njnt", "ngeom", "nu", "nq", "nsensordata"]:
+        assert getattr(spec_model, size) == getattr(xml_model, size)
+    assert spec_model.opt.timestep == xml_model.opt.timestep
+    assert spec_model.opt.integrator == xml_model.opt.integrator
+    # The XML path prints numbers with limited precision.
+    for field in ["body_pos", "body_mass", "body_inertia", "geom_size"]:
+        np.testing.assert_allclose(
+            getattr(spec_model, field), getattr(xml_model, field), atol=1e-6
+        )
+    np.testing.assert_allclose(
+        spec_model.jnt_range, xml_model.jnt_range, atol=1e-5
+    )
+    # q and -q are the same rotation.
+    for field in ["body_quat", "geom_quat"]:
+        dots = np.sum(
+            getattr(spec_model, field) * getattr(xml_model, field), axis=1
+        )
+        np.testing.assert_allclose(np.abs(dots), 1.0, atol=1e-9)
+
+    assert spec_mapping.multi_body_system == xml_mapping.multi_body_system
+    assert spec_mapping.hinge_joint == xml_mapping.hinge_joint
+    assert spec_mapping.imu_sensor == xml_mapping.imu_sensor
+
+
+def test_spec_simulation_matches_xml_simulation() -> None:
+    """Test that a scene simulates the same with either compiler."""
+    np.testing.assert_allclose(
+        _positions(spec_compiler=True),
+        _positions(spec_compiler=False),
+        atol=1e-6,
+    )
@@ -0,0 +1,70 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+from revolve2.simulation.scene import Scene
+from revolve2.simulation.simulator import Batch, BatchParameters
+from revolve2.simulators.mujoco_simulator import LocalSimulator
+
+from tests.mujoco_simulator._handler import Handler
+
+
+def _make_batch(failing_scene: int | None) -> Batch:
+    """Make a batch of empty scenes, each sampled a few times.
+
+    :param failing_scene: The index of the scene whose handler fails, if
+        any.
+    :type failing_scene: int | None
+    :returns: The batch.
+    :rtype: Batch
+    """
+    batch = Batch(
+        parameters=BatchParameters(
+            simulation_time=1,
+            sampling_frequency=10,
+            simulation_timestep=0.001,
+            control_frequency=10,
+            integrator="Euler",
+        )
+    )
+    batch.scenes.extend(
+        Scene(handler=Handler(fail=index == failing_scene))
+        for index in range(4)
+    )
+    return batch
+
+
+def _shared_files() -> set[Path]:
+    """Get the files in which workers leave their results.
+
+    :returns: The files.
+    :rtype: set[Path]
+    """
+    directory = Path("/dev/shm")
+    if not directory.is_dir():
+        directory = Path(tempfile.gettempdir())
+    return set(directory.glob("revolve2-trajectory-*"))
+
+
+def test_shared_memory_is_freed() -> None:
+    """Test that a successful batch leaves no results in shared memory."""
+    before = _shared_files()
+    with LocalSimulator(
+        headless=True, num_simulators=2, scenes_per_task=1
+    ) as simulator:
+        results = simulator.simulate_batch(_make_batch(failing_scene=None))
+
+    assert all(len(states) > 0 for states in results)
+    assert _shared_files() - before == set()
+
+
+def test_shared_memory_is_freed_when_a_chunk_fails() -> None:
+    """Test that the results of other chunks are freed if one fails."""
+    before = _shared_files()
+    with LocalSimulator(
+        headless=True, num_simulators=2, scenes_per_task=1
+    ) as simulator:
+        with pytest.raises(RuntimeError, match="on purpose"):
+            simulator.simulate_batch(_make_batch(failing_scene=2))
+
+    assert _shared_files() - before == set()
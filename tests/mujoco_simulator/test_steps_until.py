@@ -0,0 +1,35 @@
+import pytest
+from revolve2.simulators.mujoco_simulator._steps_until import steps_until
+
+
+@pytest.mark.parametrize(
+    ("time", "event_time", "timestep", "expected"),
+    [
+        (0.0, 0.1, 0.001, 100),
+        (0.0, 0.1005, 0.001, 101),
+        (0.0, 0.0001, 0.001, 1),
+        (0.5, 0.6, 0.004, 25),
+        (0.0, 1.0, 0.1, 10),
+    ],
+)
+def test_partial_steps_round_up(
+    time: float, event_time: float, timestep: float, expected: int
+) -> None:
+    """Test that the event is due after stepping, without overshooting."""
+    assert steps_until(time, event_time, timestep) == expected
+
+
+def test_accumulated_time_error_does_not_add_a_step() -> None:
+    """Test that a time summed from timesteps does not cause an extra step."""
+    time = 0.0
+    for _ in range(10):
+        time += 0.01
+    assert (0.2 - time) / 0.01 > 10
+
+    assert steps_until(time, 0.2, 0.01) == 10
+
+
+@pytest.mark.parametrize("event_time", [1.0, 0.5, 1.0 - 1e-12])
+def test_due_events_take_one_step(event_time: float) -> None:
+    """Test that an event that is already due still takes a single step."""
+    assert steps_until(1.0, event_time, 0.001) == 1
@@ -0,0 +1,112 @@
+import math
+
+import pytest
+from pyrr import Quaternion, Vector3
+from revolve2.simulation.scene import Pose
+from revolve2.simulation.scene.termination import Flipped, Stuck
+from revolve2.simulation.simulator import Batch, SceneResult
+from revolve2.simulators.mujoco_simulator import LocalSimulator
+
+from tests.mujoco_simulator._scenes import PARAMETERS, make_box_scene
+
+_DROP_HEIGHT = 0.5
+_STUCK_WINDOW = 0.5
+
+
+def _make_batch() -> Batch:
+    """Make a batch of a flipped box, a resting box and an unwatched box.
+
+    :returns: The batch.
+    :rtype: Batch
+    """
+    batch = Batch(parameters=PARAMETERS)
+
+    flipped = make_box_scene(
+        Pose(
+            Vector3([0.0, 0.0, _DROP_HEIGHT]),
+            Quaternion.from_x_rotation(math.pi),
+        )
+    )
+    flipped.termination_conditions.append(
+        Flipped(flipped.multi_body_systems[1])
+    )
+    batch.scenes.append(flipped)
+
+    stuck = make_box_scene(Pose(Vector3([0.0, 0.0, _DROP_HEIGHT])))
+    stuck.termination_conditions.append(
+        Stuck(
+            stuck.multi_body_systems[1],
+            window=_STUCK_WINDOW,
+            min_displacement=0.01,
+        )
+    )
+    batch.scenes.append(stuck)
+
+    batch.scenes.append(
+        make_box_scene(Pose(Vector3([0.0, 0.0, _DROP_HEIGHT])))
+    )
+    return batch
+
+
+def _box_positions(
+    batch: Batch, results: list[SceneResult]
+) -> list[list[tuple[float, ...]]]:
+    """Get the position of the box in every sampled state.
+
+    :param batch: The simulated batch.
+    :type batch: Batch
+    :param results: The results of the batch.
+    :type results: list[SceneResult]
+    :returns: The positions, for each scene.
+    :rtype: list[list[tuple[float, ...]]]
+    """
+    return [
+        [
+            tuple(
+                state.get_multi_body_system_pose(
+                    scene.multi_body_systems[1]
+                ).position
+            )
+            for state in result.states
+        ]
+        for scene, result in zip(batch.scenes, results, strict=True)
+    ]
+
+
+def test_conditions_end_scenes_early() -> None:
+    """Test that each scene ends when its first condition is met."""
+    results = LocalSimulator(headless=True).simulate_batch_with_reports(
+        _make_batch()
+    )
+
+    reports = [result.report for result in results]
+    control_step = 1.0 / PARAMETERS.control_frequency
+    assert reports[0].termination_reason == "flipped"
+    assert reports[0].end_time == pytest.approx(control_step)
+    assert reports[1].termination_reason == "stuck"
+    assert reports[1].end_time == pytest.approx(control_step + _STUCK_WINDOW)
+    assert reports[2].termination_reason is None
+    assert reports[2].end_time == pytest.approx(PARAMETERS.simulation_time)
+    assert [len(result.states) for result in results] == [2, 7, 11]
+
+
+def test_lockstep_drops_out_ended_scenes() -> None:
+    """Test that ended scenes leave a lockstep run without affecting it."""
+    serial_batch = _make_batch()
+    serial = LocalSimulator(headless=True).simulate_batch_with_reports(
+        serial_batch
+    )
+    lockstep_batch = _make_batch()
+    lockstep = LocalSimulator(
+        headless=True, num_simulators=2, lockstep=True
+    ).simulate_batch_with_reports(lockstep_batch)
+
+    assert [result.report.termination_reason for result in lockstep] == [
+        result.report.termination_reason for result in serial
+    ]
+    assert [result.report.end_time for result in lockstep] == [
+        result.report.end_time for result in serial
+    ]
+    assert _box_positions(lockstep_batch, lockstep) == _box_positions(
+        serial_batch, serial
+    )